@@ -0,0 +1,126 @@
+"""Initial schema (tables as originally created by scripts/create_tables.py)
+
+Databases created before migrations existed should be stamped, not upgraded:
+    alembic stamp 0001 && alembic upgrade head
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+    op.create_index('ix_user_full_name', 'user', ['full_name'], unique=False)
+
+    op.create_table(
+        'campaign',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('slug', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('cover_image_url', sa.String(), nullable=True),
+        sa.Column('goal_amount_usd', sa.Float(), nullable=True),
+        sa.Column('goal_amount_etb', sa.Float(), nullable=True),
+        sa.Column('current_raised_usd', sa.Float(), nullable=True),
+        sa.Column('current_raised_etb', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_campaign_slug', 'campaign', ['slug'], unique=True)
+
+    op.create_table(
+        'donation',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('campaign_id', sa.String(), nullable=True),
+        sa.Column('donor_name', sa.String(), nullable=True),
+        sa.Column('donor_email', sa.String(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column('payment_gateway', sa.String(), nullable=False),
+        sa.Column('transaction_id', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaign.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_donation_transaction_id', 'donation', ['transaction_id'], unique=True)
+
+    op.create_table(
+        'media',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('media_type', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('is_featured', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'sitecontent',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('section', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('label', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sitecontent_key', 'sitecontent', ['key'], unique=True)
+    op.create_index('ix_sitecontent_section', 'sitecontent', ['section'], unique=False)
+
+    op.create_table(
+        'contactmessage',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=True),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('contactmessage')
+    op.drop_index('ix_sitecontent_section', table_name='sitecontent')
+    op.drop_index('ix_sitecontent_key', table_name='sitecontent')
+    op.drop_table('sitecontent')
+    op.drop_table('media')
+    op.drop_index('ix_donation_transaction_id', table_name='donation')
+    op.drop_table('donation')
+    op.drop_index('ix_campaign_slug', table_name='campaign')
+    op.drop_table('campaign')
+    op.drop_index('ix_user_full_name', table_name='user')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_table('user')
@@ -0,0 +1,58 @@
+"""Dashboard stats row, table version counters, updated_at columns, keyset indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dashboardstats',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('total_raised_usd', sa.Float(), nullable=False),
+        sa.Column('total_raised_etb', sa.Float(), nullable=False),
+        sa.Column('total_donations_count', sa.Integer(), nullable=False),
+        sa.Column('active_campaigns', sa.Integer(), nullable=False),
+        sa.Column('recent_donations', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'tableversion',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    op.add_column('media', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('sitecontent', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    op.create_index('ix_donation_created_at_id', 'donation', ['created_at', 'id'])
+    op.create_index('ix_media_created_at_id', 'media', ['created_at', 'id'])
+    op.create_index('ix_contactmessage_created_at_id', 'contactmessage', ['created_at', 'id'])
+    op.create_index('ix_campaign_created_at_id', 'campaign', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaign_created_at_id', table_name='campaign')
+    op.drop_index('ix_contactmessage_created_at_id', table_name='contactmessage')
+    op.drop_index('ix_media_created_at_id', table_name='media')
+    op.drop_index('ix_donation_created_at_id', table_name='donation')
+    op.drop_column('sitecontent', 'updated_at')
+    op.drop_column('media', 'updated_at')
+    op.drop_table('tableversion')
+    op.drop_table('dashboardstats')
@@ -0,0 +1,58 @@
+"""Indexes for the hot donation/media/campaign filter paths
+
+Built CONCURRENTLY outside the migration transaction so a large donation
+table stays writable while they are created.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUCCESS = sa.text("status = 'SUCCESS'")
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    # Campaign totals: SUM(amount) per campaign/currency over successful donations (index-only)
+    ('ix_donation_success_campaign_currency', 'donation', ['campaign_id', 'currency'],
+     dict(postgresql_where=SUCCESS, postgresql_include=['amount'])),
+    # Dashboard rebuild: SUM(amount) per currency over successful donations (index-only)
+    ('ix_donation_success_currency', 'donation', ['currency'],
+     dict(postgresql_where=SUCCESS, postgresql_include=['amount'])),
+    # Dashboard rebuild: latest successful donations
+    ('ix_donation_success_created_at', 'donation', ['created_at'], dict(postgresql_where=SUCCESS)),
+    # read_donations filtered by campaign, newest first
+    ('ix_donation_campaign_created_at_id', 'donation', ['campaign_id', 'created_at', 'id'], {}),
+    # Export / reconciliation: status + created_at range
+    ('ix_donation_status_created_at', 'donation', ['status', 'created_at'], {}),
+    # read_media filtered by media_type, newest first
+    ('ix_media_type_created_at_id', 'media', ['media_type', 'created_at', 'id'], {}),
+    # Public campaign list: active campaigns, newest first
+    ('ix_campaign_active_created_at_id', 'campaign', ['created_at', 'id'],
+     dict(postgresql_where=sa.text('is_active'))),
+    # Campaign lookup by title on the payment path
+    ('ix_campaign_title', 'campaign', ['title'], {}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""Webhook inbox table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhookevent',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('tx_ref', sa.String(), nullable=False),
+        sa.Column('event_hash', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider', 'tx_ref', 'event_hash', name='uq_webhookevent_provider_tx_ref_hash'),
+    )
+    op.create_index('ix_webhookevent_open', 'webhookevent', ['status', 'next_attempt_at', 'id'],
+                    postgresql_where=sa.text("status <> 'DONE'"))
+    op.create_index('ix_webhookevent_tx_ref_id', 'webhookevent', ['tx_ref', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhookevent_tx_ref_id', table_name='webhookevent')
+    op.drop_index('ix_webhookevent_open', table_name='webhookevent')
+    op.drop_table('webhookevent')
@@ -0,0 +1,34 @@
+"""Media image derivative columns
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('media', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('media', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('media', sa.Column('placeholder', sa.Text(), nullable=True))
+    op.add_column('media', sa.Column('variants', sa.JSON(), nullable=True))
+    op.add_column('media', sa.Column('variants_processed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('media', 'variants_processed_at')
+    op.drop_column('media', 'variants')
+    op.drop_column('media', 'placeholder')
+    op.drop_column('media', 'height')
+    op.drop_column('media', 'width')
@@ -0,0 +1,49 @@
+"""Full-text search vectors
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, weight A column, weight B column); kept in step with app.db.search
+SEARCHABLE = (
+    ('campaign', 'title', 'description'),
+    ('media', 'title', 'description'),
+    ('sitecontent', 'label', 'content'),
+    ('contactmessage', 'subject', 'message'),
+)
+
+
+def _expression(primary: str, secondary: str) -> str:
+    return (
+        f"setweight(to_tsvector('english'::regconfig, coalesce({primary}, '')), 'A') || "
+        f"setweight(to_tsvector('english'::regconfig, coalesce({secondary}, '')), 'B')"
+    )
+
+
+def upgrade() -> None:
+    for table, primary, secondary in SEARCHABLE:
+        op.add_column(table, sa.Column(
+            'search_vector', postgresql.TSVECTOR(), sa.Computed(_expression(primary, secondary), persisted=True),
+            nullable=True,
+        ))
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table, _, _ in reversed(SEARCHABLE):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
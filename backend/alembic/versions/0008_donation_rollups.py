@@ -0,0 +1,51 @@
+"""Donation time-series rollups
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'donationrollup',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('campaign_id', sa.String(), nullable=True),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column('payment_gateway', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('donations_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'granularity', 'bucket_start', 'campaign_id', 'currency', 'payment_gateway',
+            name='uq_donationrollup_bucket', postgresql_nulls_not_distinct=True,
+        ),
+    )
+    # Backfill from the existing ledger (scripts/rebuild_donation_rollups.py does the same later)
+    for granularity, unit in (('HOUR', 'hour'), ('DAY', 'day')):
+        op.execute(f"""
+            INSERT INTO donationrollup (granularity, bucket_start, campaign_id, currency, payment_gateway, amount, donations_count)
+            SELECT '{granularity}', date_trunc('{unit}', created_at, 'UTC'), campaign_id, currency, payment_gateway,
+                   sum(amount), count(*)
+            FROM donation
+            WHERE status = 'SUCCESS'
+            GROUP BY 2, 3, 4, 5
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('donationrollup')
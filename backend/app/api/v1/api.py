@@ -4,6 +4,9 @@ from app.api.v1.endpoints import auth, campaigns, media, donation, chapa
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 api_router.include_router(campaigns.router, prefix="/campaigns", tags=["Campaigns"])
+# Before the media router, whose /{id} routes would otherwise match /uploads
+from app.api.v1.endpoints import resumable_uploads
+api_router.include_router(resumable_uploads.router, prefix="/media/uploads", tags=["Media"])
 api_router.include_router(media.router, prefix="/media", tags=["Media"])
 api_router.include_router(donation.router, prefix="/donate", tags=["Donation"])
 
@@ -17,3 +20,6 @@ api_router.include_router(site_content.router, prefix="/site-content", tags=["Si
 
 from app.api.v1.endpoints import contact
 api_router.include_router(contact.router, prefix="/contact", tags=["Contact"])
+
+from app.api.v1.endpoints import search
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
@@ -1,15 +1,18 @@
+import logging
 from datetime import timedelta
 from typing import Any
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.services.http_client import HTTPClient
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
 from app.models.user import User
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.get("/login")
 def login_with_google():
@@ -21,24 +24,30 @@ def login_with_google():
     )
 
 @router.get("/callback")
-async def google_callback(code: str, db: Session = Depends(get_db)):
+async def google_callback(
+    code: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    http: HTTPClient = Depends(deps.get_http_client),
+):
     """
     Exchanges the authorization code for a token, verifies the user, 
     and returns a JWT access token if authorized.
     """
     # 1. Exchange Code for Token
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            settings.GOOGLE_TOKEN_URI,
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code",
-            },
-        )
-        token_json = token_response.json()
+    # Authorization codes are single-use, so only connection failures are retried here.
+    token_response = await http.post(
+        settings.GOOGLE_TOKEN_URI,
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+        retry_on_status=False,
+        service="google",
+    )
+    token_json = token_response.json()
         
     if "error" in token_json:
         raise HTTPException(
@@ -48,20 +57,19 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
     access_token = token_json.get("access_token")
 
     # 2. Get User Info
-    async with httpx.AsyncClient() as client:
-        user_info = await client.get(
-            "https://www.googleapis.com/oauth2/v1/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        profile = user_info.json()
+    user_info = await http.get(
+        settings.GOOGLE_USERINFO_URI,
+        headers={"Authorization": f"Bearer {access_token}"},
+        service="google",
+    )
+    profile = user_info.json()
 
     email = profile.get("email")
     if not email:
         raise HTTPException(status_code=400, detail="Google authentication failed: No email provided.")
 
     # 3. Verify Whitelist
-    print(f"DEBUG AUTH: Received email from Google: '{email}'")
-    print(f"DEBUG AUTH: Authorized emails list: {settings.AUTHORIZED_EMAILS}")
+    logger.debug(f"Google sign-in for '{email}'")
 
     if email.lower() not in [e.lower() for e in settings.AUTHORIZED_EMAILS]:
         raise HTTPException(
@@ -70,7 +78,8 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
         )
 
     # 4. Create or Update User in DB
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     if not user:
         user = User(
             email=email,
@@ -80,8 +89,7 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
             is_superuser=(email in settings.SUPER_ADMIN_EMAILS)
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
 
     # 5. Create Session JWT
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,20 +1,38 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Union
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.services import campaign_service
+from app.services import campaign_service, version_service
 from app.schemas.campaign import Campaign, CampaignCreate
+from app.schemas.pagination import Page
 from app.api.deps import get_current_active_user
+from app.core.cache import response_cache
+from app.core.etag import make_etag
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Campaign])
-def read_campaigns(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=Union[List[Campaign], Page[Campaign]])
+def read_campaigns(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
     """
-    Retrieve all active campaigns.
+    Retrieve all active campaigns, newest first.
+    Pass `cursor` (empty for the first page) to get a {items, next_cursor} page instead of an offset list.
     """
+    etag = make_etag(response_cache.key_for(request), version_service.get(db, version_service.CAMPAIGN))
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
+    if cursor is not None:
+        items, next_cursor = campaign_service.get_page(db, cursor=cursor, limit=limit)
+        page = {"items": items, "next_cursor": next_cursor}
+        return response_cache.store(request, Page[Campaign], page, tags=["campaign"], etag=etag)
     campaigns = campaign_service.get_multi(db, skip=skip, limit=limit)
-    return campaigns
+    return response_cache.store(request, List[Campaign], campaigns, tags=["campaign"], etag=etag)
 
 @router.post("/", response_model=Campaign)
 def create_campaign(
@@ -37,11 +55,15 @@ def create_campaign(
     return campaign
 
 @router.get("/{slug}", response_model=Campaign)
-def read_campaign(slug: str, db: Session = Depends(get_db)):
+def read_campaign(request: Request, slug: str, db: Session = Depends(get_db)):
     """
     Get campaign by slug.
     """
+    etag = make_etag(response_cache.key_for(request), version_service.get(db, version_service.CAMPAIGN))
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
     campaign = campaign_service.get_by_slug(db, slug=slug)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    return campaign
+    return response_cache.store(request, Campaign, campaign, tags=[f"campaign:{slug}"], etag=etag)
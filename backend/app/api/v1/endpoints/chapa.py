@@ -1,6 +1,6 @@
 
 from fastapi import APIRouter, HTTPException, Depends, Request, Header, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.chapa import chapa_service
 from app.api import deps
 from app.core.config import settings
@@ -9,10 +9,14 @@ import uuid
 import hmac
 import hashlib
 import json
+import logging
 from app.models.donation import Donation, DonationStatus, PaymentGateway
-from app.models.campaign import Campaign
+from app.services import donation_service
+from app.services.campaign_registry import campaign_registry
+from app.services.webhook_inbox import webhook_inbox
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 class ChapaPaymentRequest(BaseModel):
     amount: float
@@ -24,7 +28,7 @@ class ChapaPaymentRequest(BaseModel):
 @router.post("/initialize")
 async def initialize_chapa_payment(
     payment: ChapaPaymentRequest,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
     Initialize a payment with Chapa and create PENDING donation record.
@@ -35,11 +39,8 @@ async def initialize_chapa_payment(
     
     try:
         # 1. Lookup Campaign (optional but recommended for tracking)
-        campaign_id = None
-        if payment.campaign_title:
-             campaign = db.query(Campaign).filter(Campaign.title == payment.campaign_title).first()
-             if campaign:
-                 campaign_id = campaign.id
+        campaign = await db.run_sync(campaign_registry.by_title, payment.campaign_title)
+        campaign_id = campaign.id if campaign else None
 
         # 2. Create PENDING Donation Record
         donation = Donation(
@@ -53,7 +54,8 @@ async def initialize_chapa_payment(
             campaign_id=campaign_id
         )
         db.add(donation)
-        db.commit()
+        donation_service.count_transition(db, PaymentGateway.CHAPA, DonationStatus.PENDING)
+        await db.commit()
         
         # 3. Call Chapa API
         from urllib.parse import urlencode
@@ -93,7 +95,8 @@ async def initialize_chapa_payment(
         if response.get("status") != "success":
              # Mark as failed if API fails? Or just leave pending/delete.
              donation.status = DonationStatus.FAILED
-             db.commit()
+             donation_service.count_transition(db, PaymentGateway.CHAPA, DonationStatus.FAILED)
+             await db.commit()
              raise HTTPException(status_code=400, detail=response.get("message", "Failed to initialize payment"))
 
         return {
@@ -101,13 +104,13 @@ async def initialize_chapa_payment(
             "tx_ref": tx_ref
         }
     except Exception as e:
-        print(f"Chapa Error: {e}")
+        logger.exception(f"Chapa initialize failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/verify/{tx_ref}")
 async def verify_chapa_payment(
     tx_ref: str,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
     Verify payment status via API (called by frontend redirect).
@@ -118,10 +121,11 @@ async def verify_chapa_payment(
 async def chapa_webhook(
     request: Request,
     x_chapa_signature: str | None = Header(None),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
     Handle Chapa Webhook for asynchronous payment verification.
+    The event is only recorded here (idempotently) and acknowledged.
     """
     secret = settings.CHAPA_WEBHOOK_SECRET
     body = await request.body()
@@ -137,45 +141,38 @@ async def chapa_webhook(
         if x_chapa_signature != expected_signature:
             raise HTTPException(status_code=403, detail="Invalid signature")
             
-    # 2. Parse Event
+    # 2. Parse Event and store it in the inbox; app.services.webhook_inbox verifies
+    # and applies it in the background so the gateway gets its 200 immediately.
     try:
         data = json.loads(body)
         tx_ref = data.get("tx_ref")
-        status = data.get("status")
         
-        if status == "success" and tx_ref:
-            await process_verification(tx_ref, db)
+        if tx_ref:
+            await db.run_sync(webhook_inbox.record, "CHAPA", tx_ref, body, data)
+            await db.commit()
+            webhook_inbox.notify()
             
         return {"status": "ok"}
     except Exception as e:
-        print(f"Webhook Error: {e}")
+        logger.warning(f"Webhook rejected: {e}")
         raise HTTPException(status_code=400, detail="Invalid payload")
 
-async def process_verification(tx_ref: str, db: Session):
+async def process_verification(tx_ref: str, db: AsyncSession):
     try:
         # 1. Check Chapa Status via API to be double sure (or rely on webhook data)
         # It's safer to verify against the API even in webhook to avoid spoofing if sig check failed/skipped.
         response = await chapa_service.verify_transaction(tx_ref)
         
         if response.get("status") == "success":
-            # 2. Update Donation Record
-            donation = db.query(Donation).filter(Donation.transaction_id == tx_ref).first()
-            if donation and donation.status != DonationStatus.SUCCESS:
-                donation.status = DonationStatus.SUCCESS
-                
-                # 3. Update Campaign Funds
-                if donation.campaign_id:
-                    campaign = db.query(Campaign).filter(Campaign.id == donation.campaign_id).first()
-                    if campaign:
-                        # Assuming amount is in ETB
-                        campaign.current_raised_etb += donation.amount
-                
-                db.commit()
-                db.refresh(donation)
+            # 2. Flip the donation to SUCCESS and credit the campaign/stats exactly once,
+            # even when the webhook and the frontend verify land at the same time.
+            donation = await db.run_sync(donation_service.mark_success, tx_ref)
+            if donation:
+                await db.commit()
                 
         return response
     except Exception as e:
-         print(f"Verification Logic Error: {e}")
+         logger.warning(f"Verification of {tx_ref} failed: {e}")
          # Don't raise in webhook to avoid 500 retry loops if it's a logic error, but verify endpoint should raise.
          # Since this function is shared, we might want to let it raise and handle in caller.
          raise e
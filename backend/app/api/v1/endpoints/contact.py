@@ -1,9 +1,11 @@
-from typing import Any, List
+from typing import Any, List, Union
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.contact import ContactMessage
 from app.schemas.contact import ContactCreate, ContactResponse, ContactUpdate
+from app.schemas.pagination import Page
+from app.core.pagination import keyset, split_page
 
 router = APIRouter()
 
@@ -27,20 +29,29 @@ def create_contact_message(
     db.refresh(contact_message)
     return contact_message
 
-@router.get("/", response_model=List[ContactResponse])
+@router.get("/", response_model=Union[List[ContactResponse], Page[ContactResponse]])
 def read_contact_messages(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     # current_user = Depends(deps.get_current_active_superuser), # TODO: Enable auth in production
 ) -> Any:
     """
-    Retrieve contact messages (Admin only).
+    Retrieve contact messages (Admin only), newest first.
+    Pass `cursor` (empty for the first page) to get a {items, next_cursor} page instead of an offset list.
     """
     # if not current_user.is_superuser:
     #     raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    messages = db.query(ContactMessage).order_by(ContactMessage.created_at.desc()).offset(skip).limit(limit).all()
+    if cursor is not None:
+        rows = keyset(db.query(ContactMessage), ContactMessage, cursor, limit).all()
+        items, next_cursor = split_page(rows, limit)
+        return {"items": items, "next_cursor": next_cursor}
+
+    messages = db.query(ContactMessage).order_by(
+        ContactMessage.created_at.desc(), ContactMessage.id.desc()
+    ).offset(skip).limit(limit).all()
     return messages
 
 @router.put("/{id}", response_model=ContactResponse)
@@ -1,51 +1,76 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import datetime, timezone
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
-from app.models.donation import Donation as DonationModel
-from app.models.campaign import Campaign as CampaignModel
-from app.schemas.donation import Donation
+from app.core.cache import response_cache
+from app.core.etag import make_etag
+from app.models.dashboard_stats import DashboardStats
+from app.models.donation import PaymentGateway
+from app.schemas.dashboard import DonationTimeseries
+from app.services import rollup_service, stats_service, version_service
 
 router = APIRouter()
 
 @router.get("/stats")
-def get_dashboard_stats(
-    db: Session = Depends(deps.get_db),
+async def get_dashboard_stats(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
     # current_user = Depends(deps.get_current_active_user)
 ) -> Any:
     """
     Get aggregated dashboard statistics.
+    Served from the materialized stats row; see `stats_service`.
     """
-    
-    # 1. Total Raised USD (Stripe)
-    total_raised_usd = db.query(func.sum(DonationModel.amount)).filter(
-        DonationModel.status == "SUCCESS",
-        DonationModel.currency == "USD"
-    ).scalar() or 0.0
+    version = await db.run_sync(version_service.get, version_service.DASHBOARD)
+    etag = make_etag(response_cache.key_for(request), version)
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
 
-    # 2. Total Raised ETB (Chapa)
-    total_raised_etb = db.query(func.sum(DonationModel.amount)).filter(
-        DonationModel.status == "SUCCESS",
-        DonationModel.currency == "ETB"
-    ).scalar() or 0.0
+    stats = await db.get(DashboardStats, stats_service.STATS_ID)
+    if not stats:
+        # Not materialized yet (fresh database): build it once from the donation table.
+        stats = await db.run_sync(stats_service.rebuild)
+        await db.commit()
 
-    # 3. Active Campaigns
-    active_campaign_count = db.query(CampaignModel).count() # Simply count all for now, or filter by active status if column exists
+    return response_cache.store(request, dict, {
+        "total_raised_usd": stats.total_raised_usd,
+        "total_raised_etb": stats.total_raised_etb,
+        "active_campaigns": stats.active_campaigns,
+        "total_donations_count": stats.total_donations_count,
+        "recent_donations": stats.recent_donations,
+    }, tags=["dashboard"], etag=etag)
 
-    # 4. Total Donation Count
-    total_donations_count = db.query(DonationModel).filter(DonationModel.status == "SUCCESS").count()
-
-    # 5. Recent Activity (Last 5 Donations)
-    recent_donations = db.query(DonationModel).filter(
-        DonationModel.status == "SUCCESS"
-    ).order_by(DonationModel.created_at.desc()).limit(5).all()
-
-    return {
-        "total_raised_usd": total_raised_usd,
-        "total_raised_etb": total_raised_etb,
-        "active_campaigns": active_campaign_count,
-        "total_donations_count": total_donations_count,
-        "recent_donations": [Donation.model_validate(d) for d in recent_donations]
-    }
+@router.get("/timeseries", response_model=DonationTimeseries)
+async def get_donation_timeseries(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = "day",
+    campaign_id: Optional[str] = None,
+    gateway: Optional[PaymentGateway] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    # current_user = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Raised amounts (USD, ETB) and donation counts per bucket for trend charts.
+    `bucket` is hour, day, week, month or a multiple like 6h / 2d; `start`
+    defaults to 30 days before `end` (default: now). Merged from the hourly
+    and daily rollups; see `rollup_service`.
+    """
+    version = await db.run_sync(version_service.get, version_service.DASHBOARD)
+    # Without `end` the range moves with the clock: key it by the minute as well
+    now = None if end else datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M")
+    etag = make_etag(response_cache.key_for(request), version, now)
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
+    try:
+        series = await db.run_sync(
+            rollup_service.timeseries, start, end, bucket, campaign_id, gateway.value if gateway else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return response_cache.store(request, DonationTimeseries, series, tags=["dashboard"], etag=etag)
@@ -1,50 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import logging
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.core.config import settings
 import stripe
 from pydantic import BaseModel
 
-from typing import List
+from typing import List, Union
 from app.schemas.donation import Donation
+from app.schemas.pagination import Page
+from app.core.pagination import keyset, split_page
 from app.models.donation import Donation as DonationModel
+from app.services import donation_service, export_service
+from app.services.stripe_gateway import StripeError, construct_event, stripe_service
+from app.services.webhook_inbox import webhook_inbox
 
 router = APIRouter()
-
-stripe.api_key = settings.STRIPE_SECRET_KEY
+logger = logging.getLogger(__name__)
 
 from sqlalchemy.orm import joinedload
 
-@router.get("/", response_model=List[Donation])
-def read_donations(
+@router.get("/", response_model=Union[List[Donation], Page[Donation]])
+async def read_donations(
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     campaign_id: str | None = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     # current_user = Depends(deps.get_current_active_user) # Uncomment to secure
 ):
     """
-    Retrieve donations.
+    Retrieve donations, newest first.
+    Pass `cursor` (empty for the first page) to get a {items, next_cursor} page instead of an offset list.
     """
-    query = db.query(DonationModel).options(joinedload(DonationModel.campaign))
+    query = select(DonationModel).options(joinedload(DonationModel.campaign))
     
     if campaign_id:
         if campaign_id == "general":
-            query = query.filter(DonationModel.campaign_id == None)
+            query = query.where(DonationModel.campaign_id == None)
         else:
-            query = query.filter(DonationModel.campaign_id == campaign_id)
+            query = query.where(DonationModel.campaign_id == campaign_id)
             
-    donations = query.order_by(DonationModel.created_at.desc()).offset(skip).limit(limit).all()
-    return donations
+    if cursor is not None:
+        result = await db.execute(keyset(query, DonationModel, cursor, limit))
+        items, next_cursor = split_page(result.scalars().all(), limit)
+        return {"items": items, "next_cursor": next_cursor}
+
+    result = await db.execute(
+        query.order_by(DonationModel.created_at.desc(), DonationModel.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+@router.get("/export")
+async def export_donations(
+    request: Request,
+    format: str = "csv",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    gateway: str | None = None,
+    status: str | None = None,
+    currency: str | None = None,
+    campaign_id: str | None = None,
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Stream the donation ledger as CSV or NDJSON for finance reconciliation.
+    Filter by created_at range [start, end), gateway, status, currency and campaign_id
+    ("general" for donations without a campaign). Gzipped when the client accepts it.
+    """
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+
+    body = export_service.stream_donations(
+        format, start=start, end=end, gateway=gateway, status=status, currency=currency, campaign_id=campaign_id
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"donations-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Vary": "Accept-Encoding"}
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = export_service.gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 class PaymentIntentCreate(BaseModel):
     amount: float
     currency: str = "usd" # Default to USD
     email: str | None = None
+    # Carried in the intent's metadata so the webhook can attribute the donation
+    campaign_id: str | None = None
+    campaign_title: str | None = None
 
 @router.post("/create-payment-intent")
-def create_payment_intent(
+async def create_payment_intent(
     payment_in: PaymentIntentCreate,
 ):
     """
@@ -53,19 +105,17 @@ def create_payment_intent(
     try:
         # Amount in cents
         amount_cents = int(payment_in.amount * 100)
-        
-        intent = stripe.PaymentIntent.create(
-            amount=amount_cents,
-            currency=payment_in.currency,
-            automatic_payment_methods={
-                'enabled': True,
-            },
+        intent = await stripe_service.create_payment_intent(
+            amount_cents,
+            payment_in.currency,
             receipt_email=payment_in.email,
-             metadata={
+            metadata={
                 'integration_check': 'accept_a_payment',
+                'campaign_id': payment_in.campaign_id,
+                'campaign_title': payment_in.campaign_title,
             },
         )
-        return {"clientSecret": intent.client_secret}
+        return {"clientSecret": intent["client_secret"]}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -76,75 +126,64 @@ class StripeVerifyRequest(BaseModel):
     donor_email: str | None = None
 
 @router.post("/stripe/verify", response_model=Donation)
-def verify_stripe_donation(
+async def verify_stripe_donation(
     verify_in: StripeVerifyRequest,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
     Verify Stripe PaymentIntent status and record donation in DB.
+    The webhook below records the same payment without waiting for the browser;
+    whichever arrives first creates the donation.
     """
     try:
         # 1. Retrieve the intent from Stripe to ensure it's valid and successful
-        intent = stripe.PaymentIntent.retrieve(verify_in.payment_intent_id)
-        
-        if intent.status != 'succeeded':
-             raise HTTPException(status_code=400, detail=f"Payment not successful. Status: {intent.status}")
-
-        # 2. Check if transaction already recorded to prevent duplicates
-        existing = db.query(DonationModel).filter(DonationModel.transaction_id == intent.id).first()
-        if existing:
-            return existing
-
-        # 3. Create Donation Record
-        # Stripe amount is in cents, convert back to dollars
-        amount_usd = intent.amount / 100.0
-        
-        # Try to resolve campaign_id from title if possible, or just store title in metadata if model supported it.
-        # For now, we just record the donation globally if campaign_id lookup is complex, 
-        # but let's try to lookup campaign by title if provided.
-        campaign_id = None
-        if verify_in.campaign_title:
-             # Basic lookup - import needed
-             from app.models.campaign import Campaign as CampaignModel
-             campaign = db.query(CampaignModel).filter(CampaignModel.title == verify_in.campaign_title).first()
-             if campaign:
-                 campaign_id = campaign.id
-
-        new_donation = DonationModel(
-            amount=amount_usd,
-            currency=intent.currency.upper(),
-            payment_gateway="STRIPE",
-            transaction_id=intent.id,
-            status="SUCCESS",
-            donor_email=verify_in.donor_email or intent.receipt_email, # prioritizing passed email (though stripe doesn't always have it)
-            campaign_id=campaign_id,
-            donor_name="Guest Donor" # Placeholder
+        intent = await stripe_service.retrieve_payment_intent(verify_in.payment_intent_id)
+
+        if intent.get("object") != "payment_intent":
+            raise HTTPException(status_code=400, detail="Not a PaymentIntent")
+        if intent["status"] != 'succeeded':
+             raise HTTPException(status_code=400, detail=f"Payment not successful. Status: {intent['status']}")
+
+        # 2. Insert as SUCCESS (once) and credit campaign total + dashboard stats in one transaction.
+        donation = await db.run_sync(
+            donation_service.record_stripe_payment, intent, verify_in.campaign_title, verify_in.donor_email
         )
-        
-        db.add(new_donation)
-        db.commit()
-        db.refresh(new_donation)
-        
-        # 4. Update Campaign Context (Total Raised)
-        if campaign_id:
-             # Re-calculate or increment campaign totals
-             # Ideally this should be a utility function but doing inline for now
-             # We need to query all successful donations for this campaign to be safe/accurate
-             total_usd = db.query(func.sum(DonationModel.amount)).filter(
-                 DonationModel.campaign_id == campaign_id,
-                 DonationModel.currency == 'USD',
-                 DonationModel.status == 'SUCCESS'
-             ).scalar() or 0.0
-             
-             # Assuming ETB logic is handled separately or we just update USD here
-             campaign.current_raised_usd = total_usd
-             db.add(campaign)
-             db.commit()
-
-        return new_donation
-
-    except stripe.error.StripeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        await db.commit()
+        return donation
+
+    except HTTPException:
+        raise
+    except StripeError as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
-        print(f"Error verifying donation: {e}")
+        logger.exception(f"Error verifying donation: {e}")
         raise HTTPException(status_code=500, detail="Internal Verification Error")
+
+@router.post("/stripe/webhook")
+async def stripe_webhook(
+    request: Request,
+    stripe_signature: str | None = Header(None),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    """
+    Handle Stripe webhooks. The signature is checked and payment_intent.succeeded
+    events are recorded (idempotently) in the webhook inbox, which creates the
+    donation in the background; Stripe gets its 200 immediately.
+    """
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Stripe webhook is not configured")
+    body = await request.body()
+    try:
+        event = construct_event(body, stripe_signature)
+    except stripe.error.SignatureVerificationError:
+        raise HTTPException(status_code=400, detail="Invalid signature")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payload")
+
+    if event.get("type") == "payment_intent.succeeded":
+        intent_id = event["data"]["object"]["id"]
+        await db.run_sync(webhook_inbox.record, "STRIPE", intent_id, body, event)
+        await db.commit()
+        webhook_inbox.notify()
+
+    return {"status": "ok"}
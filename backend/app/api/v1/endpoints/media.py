@@ -1,47 +1,93 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Dict, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.services import media_service
+from app.services import media_service, version_service
+from app.services.image_service import image_pipeline
 from app.api.deps import get_current_active_user
+from app.core import metrics
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.schemas.pagination import Page
+from app.models.media import MediaType
 
 router = APIRouter()
 
 # Schema for Response (reuse logic slightly)
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+class MediaVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
 class MediaSchema(BaseModel):
     id: str
     url: str
     title: str | None
     description: str | None
     media_type: str
+    # Filled in by the image pipeline; `url` stays the original
+    width: int | None = None
+    height: int | None = None
+    placeholder: str | None = None
+    variants: List[MediaVariant] | None = None
+
+    @computed_field
+    @property
+    def srcset(self) -> Dict[str, str]:
+        """
+        One srcset per format (e.g. {"avif": "/static/uploads/x-320.avif 320w, ..."}) for <picture> sources.
+        """
+        srcsets: Dict[str, List[str]] = {}
+        for variant in self.variants or []:
+            srcsets.setdefault(variant.format, []).append(f"{variant.url} {variant.width}w")
+        return {fmt: ", ".join(entries) for fmt, entries in srcsets.items()}
     
     class Config:
         from_attributes = True
 
-@router.get("/", response_model=List[MediaSchema])
+@router.get("/", response_model=Union[List[MediaSchema], Page[MediaSchema]])
 def read_media(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
     media_type: str | None = None,
+    cursor: str | None = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get all gallery items.
+    Get all gallery items, newest first.
+    Pass `cursor` (empty for the first page) to get a {items, next_cursor} page instead of an offset list.
     """
-    return media_service.get_multi(db, skip=skip, limit=limit, media_type=media_type)
+    etag = make_etag(response_cache.key_for(request), version_service.get(db, version_service.MEDIA))
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
+    if cursor is not None:
+        items, next_cursor = media_service.get_page(db, cursor=cursor, limit=limit, media_type=media_type)
+        page = {"items": items, "next_cursor": next_cursor}
+        return response_cache.store(request, Page[MediaSchema], page, tags=["media"], etag=etag)
+    media = media_service.get_multi(db, skip=skip, limit=limit, media_type=media_type)
+    return response_cache.store(request, List[MediaSchema], media, tags=["media"], etag=etag)
 
 @router.post("/", response_model=MediaSchema)
 def create_media(
     *,
     db: Session = Depends(get_db),
     media_in: media_service.MediaCreate,
+    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_active_user)
 ):
     """
     Upload new media (Admin only).
+    Uploaded images get their responsive variants attached in the background.
     """
-    return media_service.create(db=db, obj_in=media_in)
+    media = media_service.create(db=db, obj_in=media_in)
+    if settings.IMAGE_VARIANTS_ENABLED and media.media_type == MediaType.IMAGE and image_pipeline.local_path(media.url):
+        background_tasks.add_task(image_pipeline.process, media.id)
+    return media
 
 @router.delete("/{id}", response_model=Any)
 def delete_media(
@@ -66,41 +112,40 @@ def test_media_router():
     """
     return {"message": "Media router is working!"}
 
-from fastapi import UploadFile, File
-import aiofiles
-import os
-import uuid
 import logging
+from app.services import upload_service
 
 logger = logging.getLogger(__name__)
 
-@router.post("/upload")
+@router.post("/upload", openapi_extra={
+    "requestBody": {"content": {"multipart/form-data": {"schema": {
+        "type": "object", "required": ["file"], "properties": {"file": {"type": "string", "format": "binary"}},
+    }}}, "required": True},
+})
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_active_user)
 ):
     """
-    Upload a file and return its URL.
-    Stores in 'static/uploads'.
+    Upload a file (multipart field `file`) and return its URL.
+    The body is streamed to UPLOAD_DIR in chunks and hashed on the way; identical
+    files share one stored blob. Oversized files get a 413 (see UPLOAD_MAX_*_BYTES).
     """
-    logger.info(f"Received upload request for file: {file.filename}")
-    
     try:
-        UPLOAD_DIR = "/app/static/uploads" # Use absolute path inside container
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        
-        # Generate unique filename
-        ext = file.filename.split('.')[-1]
-        filename = f"{uuid.uuid4()}.{ext}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        async with aiofiles.open(file_path, 'wb') as out_file:
-            content = await file.read()  # async read
-            await out_file.write(content)  # async write
-            
-        logger.info(f"File saved successfully to: {file_path}")
-        return {"url": f"/static/uploads/{filename}"}
-        
+        stored = await upload_service.store_upload(request)
+    except HTTPException as e:
+        metrics.UPLOADS.labels("rejected" if e.status_code < 500 else "error").inc()
+        raise
     except Exception as e:
+        metrics.UPLOADS.labels("error").inc()
         logger.error(f"Error saving file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Could not save file: {str(e)}")
+
+    metrics.UPLOADS.labels("ok").inc()
+    metrics.UPLOAD_BYTES.inc(stored.size)
+    if settings.IMAGE_VARIANTS_ENABLED and stored.content_type.startswith("image/"):
+        # Render the variants now; the Media row created for this URL just records them
+        background_tasks.add_task(image_pipeline.warm, image_pipeline.local_path(stored.url))
+    logger.info(f"Stored upload {stored.url} ({stored.size} bytes, deduplicated={stored.deduplicated})")
+    return {"url": stored.url, "sha256": stored.sha256, "size": stored.size, "deduplicated": stored.deduplicated}
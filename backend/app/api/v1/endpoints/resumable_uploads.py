@@ -0,0 +1,184 @@
+from typing import List, Optional
+from urllib.parse import urlparse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core import metrics
+from app.core.config import settings
+from app.models.media import MediaType
+from app.models.resumable_upload import ResumableUpload, ResumableUploadStatus
+from app.services import upload_service
+from app.services import resumable_upload_service as uploads
+from app.services.image_service import image_pipeline
+
+router = APIRouter()
+
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+
+def _check_version(tus_resumable: Optional[str]) -> None:
+    if tus_resumable is not None and tus_resumable != uploads.TUS_VERSION:
+        raise HTTPException(
+            status_code=412, detail="Unsupported tus version", headers={"Tus-Version": uploads.TUS_VERSION},
+        )
+
+def _tus_headers(upload: Optional[ResumableUpload] = None, **extra: str) -> dict:
+    headers = {"Tus-Resumable": uploads.TUS_VERSION, **extra}
+    if upload is not None and upload.status != ResumableUploadStatus.STORED:
+        headers["Upload-Expires"] = uploads.expires_at(upload).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    return headers
+
+def _stored_headers(media) -> dict:
+    return {"X-Media-Id": media.id, "X-Media-Url": media.url}
+
+def _part_ids(upload_concat: str) -> List[str]:
+    # "final;/api/v1/media/uploads/<id> /api/v1/media/uploads/<id>" (absolute URLs allowed too)
+    return [urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] for url in upload_concat[len("final;"):].split()]
+
+async def _get(db: AsyncSession, id: str) -> ResumableUpload:
+    upload = await db.get(ResumableUpload, id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found", headers=_tus_headers())
+    return upload
+
+async def _store(db: AsyncSession, upload: ResumableUpload, background_tasks: BackgroundTasks):
+    try:
+        media = await uploads.store(db, upload)
+    except Exception:
+        metrics.UPLOADS.labels("error").inc()
+        raise
+    metrics.UPLOADS.labels("ok").inc()
+    metrics.UPLOAD_BYTES.inc(upload.length)
+    if settings.IMAGE_VARIANTS_ENABLED and media.media_type == MediaType.IMAGE:
+        background_tasks.add_task(image_pipeline.process, media.id)
+    return media
+
+@router.options("/")
+def upload_capabilities() -> Response:
+    """
+    tus discovery: protocol version, supported extensions and the largest accepted upload.
+    """
+    max_size = max(settings.UPLOAD_MAX_IMAGE_BYTES, settings.UPLOAD_MAX_VIDEO_BYTES)
+    return Response(status_code=204, headers=_tus_headers(**{
+        "Tus-Version": uploads.TUS_VERSION, "Tus-Extension": uploads.TUS_EXTENSIONS, "Tus-Max-Size": str(max_size),
+    }))
+
+@router.post("/", status_code=201)
+async def create_upload(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    upload_length: Optional[int] = Header(None),
+    upload_metadata: Optional[str] = Header(None),
+    upload_concat: Optional[str] = Header(None),
+    tus_resumable: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Start a resumable upload (tus creation). Send `Upload-Length` and
+    `Upload-Metadata` (base64 `filename`, `filetype`, `title`, `description`,
+    `category`), then PATCH the bytes to the returned Location.
+
+    For parallel uploads create several `Upload-Concat: partial` uploads,
+    PATCH them concurrently, then POST `Upload-Concat: final;<url> <url> ...`:
+    the parts are joined in that order and stored straight away.
+    """
+    _check_version(tus_resumable)
+    metadata = uploads.parse_metadata(upload_metadata)
+    content_type = uploads.content_type_of(metadata)
+    if not uploads.media_type_for(content_type):
+        raise HTTPException(status_code=415, detail="Only image and video uploads are supported", headers=_tus_headers())
+    limit = upload_service.max_bytes_for(content_type)
+
+    is_final = (upload_concat or "").startswith("final;")
+    if is_final:
+        parts = await db.run_sync(uploads.claim_parts, _part_ids(upload_concat))
+        upload_length = sum(part.length for part in parts)
+    else:
+        parts = None
+        if upload_length is None or upload_length < 0:
+            raise HTTPException(status_code=400, detail="Upload-Length is required", headers=_tus_headers())
+    if upload_length > limit:
+        await db.rollback()
+        raise HTTPException(status_code=413, detail=f"Upload too large (limit {limit // (1024 * 1024)} MB)", headers=_tus_headers())
+
+    upload = await db.run_sync(
+        uploads.create, upload_length, metadata, is_partial=upload_concat == "partial", parts=parts,
+        created_by=current_user.id,
+    )
+    await db.commit()
+
+    headers = _tus_headers(upload, Location=f"{request.url.path.rstrip('/')}/{upload.id}")
+    if is_final:
+        headers.update(_stored_headers(await _store(db, upload, background_tasks)))
+    return Response(status_code=201, headers=headers)
+
+@router.head("/{id}")
+async def upload_status(
+    id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Where to resume: the durable `Upload-Offset` of the upload.
+    """
+    upload = await _get(db, id)
+    headers = _tus_headers(upload, **{
+        "Upload-Offset": str(upload.offset), "Upload-Length": str(upload.length), "Cache-Control": "no-store",
+    })
+    if upload.is_partial:
+        headers["Upload-Concat"] = "partial"
+    return Response(status_code=200, headers=headers)
+
+@router.patch("/{id}")
+async def append_to_upload(
+    id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    upload_offset: Optional[int] = Header(None),
+    content_type: Optional[str] = Header(None),
+    tus_resumable: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Append the body at `Upload-Offset`. The offset is checkpointed while the
+    body streams in, so after a dropped connection HEAD tells where to resume.
+    Completing a (non-partial) upload stores it as a Media row (X-Media-Id).
+    """
+    _check_version(tus_resumable)
+    if content_type != OFFSET_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be {OFFSET_CONTENT_TYPE}", headers=_tus_headers())
+    if upload_offset is None:
+        raise HTTPException(status_code=400, detail="Upload-Offset is required", headers=_tus_headers())
+
+    upload = await db.run_sync(uploads.claim, id, upload_offset)
+    await db.commit()
+    if upload is None:
+        current = await _get(db, id)
+        if current.status == ResumableUploadStatus.STORED or current.offset != upload_offset:
+            raise HTTPException(status_code=409, detail=f"Upload is at offset {current.offset}", headers=_tus_headers(current))
+        raise HTTPException(status_code=423, detail="Upload is being written by another request", headers=_tus_headers(current))
+
+    offset = await uploads.receive(db, request, upload)
+    headers = _tus_headers(upload, **{"Upload-Offset": str(offset)})
+    if offset == upload.length and not upload.is_partial:
+        headers.update(_stored_headers(await _store(db, upload, background_tasks)))
+    return Response(status_code=204, headers=headers)
+
+@router.delete("/{id}", status_code=204)
+async def terminate_upload(
+    id: str,
+    tus_resumable: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Abandon an upload (tus termination) and free its space.
+    """
+    _check_version(tus_resumable)
+    upload = await _get(db, id)
+    if upload.status == ResumableUploadStatus.STORED:
+        raise HTTPException(status_code=409, detail="Upload is already stored", headers=_tus_headers())
+    await uploads.terminate(db, upload)
+    return Response(status_code=204, headers=_tus_headers())
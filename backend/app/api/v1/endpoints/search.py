@@ -0,0 +1,46 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.schemas.search import SearchHit
+from app.services import search_service
+
+router = APIRouter()
+
+def _types(requested: Optional[List[str]], allowed) -> List[str]:
+    if not requested:
+        return list(allowed)
+    unknown = [t for t in requested if t not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search type(s): {', '.join(unknown)} (expected {', '.join(allowed)})")
+    return list(dict.fromkeys(requested))
+
+@router.get("/", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    type: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Search active campaigns, media and site content (Public), best match first.
+    Every word is matched as a prefix; repeat `type` to narrow the search.
+    """
+    return search_service.search(db, q, _types(type, search_service.PUBLIC_TYPES), limit=limit, offset=offset)
+
+@router.get("/admin", response_model=List[SearchHit])
+def search_admin(
+    q: str = Query(..., min_length=2, max_length=200),
+    type: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Search everything, including contact messages and inactive campaigns (Admin only).
+    """
+    return search_service.search(
+        db, q, _types(type, tuple(search_service.SOURCES)), limit=limit, offset=offset, public=False,
+    )
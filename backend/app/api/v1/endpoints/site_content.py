@@ -1,15 +1,20 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.crud.crud_site_content import site_content as crud_content
-from app.schemas.site_content import SiteContent, SiteContentCreate, SiteContentUpdate
+from app.schemas.site_content import SiteContent, SiteContentCreate
 from app.models.site_content import SiteContent as SiteContentModel
+from app.core.cache import response_cache
+from app.core.etag import make_etag
+from app.services import version_service
+from app.services.content_bundle import content_bundle
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SiteContent])
 def read_site_content(
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
@@ -18,31 +23,53 @@ def read_site_content(
     """
     Retrieve site content.
     """
+    etag = make_etag(response_cache.key_for(request), version_service.get(db, version_service.SITE_CONTENT))
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
     if section:
-        return crud_content.get_by_section(db, section=section)
-    return crud_content.get_multi(db, skip=skip, limit=limit)
+        items = crud_content.get_by_section(db, section=section)
+        return response_cache.store(request, List[SiteContent], items, tags=[f"site_content:{section}"], etag=etag)
+    items = crud_content.get_multi(db, skip=skip, limit=limit)
+    return response_cache.store(request, List[SiteContent], items, tags=["site_content"], etag=etag)
+
+@router.get("/bundle", response_model=Dict[str, Dict[str, Optional[str]]])
+def read_site_content_bundle(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    section: List[str] | None = Query(None),
+) -> Any:
+    """
+    All site content as one {section: {key: content}} document.
+    Optionally limited with ?section=HERO&section=ABOUT (or ?section=HERO,ABOUT).
+    """
+    version = version_service.get(db, version_service.SITE_CONTENT)
+    etag = make_etag(response_cache.key_for(request), version)
+    cached = response_cache.get(request, etag=etag)
+    if cached:
+        return cached
+
+    sections = None
+    if section:
+        sections = [s.strip() for value in section for s in value.split(",") if s.strip()]
+    document = content_bundle.get(db, version, sections=sections)
+    return response_cache.store(request, Dict[str, Dict[str, Optional[str]]], document, tags=["site_content"], etag=etag)
 
 @router.post("/bulk-update", response_model=List[SiteContent])
 def bulk_update_site_content(
     updates: Dict[str, str], # Key: Content
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ) -> Any:
     """
-    Update multiple content fields at once.
-    Keys must already exist (or will be created if mapped properly).
-    """
-    updated_items = []
-    for key, value in updates.items():
-        # Check if exists
-        item = crud_content.get_by_key(db, key=key)
-        if item:
-            item = crud_content.update(db, db_obj=item, obj_in=SiteContentUpdate(content=value))
-            updated_items.append(item)
-        else:
-             # If it doesn't exist, we can't update it blindly without knowing the section.
-             # Ideally, we should seed content first. 
-             pass 
+    Update multiple content fields at once, in a single transaction.
+    Keys must already exist; unknown keys are skipped and listed in the
+    X-Missing-Keys response header (we can't create them without a section).
+    """
+    updated_items, missing = crud_content.bulk_update(db, updates=updates)
+    if missing:
+        response.headers["X-Missing-Keys"] = ",".join(missing)
     return updated_items
 
 @router.post("/initialize", response_model=Dict[str, int])
@@ -54,9 +81,6 @@ def initialize_defaults(
     """
     Seed default content if it doesn't exist.
     """
-    count = 0
-    for item in defaults:
-        if not crud_content.get_by_key(db, key=item.key):
-            crud_content.create(db, obj_in=item)
-            count += 1
-    return {"created": count}
+    existing = crud_content.get_by_keys(db, [item.key for item in defaults])
+    created = crud_content.bulk_create(db, objs_in=[item for item in defaults if item.key not in existing])
+    return {"created": len(created)}
@@ -0,0 +1,104 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.core.cache import MemoryCacheBackend
+from app.core.config import settings
+from app.models.user import User
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    What the auth dependencies hand to routes: the fields authorization needs,
+    detached from any DB session.
+    """
+    id: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, is_active=bool(user.is_active), is_superuser=bool(user.is_superuser))
+
+class AuthCache:
+    """
+    Per-process TTL/LRU caches for `deps.get_current_user`:
+    token -> subject (never past the token's own `exp`) and user id -> Principal.
+    Principals are dropped when the User row changes (see the listeners below);
+    other worker processes pick the change up within AUTH_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self.tokens = MemoryCacheBackend(max_entries, ttl)
+        self.principals = MemoryCacheBackend(max_entries, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def get_subject(self, token: str) -> Optional[str]:
+        return self.tokens.get(token) if self.enabled else None
+
+    def set_subject(self, token: str, subject: str, expires_at: Optional[float]) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, int(expires_at - time.time()))
+        if ttl > 0:
+            self.tokens.set(token, subject, (f"user:{subject}",), ttl)
+
+    def get_principal(self, user_id: str) -> Optional[Principal]:
+        principal = self.principals.get(user_id) if self.enabled else None
+        if principal is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return principal
+
+    def set_principal(self, principal: Principal) -> None:
+        if self.enabled:
+            self.principals.set(principal.id, principal, (f"user:{principal.id}",))
+
+    def invalidate_user(self, *user_ids: str) -> None:
+        """
+        Forget the cached principal of each user (e.g. deactivated or promoted).
+        """
+        self.principals.invalidate(f"user:{user_id}" for user_id in user_ids)
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.principals.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "tokens": len(self.tokens),
+            "principals": len(self.principals),
+        }
+
+auth_cache = AuthCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS, enabled=settings.AUTH_CACHE_ENABLED)
+
+# Any ORM update/delete of a User invalidates its principal once the transaction commits.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _queue_user_invalidation(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("auth_user_ids", set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    user_ids = session.info.pop("auth_user_ids", None)
+    if user_ids:
+        auth_cache.invalidate_user(*user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_users(session: Session) -> None:
+    session.info.pop("auth_user_ids", None)
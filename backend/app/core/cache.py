@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import cache_headers, etag_matches, not_modified
+
+def _matches(tag: str, pattern: str) -> bool:
+    # "campaign:*" matches "campaign" itself and every "campaign:<...>" tag
+    if pattern.endswith(":*"):
+        base = pattern[:-2]
+        return tag == base or tag.startswith(base + ":")
+    return tag == pattern
+
+class MemoryCacheBackend:
+    """
+    In-process LRU with per-entry TTL and a tag -> keys index.
+    Per worker process; use the Redis backend when running several workers.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            body, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], ttl: Optional[int] = None) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic() + (ttl or self.default_ttl), tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, patterns: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for pattern in patterns:
+                for tag in [t for t in self._tags if _matches(t, pattern)]:
+                    for key in list(self._tags.get(tag, ())):
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisCacheBackend:
+    """
+    Shared cache across workers. Tags are Redis sets of cache keys.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, default_ttl: int, prefix: str = "respcache:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from e
+        self.redis = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.redis.get(self.prefix + key)
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], ttl: Optional[int] = None) -> None:
+        ttl = ttl or self.default_ttl
+        pipe = self.redis.pipeline()
+        pipe.set(self.prefix + key, body, ex=ttl)
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate(self, patterns: Iterable[str]) -> int:
+        tag_keys = set()
+        for pattern in patterns:
+            if pattern.endswith(":*"):
+                base = pattern[:-2]
+                tag_keys.add(f"{self.prefix}tag:{base}")
+                tag_keys.update(self.redis.scan_iter(match=f"{self.prefix}tag:{base}:*"))
+            else:
+                tag_keys.add(f"{self.prefix}tag:{pattern}")
+        keys = set()
+        for tag_key in tag_keys:
+            keys.update(k.decode() if isinstance(k, bytes) else k for k in self.redis.smembers(tag_key))
+        if keys or tag_keys:
+            self.redis.delete(*[self.prefix + k for k in keys], *tag_keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        keys = list(self.redis.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.redis.delete(*keys)
+
+class ResponseCache:
+    """
+    Caches serialized JSON responses of public read endpoints, keyed by
+    route path + query params and invalidated by tags from the write paths.
+    A hit skips the DB query and Pydantic serialization entirely.
+    """
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.not_modified = 0
+        self._adapters: Dict[Any, TypeAdapter] = {}
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def _key(self, request: Request, etag: Optional[str]) -> str:
+        # The ETag embeds the table version, so a write seen by any worker
+        # also retires this worker's entry even if its tag invalidation was missed.
+        key = self.key_for(request)
+        return f"{key}#{etag}" if etag else key
+
+    def get(self, request: Request, etag: Optional[str] = None) -> Optional[Response]:
+        """
+        Return a 304 if the client already holds `etag`, the cached body if
+        there is one, or None when the caller has to build the response.
+        """
+        if etag and etag_matches(request, etag):
+            self.not_modified += 1
+            return not_modified(etag)
+        if not self.enabled:
+            return None
+        body = self.backend.get(self._key(request, etag))
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        headers = {"X-Cache": "HIT", **(cache_headers(etag) if etag else {})}
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def serialize(self, response_model: Any, data: Any) -> bytes:
+        adapter = self._adapters.get(response_model)
+        if adapter is None:
+            adapter = self._adapters[response_model] = TypeAdapter(response_model)
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+    def store(
+        self,
+        request: Request,
+        response_model: Any,
+        data: Any,
+        tags: List[str],
+        ttl: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Response:
+        """
+        Serialize `data` with `response_model`, cache it under the request key and return it.
+        """
+        body = self.serialize(response_model, data)
+        if self.enabled:
+            self.backend.set(self._key(request, etag), body, tags, ttl)
+        headers = {"X-Cache": "MISS", **(cache_headers(etag) if etag else {})}
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, *tags: str) -> None:
+        if tags:
+            self.invalidations += self.backend.invalidate(tags)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidated_entries": self.invalidations,
+            "entries": len(self.backend) if hasattr(self.backend, "__len__") else None,
+        }
+
+def _build_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+response_cache = ResponseCache(_build_backend(), enabled=settings.RESPONSE_CACHE_ENABLED)
+
+def invalidate_on_commit(db: Any, *tags: str) -> None:
+    """
+    Queue cache tags to invalidate once the session's transaction commits.
+    Invalidating before the commit would let a concurrent read re-cache stale rows.
+    Accepts a Session or an AsyncSession.
+    """
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session) -> None:
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tags(session: Session) -> None:
+    session.info.pop("cache_tags", None)
@@ -42,11 +42,77 @@ class Settings(BaseSettings):
             path=f"{values.get('POSTGRES_DB') or ''}",
         ).unicode_string()
 
+    # Engines (sync and async share these); pool usage at GET /health/db
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0 # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = 1800 # Reconnect connections older than this (seconds); -1 = never
+    DB_STATEMENT_TIMEOUT_MS: int = 0 # Postgres statement_timeout per connection; 0 = no limit
+    DB_ECHO: bool = False # Log every statement; local debugging only
+
+    # Media uploads: streamed to UPLOAD_DIR, stored once per content hash
+    UPLOAD_DIR: str = "static/uploads" # Served by the /static mount
+    UPLOAD_URL_PREFIX: str = "/static/uploads"
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    UPLOAD_MAX_IMAGE_BYTES: int = 20 * 1024 * 1024
+    UPLOAD_MAX_VIDEO_BYTES: int = 2 * 1024 * 1024 * 1024
+    UPLOAD_MAX_OTHER_BYTES: int = 20 * 1024 * 1024
+
+    # Delivery of /static (app.core.static_media): "app" streams files from the workers with byte
+    # ranges and precompressed siblings; "accel" answers with X-Accel-Redirect for the proxy to serve
+    MEDIA_DELIVERY: str = "app"
+    MEDIA_ACCEL_PREFIX: str = "/_media" # Internal proxy location mapped onto the static directory
+    MEDIA_IMMUTABLE_MAX_AGE: int = 365 * 24 * 3600 # For content-addressed names, sent with `immutable`
+    MEDIA_PRECOMPRESS_MIN_BYTES: int = 1024 # Smaller compressible uploads get no .br/.gz sibling
+
+    # Resumable (tus 1.0) uploads at /api/v1/media/uploads; parts are kept outside the /static mount,
+    # on persistent storage (the upload_parts volume in docker-compose) so restarts do not lose them.
+    # On the same filesystem as UPLOAD_DIR a finished part is hard-linked; otherwise it is copied
+    RESUMABLE_UPLOAD_DIR: str = "data/uploads-partial"
+    RESUMABLE_UPLOAD_CHECKPOINT_BYTES: int = 8 * 1024 * 1024 # Durable offset recorded at least this often
+    RESUMABLE_UPLOAD_LEASE_SECONDS: int = 120 # A PATCH that stops checkpointing loses the upload after this
+    RESUMABLE_UPLOAD_EXPIRE_HOURS: int = 24 # Idle uploads are garbage-collected after this
+    RESUMABLE_UPLOAD_GC_INTERVAL_SECONDS: int = 3600 # 0 disables the in-process collector
+
+    # Image derivatives (responsive widths, WebP/AVIF, LQIP) rendered in a process pool
+    IMAGE_VARIANTS_ENABLED: bool = True
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1024, 1600]
+    IMAGE_VARIANT_FORMATS: List[str] = ["avif", "webp"] # Preference order for <picture> sources
+    IMAGE_WEBP_QUALITY: int = 78
+    IMAGE_AVIF_QUALITY: int = 55
+    IMAGE_WORKERS: int = 2 # Worker processes per API process
+
+    # Prometheus metrics at GET /metrics (cheap enough to leave on)
+    METRICS_ENABLED: bool = True
+
+    # Query profiler (replaces echo): per-endpoint counts/DB time at GET /health/queries
+    DB_PROFILER_ENABLED: bool = False
+    DB_PROFILER_SLOW_STATEMENTS: int = 20
+    DB_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5 # Same SELECT this many times in one request
+
+    # Async driver URI used by the AsyncSession layer; derived from the sync URI if unset
+    SQLALCHEMY_ASYNC_DATABASE_URI: Union[str, None] = None
+
+    @validator("SQLALCHEMY_ASYNC_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Union[str, None], values: dict) -> str:
+        if isinstance(v, str):
+            return v
+        uri = values.get("SQLALCHEMY_DATABASE_URI") or ""
+        for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if uri.startswith(prefix):
+                return "postgresql+asyncpg://" + uri[len(prefix):]
+        return uri
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 11520 # 8 days
 
+    # Per-process cache of decoded tokens and user principals for get_current_user
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60 # Upper bound on how long other workers see a stale role
+    AUTH_CACHE_MAX_ENTRIES: int = 4096
+
     # Google OAuth
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
@@ -60,11 +126,69 @@ class Settings(BaseSettings):
 
     # Stripe
     STRIPE_SECRET_KEY: str
+    STRIPE_WEBHOOK_SECRET: str = "" # whsec_...; the webhook endpoint is disabled without it
+    STRIPE_API_BASE: str = "https://api.stripe.com/v1" # e.g. http://127.0.0.1:8912/v1 for scripts/stripe_stub.py
+    STRIPE_TIMEOUT_SECONDS: float = 10.0
 
     # Chapa
     CHAPA_PUBLIC_KEY: str
     CHAPA_SECRET_KEY: str
     CHAPA_WEBHOOK_SECRET: str
+    CHAPA_BASE_URL: str = "https://api.chapa.co/v1"
+
+    GOOGLE_USERINFO_URI: str = "https://www.googleapis.com/oauth2/v1/userinfo"
+
+    # Shared outbound HTTP client (Chapa, Stripe, Google OAuth)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_TIMEOUT: float = 15.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_RETRIES: int = 2 # Extra attempts on connect errors / 5xx
+    HTTP_CLIENT_RETRY_BACKOFF: float = 0.25 # Seconds, doubled per attempt
+
+    # Background reconciliation of stale PENDING Chapa donations
+    RECONCILER_ENABLED: bool = False # Run inside the API process; or use scripts/reconcile_payments.py
+    RECONCILER_INTERVAL_SECONDS: int = 300
+    RECONCILER_MIN_AGE_MINUTES: int = 30 # Leave fresh checkouts to the redirect/webhook
+    RECONCILER_EXPIRE_AFTER_HOURS: int = 24 # Still pending after this long -> EXPIRED
+    RECONCILER_BATCH_SIZE: int = 100
+    RECONCILER_CONCURRENCY: int = 5
+    RECONCILER_RATE_PER_SECOND: float = 5.0 # Chapa verify calls per second
+
+    # Webhook inbox: the endpoint stores + acks, workers drain with retries
+    WEBHOOK_INBOX_WORKERS: int = 2 # In the API process; 0 = drain with scripts/process_webhooks.py
+    WEBHOOK_INBOX_BATCH_SIZE: int = 20
+    WEBHOOK_INBOX_MAX_ATTEMPTS: int = 8 # Then DEAD (dead letter)
+    WEBHOOK_INBOX_RETRY_BACKOFF_SECONDS: float = 5.0 # Doubled per attempt
+    WEBHOOK_INBOX_MAX_BACKOFF_SECONDS: float = 3600.0
+    WEBHOOK_INBOX_POLL_SECONDS: float = 2.0
+    WEBHOOK_INBOX_LEASE_SECONDS: int = 120 # PROCESSING events of a crashed worker are retried after this
+
+    # In-process campaign id/slug/title registry (app.services.campaign_registry)
+    CAMPAIGN_REGISTRY_CHECK_SECONDS: float = 1.0 # How stale another worker's campaign writes can be
+    CAMPAIGN_REGISTRY_MISS_SECONDS: float = 60.0 # Unknown ids/slugs/titles answered without a query for this long
+    CAMPAIGN_REGISTRY_MAX_MISSES: int = 10000 # Remembered unknown keys per process; cleared when full
+
+    # Donation trend charts at /api/v1/dashboard/timeseries (app.services.rollup_service)
+    TIMESERIES_MAX_BUCKETS: int = 2000 # Per request; e.g. ~83 days of hourly buckets
+
+    # Full-text search at /api/v1/search (app.services.search_service)
+    SEARCH_MAX_TERMS: int = 8 # Words of a query used, the rest is ignored
+    # Matches ranked per type, bounding the cost of very common terms; past it the best ones can be
+    # missed (bench_search.py reports the recall). 0 ranks every match
+    SEARCH_MAX_CANDIDATES: int = 2000
+
+    # Response cache for public read endpoints ("memory" or "redis")
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: Union[str, None] = None
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Cache-Control max-age for ETag'd public reads; 0 = always revalidate
+    HTTP_CACHE_MAX_AGE: int = 0
 
     @validator("AUTHORIZED_EMAILS", "SUPER_ADMIN_EMAILS", pre=True)
     def parse_lists(cls, v: Union[str, List[str]]) -> List[str]:
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Any, Dict
+from fastapi import Request, Response
+from app.core.config import settings
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag from the parts that determine a response body
+    (e.g. request path + query and the table version).
+    """
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,275 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Latency buckets (seconds) shared by request and outbound histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _ThreadShards:
+    """
+    One value array per writing thread. Each thread only ever adds to its own
+    array, so increments need no lock and cannot be lost; readers sum the
+    arrays at scrape time. The lock is only taken the first time a thread
+    writes.
+    """
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._arrays: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def array(self) -> List[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self._width
+            with self._lock:
+                self._arrays.append(values)
+            self._local.values = values
+            return values
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            arrays = list(self._arrays)
+        return [sum(column) for column in zip(*arrays)] if arrays else [0] * self._width
+
+class CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _ThreadShards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.array()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+class HistogramChild:
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # one slot per bucket, one for +Inf, one for the sum
+        self._shards = _ThreadShards(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.array()
+        values[bisect_left(self._bounds, value)] += 1
+        values[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Tuple[List[float], float]:
+        totals = self._shards.totals()
+        return totals[:-1], totals[-1]
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        The child for these label values (positional, in labelnames order).
+        Hot paths should resolve their child once and keep it.
+        """
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_str(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def collect(self) -> Iterable[str]:
+        raise NotImplementedError
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def collect(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{self._label_str(values)} {_number(child.value)}"
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def collect(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                le_label = f'le="{le}"'
+                yield f"{self.name}_bucket{self._label_str(values, le_label)} {_number(cumulative)}"
+            yield f"{self.name}_sum{self._label_str(values)} {_number(total)}"
+            yield f"{self.name}_count{self._label_str(values)} {_number(cumulative)}"
+
+class CallbackFamily(_Family):
+    """
+    Values read from existing state at scrape time (e.g. pool stats): the
+    callback returns (label values, value) pairs.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], kind: str,
+                 callback: Callable[[], Iterable[Tuple[tuple, float]]]):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def collect(self) -> Iterable[str]:
+        for values, value in self.callback():
+            yield f"{self.name}{self._label_str(values)} {_number(value)}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class Registry:
+    def __init__(self):
+        self._families: List[_Family] = []
+
+    def register(self, family: _Family) -> _Family:
+        self._families.append(family)
+        return family
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            lines.extend(family.collect())
+        return "\n".join(lines) + "\n"
+
+CONTENT_TYPE = "text/plain; version=0.0.4" # Starlette appends the charset
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route, until the response is sent.", ("method", "route"),
+))
+OUTBOUND_REQUESTS = registry.register(Counter(
+    "outbound_requests_total", "Outbound calls to payment/identity providers by outcome (2xx/4xx/5xx/error).",
+    ("service", "outcome"),
+))
+OUTBOUND_REQUEST_DURATION = registry.register(Histogram(
+    "outbound_request_duration_seconds", "Outbound call latency including retries.", ("service",),
+))
+OUTBOUND_RETRIES = registry.register(Counter(
+    "outbound_retries_total", "Outbound attempts retried after a connect error or 5xx.", ("service",),
+))
+DONATION_TRANSITIONS = registry.register(Counter(
+    "donation_transitions_total", "Committed donation status transitions by gateway and new status.",
+    ("gateway", "status"),
+))
+UPLOADS = registry.register(Counter(
+    "uploads_total", "Media uploads by outcome.", ("outcome",),
+))
+UPLOAD_BYTES = registry.register(Counter(
+    "upload_bytes_total", "Bytes received by successful media uploads.",
+))
+IMAGE_RENDERS = registry.register(Counter(
+    "image_renders_total", "Image derivative renders by outcome.", ("outcome",),
+))
+IMAGE_RENDER_DURATION = registry.register(Histogram(
+    "image_render_duration_seconds", "Time to render all derivatives of one image, including pool queueing.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+))
+
+@contextmanager
+def track_outbound(service: str) -> Iterator[None]:
+    """
+    Time a blocking SDK call (e.g. Stripe) as an outbound request: any
+    exception counts as an error.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "2xx"
+    finally:
+        OUTBOUND_REQUEST_DURATION.labels(service).observe(time.perf_counter() - started)
+        OUTBOUND_REQUESTS.labels(service, outcome).inc()
+
+class MetricsMiddleware:
+    """
+    Records http_requests_total / http_request_duration_seconds per matched
+    route template (never the raw path, so label cardinality stays bounded).
+    Metrics are per process: with several workers each exposes its own.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            # FastAPI stores the matched route in the scope during routing
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(elapsed)
+            HTTP_REQUESTS.labels(scope["method"], route, status_code).inc()
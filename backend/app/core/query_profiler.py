@@ -0,0 +1,199 @@
+import contextvars
+import heapq
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("query_profile", default=None)
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+class QueryProfile:
+    """
+    Statements executed inside one `QueryProfiler.profile()` block (one request).
+    """
+
+    def __init__(self, slow_statements: int):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter = Counter()
+        self.slowest: List[Tuple[float, str]] = []
+        self._slow_statements = slow_statements
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.statements[statement] += 1
+            if len(self.slowest) < self._slow_statements:
+                heapq.heappush(self.slowest, (seconds, statement))
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, statement))
+
+    def n_plus_one(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        SELECTs repeated `threshold`+ times with the same SQL (only the bound
+        parameters differ): the usual signature of a lazy load in a loop.
+        """
+        return [
+            (statement, count) for statement, count in self.statements.most_common()
+            if count >= threshold and statement.upper().startswith("SELECT")
+        ]
+
+    def assert_no_n_plus_one(self, threshold: Optional[int] = None) -> None:
+        flagged = self.n_plus_one(threshold or settings.DB_PROFILER_N_PLUS_ONE_THRESHOLD)
+        if flagged:
+            lines = "\n".join(f"  {count}x {statement[:200]}" for statement, count in flagged)
+            raise AssertionError(f"N+1 query pattern detected:\n{lines}")
+
+class QueryProfiler:
+    """
+    Opt-in replacement for `echo=True` (DB_PROFILER_ENABLED). Times every
+    statement through engine events and attributes it to the active profile,
+    i.e. the request being served. Per-endpoint aggregates (query count, DB
+    time, N+1 suspects) and the slowest statements are kept in memory and
+    served by GET /health/queries; each response also carries X-DB-* headers.
+    """
+
+    def __init__(self, enabled: bool, slow_statements: int, n_plus_one_threshold: int):
+        self.enabled = enabled
+        self.slow_statements = slow_statements
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._attached = set()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints: Dict[str, Dict[str, Any]] = {}
+            self.slowest: List[Tuple[float, str, str]] = []
+
+    def attach(self, *engines) -> None:
+        """
+        Register the timing listeners on each (sync) engine. Idempotent.
+        """
+        for engine in engines:
+            if id(engine) in self._attached:
+                continue
+            self._attached.add(id(engine))
+            event.listen(engine, "before_cursor_execute", self._before_execute)
+            event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if _current_profile.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        profile = _current_profile.get()
+        starts = conn.info.get("query_start")
+        if profile is not None and starts:
+            profile.record(_normalize(statement), time.perf_counter() - starts.pop())
+
+    @contextmanager
+    def profile(self) -> Iterator[QueryProfile]:
+        """
+        Collect the statements executed inside the block (also usable from tests/scripts).
+        """
+        profile = QueryProfile(self.slow_statements)
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+
+    def record_request(self, endpoint: str, profile: QueryProfile) -> None:
+        flagged = profile.n_plus_one(self.n_plus_one_threshold)
+        if flagged:
+            logger.warning(f"N+1 suspect in {endpoint}: {flagged[0][1]}x {flagged[0][0][:200]}")
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {
+                "requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0, "n_plus_one": {},
+            })
+            stats["requests"] += 1
+            stats["queries"] += profile.count
+            stats["max_queries"] = max(stats["max_queries"], profile.count)
+            stats["db_time_ms"] += profile.total_seconds * 1000
+            for statement, count in flagged:
+                stats["n_plus_one"][statement] = max(stats["n_plus_one"].get(statement, 0), count)
+            for seconds, statement in profile.slowest:
+                entry = (seconds, endpoint, statement)
+                if len(self.slowest) < self.slow_statements:
+                    heapq.heappush(self.slowest, entry)
+                elif seconds > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "requests": s["requests"],
+                    "avg_queries": round(s["queries"] / s["requests"], 2),
+                    "max_queries": s["max_queries"],
+                    "avg_db_time_ms": round(s["db_time_ms"] / s["requests"], 3),
+                    "total_db_time_ms": round(s["db_time_ms"], 3),
+                    "n_plus_one": [
+                        {"statement": statement[:500], "count": count}
+                        for statement, count in s["n_plus_one"].items()
+                    ],
+                }
+                for endpoint, s in sorted(self.endpoints.items(), key=lambda item: -item[1]["db_time_ms"])
+            }
+            slowest = [
+                {"ms": round(seconds * 1000, 3), "endpoint": endpoint, "statement": statement[:500]}
+                for seconds, endpoint, statement in sorted(self.slowest, reverse=True)
+            ]
+        return {"enabled": self.enabled, "endpoints": endpoints, "slowest": slowest}
+
+class QueryProfilerMiddleware:
+    """
+    Profiles each HTTP request and adds X-DB-Query-Count / X-DB-Time-Ms
+    (and X-DB-N-Plus-One when suspects were seen) to the response.
+    """
+
+    def __init__(self, app, profiler: "QueryProfiler"):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile() as profile:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(profile.count)
+                    headers["X-DB-Time-Ms"] = f"{profile.total_seconds * 1000:.2f}"
+                    flagged = profile.n_plus_one(self.profiler.n_plus_one_threshold)
+                    if flagged:
+                        headers["X-DB-N-Plus-One"] = str(len(flagged))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                # FastAPI stores the matched route in the scope during routing
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "<unmatched>"
+                self.profiler.record_request(f"{scope['method']} {path}", profile)
+
+query_profiler = QueryProfiler(
+    enabled=settings.DB_PROFILER_ENABLED,
+    slow_statements=settings.DB_PROFILER_SLOW_STATEMENTS,
+    n_plus_one_threshold=settings.DB_PROFILER_N_PLUS_ONE_THRESHOLD,
+)
@@ -0,0 +1,215 @@
+"""
+Delivery of the /static tree (uploaded media and its image variants).
+
+Uploads are stored under their content hash (`<sha256><ext>`, variants
+`<sha256>-<width>.<fmt>`), so a URL never changes meaning: those files are
+served with a year-long `immutable` Cache-Control and browsers and CDNs
+never revalidate them. On top of Starlette's StaticFiles this adds single
+byte ranges (video seeking), precompressed `.br`/`.gz` siblings for
+compressible types, and MEDIA_DELIVERY="accel", which answers with an
+X-Accel-Redirect header instead of the bytes so the reverse proxy (Caddy or
+nginx, see the Caddyfile) streams the file and the workers never do.
+"""
+import gzip
+import mimetypes
+import os
+import re
+import stat
+import tempfile
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError: # optional: without it only .gz siblings are written
+    brotli = None
+
+# Media already compressed (images, video, audio, archives) gains nothing
+COMPRESSIBLE_EXTENSIONS = {".svg", ".json", ".txt", ".csv", ".md", ".html", ".css", ".js", ".xml", ".ico", ".bmp"}
+# Preference order; Accept-Encoding names -> sibling suffix
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_HASHED = re.compile(r"^[0-9a-f]{64}(-\d+)?\.[a-z0-9]+$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def is_immutable(path: str) -> bool:
+    return bool(_HASHED.match(os.path.basename(path)))
+
+def cache_control(path: str) -> str:
+    if is_immutable(path):
+        return f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+    return "public, max-age=0, must-revalidate"
+
+def _write_sibling(path: str, suffix: str, data: bytes) -> None:
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".precompress-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(temp_path, path + suffix)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def precompress(path: str) -> List[str]:
+    """
+    Write `<path>.br` (when brotli is installed) and `<path>.gz` next to a
+    compressible file, keeping only those at least 10% smaller. Returns the
+    suffixes written. Blocking: run in the threadpool.
+    """
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    if os.path.getsize(path) < settings.MEDIA_PRECOMPRESS_MIN_BYTES:
+        return []
+    with open(path, "rb") as source:
+        data = source.read()
+    compressors = {".gz": lambda d: gzip.compress(d, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors[".br"] = lambda d: brotli.compress(d, quality=11)
+    written = []
+    for suffix, compress in compressors.items():
+        compressed = compress(data)
+        if len(compressed) <= len(data) * 0.9:
+            _write_sibling(path, suffix, compressed)
+            written.append(suffix)
+    return written
+
+def _accepted(header: str) -> set:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte positions of a single `bytes=` range, or None when the
+    header is not one (multiple ranges are answered with the whole file).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first: # suffix: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+class FileRangeResponse(FileResponse):
+    """
+    206 Partial Content for bytes first..last (inclusive) of a file.
+    """
+
+    def __init__(self, path: str, first: int, last: int, stat_result: os.stat_result, **kwargs):
+        super().__init__(path, status_code=206, stat_result=stat_result, **kwargs)
+        self.first, self.last = first, last
+        self.headers["content-length"] = str(last - first + 1)
+        self.headers["content-range"] = f"bytes {first}-{last}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.first)
+            remaining = self.last - self.first + 1
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk: # truncated under us; the client sees a short body
+                    remaining = 0
+                else:
+                    remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": bool(remaining)})
+
+class MediaFiles(StaticFiles):
+    """
+    StaticFiles with immutable caching for content-addressed names, single
+    byte ranges, precompressed siblings and the X-Accel-Redirect handoff
+    (`delivery` is MEDIA_DELIVERY: "app" or "accel").
+    """
+
+    def __init__(self, *args, delivery: str = settings.MEDIA_DELIVERY, accel_prefix: str = settings.MEDIA_ACCEL_PREFIX, **kwargs):
+        super().__init__(*args, **kwargs)
+        if delivery not in ("app", "accel"):
+            raise ValueError(f"MEDIA_DELIVERY must be 'app' or 'accel', not {delivery!r}")
+        self.delivery = delivery
+        self.accel_prefix = accel_prefix.rstrip("/")
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        headers = {"Cache-Control": cache_control(relative), "Accept-Ranges": "bytes"}
+        compressible = os.path.splitext(full_path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+        if compressible:
+            headers["Vary"] = "Accept-Encoding"
+
+        if self.delivery == "accel":
+            # The proxy serves the file (ranges, conditionals, precompressed siblings); no body here
+            headers["X-Accel-Redirect"] = f"{self.accel_prefix}/{quote(relative)}"
+            return Response(status_code=status_code, headers=headers, media_type=mimetypes.guess_type(full_path)[0])
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200 and scope["method"] == "GET":
+            response = FileResponse(full_path, stat_result=stat_result, headers=headers)
+            if_range = request_headers.get("if-range")
+            if not if_range or if_range in (response.headers["etag"], response.headers["last-modified"]):
+                try:
+                    byte_range = parse_range(range_header, stat_result.st_size)
+                except ValueError:
+                    return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{stat_result.st_size}"})
+                if byte_range is not None:
+                    return FileRangeResponse(full_path, *byte_range, stat_result=stat_result, headers=headers)
+        elif compressible and status_code == 200:
+            accepted = _accepted(request_headers.get("accept-encoding", ""))
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    sibling = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                if stat.S_ISREG(sibling.st_mode) and sibling.st_mtime >= stat_result.st_mtime:
+                    response = FileResponse(
+                        full_path + suffix, stat_result=sibling, headers={**headers, "Content-Encoding": encoding},
+                        media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+                    )
+                    break
+            else:
+                response = FileResponse(full_path, stat_result=stat_result, headers=headers)
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
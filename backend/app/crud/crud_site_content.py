@@ -1,15 +1,26 @@
 from app.models.site_content import SiteContent
 from app.schemas.site_content import SiteContentCreate, SiteContentUpdate
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List, Optional, Any
+from app.core.cache import invalidate_on_commit
+from app.services import version_service
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
 class CRUDSiteContent:
+    BULK_UPDATABLE_FIELDS = ("content", "content_type", "label")
+
     def get(self, db: Session, id: Any) -> Optional[SiteContent]:
         return db.query(SiteContent).filter(SiteContent.id == id).first()
 
     def get_by_key(self, db: Session, key: str) -> Optional[SiteContent]:
         return db.query(SiteContent).filter(SiteContent.key == key).first()
 
+    def get_by_keys(self, db: Session, keys: Iterable[str]) -> Dict[str, SiteContent]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {obj.key: obj for obj in db.query(SiteContent).filter(SiteContent.key.in_(keys)).all()}
+
     def get_by_section(self, db: Session, section: str) -> List[SiteContent]:
         return db.query(SiteContent).filter(SiteContent.section == section).all()
 
@@ -25,6 +36,8 @@ class CRUDSiteContent:
             label=obj_in.label
         )
         db.add(db_obj)
+        version_service.bump(db, version_service.SITE_CONTENT)
+        invalidate_on_commit(db, "site_content", f"site_content:{db_obj.section}")
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -40,10 +53,66 @@ class CRUDSiteContent:
                 setattr(db_obj, field, update_data[field])
                 
         db.add(db_obj)
+        version_service.bump(db, version_service.SITE_CONTENT)
+        invalidate_on_commit(db, "site_content", f"site_content:{db_obj.section}")
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-site_content = CRUDSiteContent()
+    def bulk_create(self, db: Session, *, objs_in: List[SiteContentCreate]) -> List[SiteContent]:
+        """
+        Insert many rows in one transaction.
+        """
+        db_objs = [
+            SiteContent(
+                section=obj_in.section,
+                key=obj_in.key,
+                content=obj_in.content,
+                content_type=obj_in.content_type,
+                label=obj_in.label
+            )
+            for obj_in in objs_in
+        ]
+        if not db_objs:
+            return []
+        db.add_all(db_objs)
+        version_service.bump(db, version_service.SITE_CONTENT)
+        invalidate_on_commit(db, "site_content", *{f"site_content:{obj.section}" for obj in db_objs})
+        db.commit()
+        return list(self.get_by_keys(db, [obj.key for obj in db_objs]).values())
+
+    def bulk_update(
+        self, db: Session, *, updates: Dict[str, str | dict]
+    ) -> Tuple[List[SiteContent], List[str]]:
+        """
+        Apply {key: content} (or {key: {field: value}}) changes in one transaction:
+        one IN query to load the rows, one executemany UPDATE for the rows
+        that actually change, one commit. Returns (items, missing_keys).
+        """
+        existing = self.get_by_keys(db, updates.keys())
+        missing = [key for key in updates if key not in existing]
 
-from typing import Any
+        rows = []
+        sections = set()
+        for key, obj in existing.items():
+            values = updates[key]
+            update_data = {"content": values} if isinstance(values, str) else dict(values)
+            changed = {
+                field: value for field, value in update_data.items()
+                if field in self.BULK_UPDATABLE_FIELDS and getattr(obj, field) != value
+            }
+            if changed:
+                rows.append({"id": obj.id, **changed})
+                sections.add(obj.section)
+
+        if rows:
+            # ORM bulk UPDATE by primary key -> a single executemany per column set
+            db.execute(update(SiteContent), rows)
+            version_service.bump(db, version_service.SITE_CONTENT)
+            invalidate_on_commit(db, "site_content", *(f"site_content:{section}" for section in sections))
+            db.commit()
+            existing = self.get_by_keys(db, existing.keys())
+
+        return [existing[key] for key in updates if key in existing], missing
+
+site_content = CRUDSiteContent()
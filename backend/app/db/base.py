@@ -7,3 +7,8 @@ from app.models.donation import Donation  # noqa
 from app.models.media import Media  # noqa
 from app.models.site_content import SiteContent  # noqa
 from app.models.contact import ContactMessage  # noqa
+from app.models.dashboard_stats import DashboardStats  # noqa
+from app.models.table_version import TableVersion  # noqa
+from app.models.webhook_event import WebhookEvent  # noqa
+from app.models.resumable_upload import ResumableUpload  # noqa
+from app.models.donation_rollup import DonationRollup  # noqa
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+SAMPLE_WINDOW = 2000
+
+class PoolStats:
+    """
+    Checkout wait and hold times for one connection pool, over the last
+    SAMPLE_WINDOW checkouts. "Wait" is the time spent getting a connection
+    (queueing for a free one, or opening an overflow connection); "hold" is
+    checkout -> checkin, i.e. how long a session kept it.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self._waits: deque = deque(maxlen=SAMPLE_WINDOW)
+        self._holds: deque = deque(maxlen=SAMPLE_WINDOW)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._waits.append(seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        with self._lock:
+            self._holds.append(seconds)
+
+    @staticmethod
+    def _summary(samples: list) -> Dict[str, float]:
+        if not samples:
+            return {}
+        samples = sorted(samples)
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+        return {
+            "p50_ms": round(pick(0.50) * 1000, 2),
+            "p99_ms": round(pick(0.99) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits, holds = list(self._waits), list(self._holds)
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait": self._summary(waits),
+            "hold": self._summary(holds),
+        }
+
+# pool logging name -> stats; survives pool.recreate() on engine.dispose()
+POOL_STATS: Dict[str, PoolStats] = {}
+
+class _InstrumentedPoolMixin:
+    @property
+    def stats(self) -> PoolStats:
+        return POOL_STATS.setdefault(self._orig_logging_name or "default", PoolStats())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        record.info["checked_out_at"] = time.perf_counter()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.stats.record_hold(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            **self.stats.snapshot(),
+        }
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+# Text search configuration for every search_vector column and query (app.services.search_service)
+SEARCH_CONFIG = "english"
+
+def search_vector_expression(primary: str, secondary: str) -> str:
+    """
+    SQL for a weighted tsvector: `primary` (titles) ranks as A, `secondary` (bodies) as B.
+    """
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in ((primary, "A"), (secondary, "B"))
+    )
+
+def search_vector_column(primary: str, secondary: str):
+    """
+    Stored generated tsvector column, so Postgres keeps it in step with every
+    write (ORM, bulk SQL, scripts). Deferred: plain loads never fetch it.
+    Pair it with a GIN index in the model's __table_args__.
+    """
+    return deferred(Column(TSVECTOR, Computed(search_vector_expression(primary, secondary), persisted=True)))
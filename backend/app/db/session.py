@@ -1,19 +1,92 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.config import settings
+from app.core import metrics
+from app.core.query_profiler import query_profiler
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    echo=settings.DB_ECHO,
+)
+
+def _statement_timeout_args(uri: str, asyncpg: bool = False) -> dict:
+    if not settings.DB_STATEMENT_TIMEOUT_MS or not uri.startswith("postgres"):
+        return {}
+    timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if asyncpg:
+        return {"server_settings": {"statement_timeout": timeout}}
+    return {"options": f"-c statement_timeout={timeout}"}
 
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=True # Set to False in production
+    poolclass=InstrumentedQueuePool,
+    pool_logging_name="sync",
+    connect_args=_statement_timeout_args(settings.SQLALCHEMY_DATABASE_URI),
+    **POOL_OPTIONS,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dependency for FastAPI Routes
+# Async engine (asyncpg) for routes that await outbound I/O.
+# expire_on_commit=False: attribute access after commit must not trigger implicit IO.
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_logging_name="async",
+    connect_args=_statement_timeout_args(settings.SQLALCHEMY_ASYNC_DATABASE_URI, asyncpg=True),
+    **POOL_OPTIONS,
+)
+
+if query_profiler.enabled:
+    query_profiler.attach(engine, async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Dependency for FastAPI Routes.
+# Sessions are lazy: a connection is checked out on the first statement and
+# returned to the pool when the transaction commits / rolls back, not at the
+# end of the request. A request that never queries (cache hit, 304,
+# validation error) never touches the pool; commit before slow outbound calls
+# so the connection is not pinned while waiting on them.
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_status() -> dict:
+    """
+    Checked-out / overflow counts and checkout wait / hold times for both pools.
+    """
+    return {"sync": engine.pool.report(), "async": async_engine.sync_engine.pool.report()}
+
+def _pool_metric(field: str, scale: float = 1.0, quantile: str = ""):
+    def samples():
+        for name, report in pool_status().items():
+            value = report[field].get(quantile, 0) if quantile else report[field]
+            yield (name,), value * scale
+    return samples
+
+for _name, _kind, _doc, _field, _scale, _quantile in (
+    ("db_pool_checked_out", "gauge", "Connections currently checked out.", "checked_out", 1, ""),
+    ("db_pool_idle", "gauge", "Idle connections in the pool.", "idle", 1, ""),
+    ("db_pool_overflow", "gauge", "Overflow connections open beyond pool_size.", "overflow", 1, ""),
+    ("db_pool_checkouts_total", "counter", "Connection checkouts.", "checkouts", 1, ""),
+    ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", "timeouts", 1, ""),
+    ("db_pool_wait_p99_seconds", "gauge", "p99 checkout wait over the recent sample window.", "wait", 0.001, "p99_ms"),
+    ("db_pool_hold_p99_seconds", "gauge", "p99 checkout hold time over the recent sample window.", "hold", 0.001, "p99_ms"),
+):
+    metrics.registry.register(metrics.CallbackFamily(_name, _doc, ("pool",), _kind, _pool_metric(_field, _scale, _quantile)))
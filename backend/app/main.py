@@ -1,7 +1,44 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services.http_client import http_client
+from app.core import metrics
+from app.core.cache import response_cache
+from app.core.metrics import MetricsMiddleware
+from app.core.static_media import MediaFiles
+from app.core.query_profiler import QueryProfilerMiddleware, query_profiler
+from app.db.session import AsyncSessionLocal, pool_status
+from app.services.campaign_registry import campaign_registry
+from app.services.image_service import image_pipeline
+from app.services.reconciler import payment_reconciler
+from app.services.resumable_upload_service import upload_gc
+from app.services.webhook_inbox import webhook_inbox
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled outbound HTTP client for the whole process (Chapa, Stripe, Google OAuth)
+    await http_client.start()
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(campaign_registry.load)
+    except Exception as e:
+        # Not fatal: the registry loads on first use instead
+        logger.warning(f"Campaign registry preload failed: {e}")
+    if settings.RECONCILER_ENABLED:
+        payment_reconciler.start()
+    if settings.WEBHOOK_INBOX_WORKERS:
+        webhook_inbox.start()
+    upload_gc.start()
+    yield
+    await upload_gc.stop()
+    await webhook_inbox.stop()
+    await payment_reconciler.stop()
+    image_pipeline.shutdown()
+    await http_client.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -9,6 +46,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -19,12 +57,25 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Resumable (tus) upload clients read these
+        expose_headers=[
+            "Location", "Upload-Offset", "Upload-Length", "Upload-Expires", "Tus-Resumable", "Tus-Version",
+            "Tus-Extension", "Tus-Max-Size", "X-Media-Id", "X-Media-Url",
+        ],
     )
 
-# Mount static files
+# Request latency/count metrics, scraped from GET /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in per-request query profiling (DB_PROFILER_ENABLED)
+if query_profiler.enabled:
+    app.add_middleware(QueryProfilerMiddleware, profiler=query_profiler)
+
+# Mount static files (immutable caching, byte ranges, precompressed siblings; MEDIA_DELIVERY=accel hands off to the proxy)
 import os
-os.makedirs("static/uploads", exist_ok=True)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+app.mount("/static", MediaFiles(directory="static"), name="static")
 
 from app.api.v1.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -36,6 +87,51 @@ def health_check():
     """
     return {"status": "ok", "project": settings.PROJECT_NAME, "version": settings.PROJECT_VERSION}
 
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    """
+    Response cache hit/miss counters.
+    """
+    return response_cache.stats()
+
+@app.get("/health/db", tags=["Health"])
+def db_pool_stats():
+    """
+    Connection pool usage: checked-out and overflow connections, checkout wait and hold times.
+    """
+    return pool_status()
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus text format: request latency per route, DB pools, outbound calls,
+    donation transitions and uploads (see app.core.metrics).
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/health/queries", tags=["Health"])
+def query_profile_stats():
+    """
+    Query profiler aggregates per endpoint (query count, DB time, N+1 suspects) and the slowest statements.
+    """
+    return query_profiler.stats()
+
+@app.get("/health/reconciler", tags=["Health"])
+def reconciler_stats():
+    """
+    Pending-payment reconciler metrics: backlog size, outcomes and Chapa verify latency.
+    """
+    return payment_reconciler.metrics()
+
+@app.get("/health/webhooks", tags=["Health"])
+async def webhook_inbox_stats():
+    """
+    Webhook inbox backlog (open events by status) and worker counters.
+    """
+    return await webhook_inbox.metrics()
+
 @app.get("/", tags=["Root"])
 def root():
     return {"message": "Welcome to the Rural School Portfolio API"}
@@ -1,13 +1,21 @@
-from sqlalchemy import Boolean, Column, String, Float, Text, DateTime
+from sqlalchemy import Boolean, Column, String, Float, Text, DateTime, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship # prepared for future relations
 import uuid
 from app.db.base_class import Base
+from app.db.search import search_vector_column
 
 class Campaign(Base):
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_campaign_created_at_id", "created_at", "id"),
+        Index("ix_campaign_active_created_at_id", "created_at", "id", postgresql_where=text("is_active")),
+        Index("ix_campaign_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
-    title = Column(String, nullable=False)
+    title = Column(String, index=True, nullable=False)
     slug = Column(String, unique=True, index=True, nullable=False) # e.g. "new-library"
     description = Column(Text, nullable=True) # Markdown/HTML content
     cover_image_url = Column(String, nullable=True)
@@ -24,4 +32,7 @@ class Campaign(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Full-text search (app.services.search_service), generated from title and description
+    search_vector = search_vector_column("title", "description")
+
     donations = relationship("Donation", back_populates="campaign")
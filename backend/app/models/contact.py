@@ -1,9 +1,16 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 import uuid
 from app.db.base_class import Base
+from app.db.search import search_vector_column
 
 class ContactMessage(Base):
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_contactmessage_created_at_id", "created_at", "id"),
+        Index("ix_contactmessage_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
     email = Column(String, nullable=False)
@@ -11,3 +18,6 @@ class ContactMessage(Base):
     message = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Full-text search (app.services.search_service), generated from subject and message
+    search_vector = search_vector_column("subject", "message")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Float, Integer, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class DashboardStats(Base):
+    """
+    Incrementally maintained aggregates for the admin dashboard.
+    A single row (id="global") is updated in the same transaction as every
+    donation SUCCESS transition, so reading the dashboard is one primary-key lookup.
+    """
+    id = Column(String, primary_key=True, default="global")
+
+    total_raised_usd = Column(Float, nullable=False, default=0.0)
+    total_raised_etb = Column(Float, nullable=False, default=0.0)
+    total_donations_count = Column(Integer, nullable=False, default=0)
+    active_campaigns = Column(Integer, nullable=False, default=0)
+
+    # Serialized `schemas.donation.Donation` payloads, newest first
+    recent_donations = Column(JSON, nullable=False, default=list)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
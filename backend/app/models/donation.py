@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -13,8 +13,22 @@ class DonationStatus(str, enum.Enum):
     PENDING = "PENDING"
     SUCCESS = "SUCCESS"
     FAILED = "FAILED"
+    EXPIRED = "EXPIRED" # Abandoned checkout, closed by the payment reconciler
 
 class Donation(Base):
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_donation_created_at_id", "created_at", "id"),
+        # Hot filters (see alembic 0003): campaign/dashboard totals over SUCCESS rows
+        Index("ix_donation_success_campaign_currency", "campaign_id", "currency",
+              postgresql_where=text("status = 'SUCCESS'"), postgresql_include=["amount"]),
+        Index("ix_donation_success_currency", "currency",
+              postgresql_where=text("status = 'SUCCESS'"), postgresql_include=["amount"]),
+        Index("ix_donation_success_created_at", "created_at", postgresql_where=text("status = 'SUCCESS'")),
+        Index("ix_donation_campaign_created_at_id", "campaign_id", "created_at", "id"),
+        Index("ix_donation_status_created_at", "status", "created_at"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Link to Campaign
@@ -0,0 +1,34 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, Identity, Integer, String, UniqueConstraint
+import enum
+from app.db.base_class import Base
+
+class RollupGranularity(str, enum.Enum):
+    HOUR = "HOUR"
+    DAY = "DAY"
+
+class DonationRollup(Base):
+    """
+    SUCCESS donations summed per UTC hour and day, campaign, currency and
+    gateway (bucketed by the donation's created_at). Upserted in the same
+    transaction as every SUCCESS transition and rebuildable from the donation
+    table (app.services.rollup_service), so trend charts read a few rows per
+    bucket instead of scanning the ledger.
+    """
+    __table_args__ = (
+        # The upsert target; also serves the (granularity, bucket range) reads.
+        # NULL campaign_id (general donations) is one bucket, not many.
+        UniqueConstraint(
+            "granularity", "bucket_start", "campaign_id", "currency", "payment_gateway",
+            name="uq_donationrollup_bucket", postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    granularity = Column(String, nullable=False) # RollupGranularity
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    campaign_id = Column(String, nullable=True) # No FK: rollups outlive deleted campaigns
+    currency = Column(String, nullable=False)
+    payment_gateway = Column(String, nullable=False)
+
+    amount = Column(Float, nullable=False, default=0.0)
+    donations_count = Column(Integer, nullable=False, default=0)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index, Integer, JSON, Text
 from sqlalchemy.sql import func
 import uuid
 import enum
 from app.db.base_class import Base
+from app.db.search import search_vector_column
 
 class MediaType(str, enum.Enum):
     IMAGE = "IMAGE"
@@ -15,6 +16,13 @@ class MediaCategory(str, enum.Enum):
     EVENT = "EVENT"
 
 class Media(Base):
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_media_created_at_id", "created_at", "id"),
+        Index("ix_media_type_created_at_id", "media_type", "created_at", "id"),
+        Index("ix_media_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     url = Column(String, nullable=False) # S3 Link or YouTube URL
@@ -23,7 +31,18 @@ class Media(Base):
     title = Column(String, nullable=True) # Caption
     description = Column(String, nullable=True) # Alt text / longer desc
     
+    # Image derivatives (app.services.image_service); NULL until processed
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True) # LQIP data URI
+    variants = Column(JSON, nullable=True) # [{"url", "width", "height", "format"}]
+    variants_processed_at = Column(DateTime(timezone=True), nullable=True)
+
     category = Column(String, default=MediaCategory.GALLERY)
     is_featured = Column(Boolean, default=False) # For Homepage Slider
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Full-text search (app.services.search_service), generated from title and description
+    search_vector = search_vector_column("title", "description")
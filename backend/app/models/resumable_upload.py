@@ -0,0 +1,35 @@
+from sqlalchemy import Boolean, Column, String, BigInteger, DateTime, JSON, Index
+from sqlalchemy.sql import func
+import uuid
+import enum
+from app.db.base_class import Base
+
+class ResumableUploadStatus(str, enum.Enum):
+    UPLOADING = "UPLOADING"
+    COMPLETE = "COMPLETE" # All bytes received (partials wait here for their final upload)
+    STORED = "STORED" # Moved into UPLOAD_DIR and turned into a Media row (partials: taken by their final)
+
+class ResumableUpload(Base):
+    """
+    State of a tus-style resumable upload (app.services.resumable_upload_service).
+    The bytes live in RESUMABLE_UPLOAD_DIR/<id> until the upload completes;
+    `offset` is how many of them are durably written.
+    """
+    __table_args__ = (
+        # Garbage collection of stale uploads
+        Index("ix_resumableupload_status_updated_at", "status", "updated_at"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    length = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)
+    upload_metadata = Column(JSON, nullable=False, default=dict) # filename, content_type, title, ...
+    is_partial = Column(Boolean, nullable=False, default=False) # tus concatenation: a chunk of a final upload
+    status = Column(String, nullable=False, default=ResumableUploadStatus.UPLOADING)
+    locked_until = Column(DateTime(timezone=True), nullable=True) # Lease of the PATCH writing to it
+    media_id = Column(String, nullable=True)
+    created_by = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
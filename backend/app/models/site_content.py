@@ -1,7 +1,9 @@
-from sqlalchemy import Column, String, Text, Enum
+from sqlalchemy import Column, String, Text, Enum, DateTime, Index
+from sqlalchemy.sql import func
 import uuid
 import enum
 from app.db.base_class import Base
+from app.db.search import search_vector_column
 
 class ContentType(str, enum.Enum):
     TEXT = "TEXT"
@@ -9,6 +11,10 @@ class ContentType(str, enum.Enum):
     VIDEO = "VIDEO"
 
 class SiteContent(Base):
+    __table_args__ = (
+        Index("ix_sitecontent_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     section = Column(String, index=True, nullable=False) # e.g. "HERO", "ABOUT", "IMPACT"
@@ -18,3 +24,8 @@ class SiteContent(Base):
     
     # Description for the admin to know what this field is for
     label = Column(String, nullable=True) 
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Full-text search (app.services.search_service), generated from label and content
+    search_vector = search_vector_column("label", "content")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class TableVersion(Base):
+    """
+    Monotonic change counter per content table ("campaign", "media", "sitecontent",
+    "dashboard" for the stats row and donation rollups).
+    Bumped in the same transaction as every write; used to derive strong ETags.
+    """
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, String, BigInteger, Integer, Text, DateTime, JSON, Index, UniqueConstraint, text
+from sqlalchemy.sql import func
+import enum
+from app.db.base_class import Base
+
+class WebhookEventStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    DEAD = "DEAD" # Gave up after WEBHOOK_INBOX_MAX_ATTEMPTS; replay by resetting to PENDING
+
+class WebhookEvent(Base):
+    """
+    Inbox of received payment gateway webhooks. The webhook endpoint only
+    stores the event and acknowledges; app.services.webhook_inbox drains it.
+    Receiving the same delivery twice (same tx_ref and body) is a no-op.
+    """
+    __table_args__ = (
+        UniqueConstraint("provider", "tx_ref", "event_hash", name="uq_webhookevent_provider_tx_ref_hash"),
+        # Claim / lease recovery / backlog queries only ever look at open events
+        Index("ix_webhookevent_open", "status", "next_attempt_at", "id", postgresql_where=text("status <> 'DONE'")),
+        # Per-transaction ordering check
+        Index("ix_webhookevent_tx_ref_id", "tx_ref", "id"),
+    )
+
+    # Sequential id: events of one transaction are processed in id order
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    provider = Column(String, nullable=False) # "CHAPA", "STRIPE"
+    tx_ref = Column(String, nullable=False)
+    event_hash = Column(String, nullable=False) # sha256 of the raw body
+    payload = Column(JSON, nullable=False)
+
+    status = Column(String, nullable=False, default=WebhookEventStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True) # Lease of the worker processing it
+    last_error = Column(Text, nullable=True)
+
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
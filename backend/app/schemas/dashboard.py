@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+class TimeseriesPoint(BaseModel):
+    bucket_start: datetime
+    raised_usd: float
+    raised_etb: float
+    donations_count: int
+
+class DonationTimeseries(BaseModel):
+    bucket: str
+    start: datetime # Widened to whole buckets (UTC)
+    end: datetime
+    points: List[TimeseriesPoint]
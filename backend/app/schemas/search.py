@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    type: str # "campaign", "media", "site_content" or "contact"
+    id: str
+    slug: Optional[str] = None # Campaigns: the detail page is /campaigns/{slug}
+    rank: float
+    # HTML-escaped, with <mark> around the matched words
+    title: Optional[str] = None
+    highlight: Optional[str] = None
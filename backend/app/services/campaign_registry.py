@@ -0,0 +1,158 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, NamedTuple, Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.campaign import Campaign
+from app.services import version_service
+
+@dataclass(frozen=True, slots=True)
+class CampaignRef:
+    id: str
+    slug: str
+    title: str
+    is_active: bool
+
+class _Index(NamedTuple):
+    version: int
+    by_id: Dict[str, CampaignRef]
+    by_slug: Dict[str, CampaignRef]
+    by_title: Dict[str, CampaignRef]
+    misses: Dict[Tuple[str, str], float] # (mapping, key) -> monotonic time the miss expires
+
+class CampaignRegistry:
+    """
+    Process-local map of campaign id, slug and title to a CampaignRef, so
+    the payment and detail paths resolve campaigns without a query.
+
+    Loaded whole (at startup or on first use) and swapped in atomically;
+    lookups read it without locking. Writes through campaign_service bump
+    the CAMPAIGN_INDEX version: this process reloads right after the commit,
+    other workers when their next version check (at most every
+    CAMPAIGN_REGISTRY_CHECK_SECONDS) sees the new number. A key that is not
+    in the map is looked up in the database, so rows written behind the
+    service's back are still found; a key the database does not have either
+    is remembered as missing for CAMPAIGN_REGISTRY_MISS_SECONDS (or until
+    the next reload), so repeated unknown slugs cost one query, not one each.
+    Lookup results are only written into the map that was current when the
+    query started, under the lock.
+    """
+
+    def __init__(
+        self,
+        check_interval: float = settings.CAMPAIGN_REGISTRY_CHECK_SECONDS,
+        miss_ttl: float = settings.CAMPAIGN_REGISTRY_MISS_SECONDS,
+    ):
+        self.check_interval = check_interval
+        self.miss_ttl = miss_ttl
+        self._index = _Index(-1, {}, {}, {}, {})
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        version = version_service.get(db, version_service.CAMPAIGN_INDEX)
+        rows = db.execute(
+            select(Campaign.id, Campaign.slug, Campaign.title, Campaign.is_active)
+            .order_by(Campaign.created_at.desc(), Campaign.id.desc())
+        ).all()
+        by_id, by_slug, by_title = {}, {}, {}
+        for row in rows:
+            ref = CampaignRef(row.id, row.slug, row.title, bool(row.is_active))
+            by_id[ref.id] = by_slug[ref.slug] = ref
+            by_title.setdefault(ref.title, ref) # Titles are not unique: the newest campaign wins
+        self._index = _Index(version, by_id, by_slug, by_title, {})
+        self._checked_at = time.monotonic()
+
+    def refresh(self, db: Session) -> None:
+        """
+        Reload if another worker (or this one) changed the campaigns since the last load.
+        """
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        # Never wait for the lock: under AsyncSession.run_sync the holder may be a greenlet
+        # on this very thread, parked on its query. Whoever loses serves the current map.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if version_service.get(db, version_service.CAMPAIGN_INDEX) != self._index.version:
+                self.load(db)
+            else:
+                self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def invalidate(self) -> None:
+        self._checked_at = float("-inf")
+
+    def _remember(self, index: _Index, mapping: str, key: str, ref: Optional[CampaignRef]) -> None:
+        # Same rule as refresh(): never wait. Skip it if a reload is running or already
+        # swapped the map (the result may predate it), and the next miss queries again.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._index is not index:
+                return
+            if ref is None:
+                if len(index.misses) >= settings.CAMPAIGN_REGISTRY_MAX_MISSES:
+                    index.misses.clear()
+                index.misses[(mapping, key)] = time.monotonic() + self.miss_ttl
+                return
+            # Written without a version bump (scripts, SQL): remember it until the next reload
+            index.by_id[ref.id] = index.by_slug[ref.slug] = ref
+            index.by_title.setdefault(ref.title, ref)
+        finally:
+            self._lock.release()
+
+    def _lookup(self, db: Session, mapping: str, column, key: Optional[str]) -> Optional[CampaignRef]:
+        if not key:
+            return None
+        self.refresh(db)
+        index = self._index
+        ref = getattr(index, mapping).get(key)
+        if ref is not None:
+            return ref
+        if index.misses.get((mapping, key), float("-inf")) > time.monotonic():
+            return None
+        row = db.execute(
+            select(Campaign.id, Campaign.slug, Campaign.title, Campaign.is_active)
+            .where(column == key)
+            .order_by(Campaign.created_at.desc())
+            .limit(1)
+        ).first()
+        ref = CampaignRef(row.id, row.slug, row.title, bool(row.is_active)) if row else None
+        self._remember(index, mapping, key, ref)
+        return ref
+
+    def get(self, db: Session, id: Optional[str]) -> Optional[CampaignRef]:
+        return self._lookup(db, "by_id", Campaign.id, id)
+
+    def by_slug(self, db: Session, slug: Optional[str]) -> Optional[CampaignRef]:
+        return self._lookup(db, "by_slug", Campaign.slug, slug)
+
+    def by_title(self, db: Session, title: Optional[str]) -> Optional[CampaignRef]:
+        return self._lookup(db, "by_title", Campaign.title, title)
+
+    def stats(self) -> Dict[str, int]:
+        return {"version": self._index.version, "campaigns": len(self._index.by_id), "misses": len(self._index.misses)}
+
+campaign_registry = CampaignRegistry()
+
+def reload_on_commit(db: Session) -> None:
+    """
+    Bump CAMPAIGN_INDEX (other workers reload) and reload this process's
+    registry once the transaction commits. Call from every write that adds
+    or removes a campaign or changes its slug, title or is_active.
+    """
+    version_service.bump(db, version_service.CAMPAIGN_INDEX)
+    db.info["campaign_registry_stale"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    if session.info.pop("campaign_registry_stale", False):
+        campaign_registry.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("campaign_registry_stale", None)
@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.campaign import Campaign
 from app.schemas.campaign import CampaignCreate, CampaignUpdate
+from app.services import stats_service, version_service
+from app.services.campaign_registry import campaign_registry, reload_on_commit
+from app.core.cache import invalidate_on_commit
+from app.core.pagination import keyset, split_page
 import re
 
 import uuid
@@ -14,7 +18,13 @@ def create_slug(title: str) -> str:
     return s
 
 def get_multi(db: Session, skip: int = 0, limit: int = 100) -> List[Campaign]:
-    return db.query(Campaign).filter(Campaign.is_active == True).offset(skip).limit(limit).all()
+    return db.query(Campaign).filter(Campaign.is_active == True).order_by(
+        Campaign.created_at.desc(), Campaign.id.desc()
+    ).offset(skip).limit(limit).all()
+
+def get_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Campaign], Optional[str]]:
+    query = db.query(Campaign).filter(Campaign.is_active == True)
+    return split_page(keyset(query, Campaign, cursor, limit).all(), limit)
 
 def create(db: Session, obj_in: CampaignCreate) -> Campaign:
     base_slug = create_slug(obj_in.title)
@@ -36,9 +46,16 @@ def create(db: Session, obj_in: CampaignCreate) -> Campaign:
         cover_image_url=obj_in.cover_image_url
     )
     db.add(db_obj)
+    stats_service.record_campaign_created(db)
+    version_service.bump(db, version_service.CAMPAIGN, version_service.DASHBOARD)
+    reload_on_commit(db)
+    invalidate_on_commit(db, "campaign:*", "dashboard")
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def get_by_slug(db: Session, slug: str) -> Optional[Campaign]:
-    return db.query(Campaign).filter(Campaign.slug == slug).first()
+    # Known slugs load by primary key; an unknown slug costs one query, then is
+    # answered from the registry's miss cache for CAMPAIGN_REGISTRY_MISS_SECONDS
+    ref = campaign_registry.by_slug(db, slug)
+    return db.get(Campaign, ref.id) if ref else None
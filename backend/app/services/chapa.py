@@ -1,14 +1,18 @@
 
 import httpx
+import logging
 from typing import Optional, Dict, Any
 from app.core.config import settings
+from app.services.http_client import HTTPClient, http_client
 
-class ChapaService:
-    BASE_URL = "https://api.chapa.co/v1"
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
+class ChapaService:
+    def __init__(self, http: HTTPClient, base_url: str = settings.CHAPA_BASE_URL):
         # Ensure your env vars are loaded. 
         # If settings.CHAPA_SECRET_KEY is empty, this might fail or cause auth errors.
+        self.http = http
+        self.base_url = base_url.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {settings.CHAPA_SECRET_KEY}",
             "Content-Type": "application/json"
@@ -25,7 +29,7 @@ class ChapaService:
         return_url: Optional[str] = None,
         customization: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}/transaction/initialize"
+        url = f"{self.base_url}/transaction/initialize"
         payload = {
             "amount": str(amount),
             "currency": "ETB",
@@ -41,20 +45,19 @@ class ChapaService:
         # Remove None values
         payload = {k: v for k, v in payload.items() if v is not None}
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print(f"Chapa API Error: {e.response.text}")
-                raise e
+        # Retrying is safe: Chapa rejects a second initialize for the same tx_ref.
+        response = await self.http.post(url, json=payload, headers=self.headers, service="chapa")
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Chapa API Error: {e.response.text}")
+            raise e
+        return response.json()
 
     async def verify_transaction(self, tx_ref: str) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}/transaction/verify/{tx_ref}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+        url = f"{self.base_url}/transaction/verify/{tx_ref}"
+        response = await self.http.get(url, headers=self.headers, service="chapa")
+        response.raise_for_status()
+        return response.json()
 
-chapa_service = ChapaService()
+chapa_service = ChapaService(http_client)
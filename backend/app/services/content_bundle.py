@@ -0,0 +1,40 @@
+import threading
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from app.models.site_content import SiteContent
+from app.services import version_service
+
+Document = Dict[str, Dict[str, Optional[str]]]
+
+class ContentBundle:
+    """
+    Process-local snapshot of all site content as {section: {key: content}}.
+    Rebuilt with one query whenever the `sitecontent` table version moves,
+    which every worker observes, so snapshots never outlive a write.
+    """
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._document: Document = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, version: int, sections: Optional[Iterable[str]] = None) -> Document:
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._document = self._build(db)
+                    self._version = version
+        document = self._document
+        if sections is None:
+            return document
+        return {section: document.get(section, {}) for section in sections}
+
+    @staticmethod
+    def _build(db: Session) -> Document:
+        document: Document = {}
+        rows = db.query(SiteContent.section, SiteContent.key, SiteContent.content).all()
+        for section, key, content in rows:
+            document.setdefault(section, {})[key] = content
+        return document
+
+content_bundle = ContentBundle()
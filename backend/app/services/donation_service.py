@@ -0,0 +1,150 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import event, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core import metrics
+from app.models.campaign import Campaign
+from app.models.donation import Donation, DonationStatus, PaymentGateway
+from app.services import rollup_service, stats_service, version_service
+from app.services.campaign_registry import campaign_registry
+from app.core.cache import invalidate_on_commit
+
+RAISED_COLUMNS = {
+    "USD": Campaign.current_raised_usd,
+    "ETB": Campaign.current_raised_etb,
+}
+
+def credit_campaign(db: Session, donation: Donation) -> None:
+    """
+    Add the donation to its campaign's running total with a single
+    `SET current_raised_x = current_raised_x + :amount`, so concurrent
+    confirmations never overwrite each other.
+    """
+    column = RAISED_COLUMNS.get((donation.currency or "").upper())
+    if not donation.campaign_id or column is None:
+        return
+    db.execute(
+        update(Campaign)
+        .where(Campaign.id == donation.campaign_id)
+        .values({column: func.coalesce(column, 0.0) + donation.amount})
+    )
+
+def count_transition(db: Session, gateway: str, status: str) -> None:
+    """
+    Count a donation status change in donation_transitions_total once the
+    surrounding transaction commits (nothing is counted on rollback).
+    """
+    label = lambda value: getattr(value, "value", value) # enum members or the raw column string
+    db.info.setdefault("donation_transitions", []).append((label(gateway), label(status)))
+
+@event.listens_for(Session, "after_commit")
+def _count_committed_transitions(session: Session) -> None:
+    for gateway, status in session.info.pop("donation_transitions", ()):
+        metrics.DONATION_TRANSITIONS.labels(gateway, status).inc()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_transitions(session: Session) -> None:
+    session.info.pop("donation_transitions", None)
+
+def _apply_success(db: Session, donation: Donation) -> None:
+    count_transition(db, donation.payment_gateway, DonationStatus.SUCCESS)
+    credit_campaign(db, donation)
+    stats_service.record_donation_success(db, donation)
+    rollup_service.record_success(db, donation) # after the stats row lock, which orders concurrent successes
+    version_service.bump(db, version_service.CAMPAIGN, version_service.DASHBOARD)
+    invalidate_on_commit(db, "campaign:*", "dashboard")
+
+def mark_success(db: Session, transaction_id: str) -> Optional[Donation]:
+    """
+    Move a donation to SUCCESS and account for it exactly once.
+
+    The status flip is a conditional `UPDATE ... WHERE status != 'SUCCESS'
+    RETURNING id`: when the webhook and the frontend verify race, the row lock
+    makes the second UPDATE match nothing. Returns the donation if this call
+    made the transition, None if it was already SUCCESS (or unknown).
+    Runs inside the caller's transaction; the caller commits.
+    """
+    donation_id = db.execute(
+        update(Donation)
+        .where(Donation.transaction_id == transaction_id, Donation.status != DonationStatus.SUCCESS)
+        .values(status=DonationStatus.SUCCESS)
+        .returning(Donation.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if donation_id is None:
+        return None
+
+    donation = db.get(Donation, donation_id, populate_existing=True)
+    _apply_success(db, donation)
+    return donation
+
+def create_success(db: Session, donation: Donation) -> Donation:
+    """
+    Insert a donation that is already confirmed (Stripe) and account for it.
+    The unique transaction_id makes a concurrent duplicate fail with
+    IntegrityError on flush, before anything is credited. The caller commits.
+    """
+    donation.status = DonationStatus.SUCCESS
+    db.add(donation)
+    db.flush()
+    _apply_success(db, donation)
+    return donation
+
+def record_stripe_payment(
+    db: Session, intent: Dict[str, Any], campaign_title: Optional[str] = None, donor_email: Optional[str] = None,
+) -> Donation:
+    """
+    Record a succeeded Stripe PaymentIntent (API object as a dict) as a
+    SUCCESS donation, exactly once however many times the browser verify and
+    the webhook deliver it. The campaign comes from the intent's metadata
+    (campaign_id, else campaign_title), or `campaign_title` from the client.
+    Returns the donation with its campaign loaded. The caller commits.
+    """
+    existing = select(Donation).options(joinedload(Donation.campaign)).where(Donation.transaction_id == intent["id"])
+    donation = db.execute(existing).scalars().first()
+    if donation:
+        return donation
+
+    metadata = intent.get("metadata") or {}
+    if metadata.get("campaign_id"):
+        ref = campaign_registry.get(db, metadata["campaign_id"])
+    else:
+        ref = campaign_registry.by_title(db, metadata.get("campaign_title") or campaign_title)
+
+    donation = Donation(
+        amount=intent["amount"] / 100.0, # Stripe amounts are in cents
+        currency=intent["currency"].upper(),
+        payment_gateway=PaymentGateway.STRIPE,
+        transaction_id=intent["id"],
+        donor_email=donor_email or intent.get("receipt_email"),
+        donor_name=metadata.get("donor_name") or "Guest Donor",
+        campaign_id=ref.id if ref else None,
+    )
+    # A concurrent confirmation of the same intent loses on the unique transaction_id
+    try:
+        with db.begin_nested():
+            create_success(db, donation)
+    except IntegrityError:
+        return db.execute(existing).scalars().one()
+    # Attach so campaign_title serializes without a lazy load
+    set_committed_value(donation, "campaign", db.get(Campaign, ref.id) if ref else None)
+    return donation
+
+def mark_closed(db: Session, transaction_id: str, status: DonationStatus) -> bool:
+    """
+    Close a still-PENDING donation as FAILED or EXPIRED. Conditional on
+    PENDING so it never overrides a concurrent confirmation. Returns True if
+    this call made the transition. The caller commits.
+    """
+    gateway = db.execute(
+        update(Donation)
+        .where(Donation.transaction_id == transaction_id, Donation.status == DonationStatus.PENDING)
+        .values(status=status)
+        .returning(Donation.payment_gateway)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if gateway is None:
+        return False
+    count_transition(db, gateway, status)
+    return True
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+from sqlalchemy import select
+from app.db.session import AsyncSessionLocal
+from app.models.donation import Donation
+from app.models.campaign import Campaign
+
+EXPORT_COLUMNS = [
+    "id", "created_at", "amount", "currency", "payment_gateway", "status",
+    "transaction_id", "donor_name", "donor_email", "campaign_id", "campaign_title",
+]
+BATCH_SIZE = 2000
+
+def build_query(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    gateway: Optional[str] = None,
+    status: Optional[str] = None,
+    currency: Optional[str] = None,
+    campaign_id: Optional[str] = None,
+):
+    # Plain column tuples (no ORM identity map) so memory stays flat per batch
+    query = select(
+        Donation.id, Donation.created_at, Donation.amount, Donation.currency, Donation.payment_gateway,
+        Donation.status, Donation.transaction_id, Donation.donor_name, Donation.donor_email,
+        Donation.campaign_id, Campaign.title,
+    ).outerjoin(Campaign, Campaign.id == Donation.campaign_id)
+
+    if start:
+        query = query.where(Donation.created_at >= start)
+    if end:
+        query = query.where(Donation.created_at < end)
+    if gateway:
+        query = query.where(Donation.payment_gateway == gateway.upper())
+    if status:
+        query = query.where(Donation.status == status.upper())
+    if currency:
+        query = query.where(Donation.currency == currency.upper())
+    if campaign_id:
+        if campaign_id == "general":
+            query = query.where(Donation.campaign_id == None)
+        else:
+            query = query.where(Donation.campaign_id == campaign_id)
+    return query.order_by(Donation.created_at, Donation.id)
+
+def _row_dict(row: Any) -> Dict[str, Any]:
+    values = dict(zip(EXPORT_COLUMNS, row))
+    if values["created_at"] is not None:
+        values["created_at"] = values["created_at"].isoformat()
+    values["campaign_title"] = values["campaign_title"] or "General Donation"
+    return values
+
+async def stream_donations(fmt: str = "csv", **filters: Any) -> AsyncIterator[bytes]:
+    """
+    Yield the filtered ledger as CSV or NDJSON, one encoded chunk per batch.
+    Uses a server-side cursor (yield_per) and its own session: request-scoped
+    dependencies are already closed by the time a streaming body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(build_query(**filters).execution_options(yield_per=BATCH_SIZE))
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        if fmt == "csv":
+            writer.writeheader()
+
+        async for batch in result.partitions():
+            for row in batch:
+                if fmt == "csv":
+                    writer.writerow(_row_dict(row))
+                else:
+                    buffer.write(json.dumps(_row_dict(row)))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31 -> gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+import httpx
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+
+class HTTPClient:
+    """
+    Application-scoped pooled httpx client shared by outbound integrations.
+    Opened and closed by the FastAPI lifespan in `app.main`, so every call
+    reuses keep-alive (and HTTP/2) connections instead of a fresh TCP+TLS handshake.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _build(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=settings.HTTP_CLIENT_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT, connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT),
+        )
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._build()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Outside the app lifespan (scripts, workers) open the pool lazily.
+        if self._client is None:
+            self._client = self._build()
+        return self._client
+
+    async def request(
+        self, method: str, url: str, *, retries: Optional[int] = None, retry_on_status: bool = True,
+        service: str = "other", **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through the shared pool, retrying connect errors and
+        (if retry_on_status) 5xx responses with jittered exponential backoff.
+        Latency (including retries) and outcome are recorded under `service`.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._send(method, url, retries, retry_on_status, service, kwargs)
+            outcome = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            metrics.OUTBOUND_REQUEST_DURATION.labels(service).observe(time.perf_counter() - started)
+            metrics.OUTBOUND_REQUESTS.labels(service, outcome).inc()
+
+    async def _send(
+        self, method: str, url: str, retries: Optional[int], retry_on_status: bool, service: str, kwargs: dict
+    ) -> httpx.Response:
+        attempts = settings.HTTP_CLIENT_RETRIES if retries is None else retries
+        for attempt in range(attempts + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except RETRY_EXCEPTIONS as e:
+                if attempt >= attempts:
+                    raise
+                logger.warning(f"{method} {url} failed ({type(e).__name__}), retrying")
+            else:
+                if not retry_on_status or response.status_code not in RETRY_STATUS_CODES or attempt >= attempts:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+                await response.aclose()
+
+            metrics.OUTBOUND_RETRIES.labels(service).inc()
+            delay = settings.HTTP_CLIENT_RETRY_BACKOFF * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+http_client = HTTPClient()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core import metrics
+from app.core.cache import invalidate_on_commit
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.media import Media, MediaType
+from app.services import image_variants, version_service
+
+logger = logging.getLogger(__name__)
+
+class ImagePipeline:
+    """
+    Renders responsive derivatives (IMAGE_VARIANT_WIDTHS x IMAGE_VARIANT_FORMATS,
+    plus an LQIP placeholder) for uploaded images in a pool of IMAGE_WORKERS
+    processes, so decoding/encoding never blocks the event loop or holds the GIL.
+
+    `render_blob` runs right after an upload (variants are named after the
+    blob, so they are ready by the time a Media row points at it); `process`
+    stores the result on a Media row and is what the backfill runs.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, *, workers: int = settings.IMAGE_WORKERS):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.formats = image_variants.supported_formats(settings.IMAGE_VARIANT_FORMATS)
+        self.qualities = {"webp": settings.IMAGE_WEBP_QUALITY, "avif": settings.IMAGE_AVIF_QUALITY}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        missing = set(settings.IMAGE_VARIANT_FORMATS) - set(self.formats)
+        if missing:
+            logger.warning(f"Image variants: no encoder for {sorted(missing)}, skipping those formats")
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a process holding DB connections and a running event loop
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def local_path(url: str) -> Optional[str]:
+        """
+        The file behind an uploaded media URL; None for external URLs (YouTube, S3).
+        """
+        prefix = settings.UPLOAD_URL_PREFIX.rstrip("/") + "/"
+        if not url or not url.startswith(prefix):
+            return None
+        name = url[len(prefix):]
+        if "/" in name or name.startswith("."):
+            return None
+        return os.path.join(settings.UPLOAD_DIR, name)
+
+    async def render_blob(self, path: str) -> Dict[str, Any]:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, partial(
+                image_variants.render, path, settings.UPLOAD_DIR, stem,
+                settings.IMAGE_VARIANT_WIDTHS, self.formats, self.qualities,
+            ))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image): start a fresh pool for the next job
+            metrics.IMAGE_RENDERS.labels("error").inc()
+            self.shutdown()
+            raise
+        except Exception:
+            metrics.IMAGE_RENDERS.labels("error").inc()
+            raise
+        metrics.IMAGE_RENDERS.labels("ok").inc()
+        metrics.IMAGE_RENDER_DURATION.observe(time.perf_counter() - started)
+        prefix = settings.UPLOAD_URL_PREFIX.rstrip("/")
+        for variant in result["variants"]:
+            variant["url"] = f"{prefix}/{variant.pop('file')}"
+        return result
+
+    async def warm(self, path: str) -> None:
+        """
+        Background task after an upload: render, log failures (the Media row is processed later).
+        """
+        try:
+            await self.render_blob(path)
+        except Exception as e:
+            logger.warning(f"Image variants for {path} failed: {e}")
+
+    async def process(self, media_id: str) -> bool:
+        """
+        Render and store the derivatives of one Media row. Returns False when
+        there is nothing to do (not an uploaded image) or rendering failed; the
+        row is stamped processed either way so the backfill does not retry it.
+        """
+        async with self.session_factory() as db:
+            url = (await db.execute(
+                select(Media.url).where(Media.id == media_id, Media.media_type == MediaType.IMAGE)
+            )).scalar()
+        if url is None:
+            return False
+        path = self.local_path(url)
+
+        result = None
+        if path and os.path.exists(path):
+            try:
+                result = await self.render_blob(path)
+            except Exception as e:
+                logger.warning(f"Image variants for media {media_id} ({url}) failed: {e}")
+
+        async with self.session_factory() as db:
+            await db.run_sync(_store_result, media_id, result)
+            await db.commit()
+        return result is not None
+
+    async def process_many(self, media_ids: List[str], concurrency: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process rows with at most `concurrency` (default: one per worker) in flight.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.workers)
+        counts = {"processed": 0, "skipped": 0}
+
+        async def one(media_id: str) -> None:
+            async with semaphore:
+                counts["processed" if await self.process(media_id) else "skipped"] += 1
+
+        await asyncio.gather(*(one(media_id) for media_id in media_ids))
+        return counts
+
+def _store_result(db: Session, media_id: str, result: Optional[Dict[str, Any]]) -> None:
+    media = db.get(Media, media_id)
+    if media is None:
+        return
+    if result is not None:
+        media.width = result["width"]
+        media.height = result["height"]
+        media.placeholder = result["placeholder"]
+        media.variants = result["variants"]
+    media.variants_processed_at = datetime.now(timezone.utc)
+    version_service.bump(db, version_service.MEDIA)
+    invalidate_on_commit(db, "media")
+
+image_pipeline = ImagePipeline()
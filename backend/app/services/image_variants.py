@@ -0,0 +1,104 @@
+"""
+Image derivative rendering. Runs inside the image pipeline's worker
+processes (app.services.image_service), so it imports nothing from the app:
+plain arguments in, a JSON-able dict out.
+"""
+import base64
+import io
+import math
+import os
+import tempfile
+from typing import Any, Dict, List, Sequence
+
+from PIL import Image, ImageOps
+
+try:
+    import pillow_avif # noqa: F401 (registers the AVIF codec with Pillow)
+except ImportError:
+    pillow_avif = None
+
+EXIF_ORIENTATION = 0x0112
+PLACEHOLDER_WIDTH = 16
+SAVE_OPTIONS = {
+    "webp": lambda quality: {"format": "WEBP", "quality": quality, "method": 4},
+    "avif": lambda quality: {"format": "AVIF", "quality": quality, "speed": 8},
+}
+
+def supported_formats(formats: Sequence[str]) -> List[str]:
+    """
+    The requested formats this Pillow build can encode (AVIF needs pillow-avif-plugin).
+    """
+    Image.init() # encoders register lazily
+    return [f for f in formats if f in SAVE_OPTIONS and SAVE_OPTIONS[f](0)["format"] in Image.SAVE]
+
+def _save_atomic(image, path: str, options: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".variant-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            image.save(out, **options)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _placeholder(image) -> str:
+    """
+    LQIP: a ~16px wide WebP as a data URI, shown blurred until the real image loads.
+    """
+    tiny = image.copy()
+    tiny.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH * 4))
+    buffer = io.BytesIO()
+    tiny.save(buffer, format="WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def render(
+    source_path: str, output_dir: str, stem: str, widths: Sequence[int], formats: Sequence[str],
+    qualities: Dict[str, int],
+) -> Dict[str, Any]:
+    """
+    Write `<stem>-<width>.<format>` for each configured width below the
+    source width (plus the source width itself unless it exceeds the largest
+    configured one) and return
+    the source dimensions, the variant list and an LQIP placeholder. Variants
+    already on disk are kept, so identical blobs are only encoded once.
+    """
+    largest = max(widths)
+    with Image.open(source_path) as opened:
+        stored_width, stored_height = opened.size
+        # EXIF orientations 5-8 are rotated by 90 degrees: display width is the stored height
+        rotated = opened.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+        width, height = (stored_height, stored_width) if rotated else (stored_width, stored_height)
+        scale = largest / width
+        if opened.format == "JPEG" and scale < 1:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale while still covering the largest variant
+            opened.draft("RGB", (math.ceil(stored_width * scale), math.ceil(stored_height * scale)))
+        image = ImageOps.exif_transpose(opened)
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    targets = sorted({w for w in widths if w < width} | ({width} if width <= largest else set()), reverse=True)
+    variants = []
+    current = image
+    for target in targets:
+        target_height = max(1, round(height * target / width))
+        # Step down from the previous (larger) variant: much cheaper than from the original
+        if current.size != (target, target_height):
+            current = current.resize((target, target_height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in formats:
+            name = f"{stem}-{target}.{fmt}"
+            path = os.path.join(output_dir, name)
+            if not os.path.exists(path):
+                _save_atomic(current, path, SAVE_OPTIONS[fmt](qualities.get(fmt, 75)))
+            variants.append({"file": name, "width": target, "height": target_height, "format": fmt})
+
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": _placeholder(current),
+        "variants": sorted(variants, key=lambda v: (v["format"], v["width"])),
+    }
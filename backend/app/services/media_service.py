@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.media import Media
 from pydantic import BaseModel
+from app.core.cache import invalidate_on_commit
+from app.services import version_service
+from app.core.pagination import keyset, split_page
 
 # Schema for input (Pydantic)
 class MediaCreate(BaseModel):
@@ -15,7 +18,15 @@ def get_multi(db: Session, skip: int = 0, limit: int = 100, media_type: Optional
     query = db.query(Media)
     if media_type:
         query = query.filter(Media.media_type == media_type)
-    return query.order_by(Media.created_at.desc()).offset(skip).limit(limit).all()
+    return query.order_by(Media.created_at.desc(), Media.id.desc()).offset(skip).limit(limit).all()
+
+def get_page(
+    db: Session, cursor: Optional[str] = None, limit: int = 100, media_type: Optional[str] = None
+) -> Tuple[List[Media], Optional[str]]:
+    query = db.query(Media)
+    if media_type:
+        query = query.filter(Media.media_type == media_type)
+    return split_page(keyset(query, Media, cursor, limit).all(), limit)
 
 def create(db: Session, obj_in: MediaCreate) -> Media:
     db_obj = Media(
@@ -27,6 +38,8 @@ def create(db: Session, obj_in: MediaCreate) -> Media:
         is_featured=True # Default to featured for now
     )
     db.add(db_obj)
+    version_service.bump(db, version_service.MEDIA)
+    invalidate_on_commit(db, "media")
     db.commit()
     db.refresh(db_obj)
     return db_obj
@@ -35,5 +48,7 @@ def delete(db: Session, id: str) -> Optional[Media]:
     obj = db.query(Media).get(id)
     if obj:
         db.delete(obj)
+        version_service.bump(db, version_service.MEDIA)
+        invalidate_on_commit(db, "media")
         db.commit()
     return obj
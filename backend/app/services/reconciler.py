@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from sqlalchemy import func, select, tuple_
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.donation import Donation, DonationStatus, PaymentGateway
+from app.services import donation_service
+from app.services.chapa import ChapaService, chapa_service
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 1000
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart across all tasks sharing it.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if delay:
+            await asyncio.sleep(delay)
+
+def _payment_status(response: Dict[str, Any]) -> str:
+    # Chapa verify: {"status": "success", "data": {"status": "success" | "pending" | "failed", ...}}
+    data = response.get("data") or {}
+    status = data.get("status") if isinstance(data, dict) else None
+    return (status or response.get("status") or "pending").lower()
+
+class PaymentReconciler:
+    """
+    Resolves Chapa donations left PENDING because the donor never came back
+    to the return URL and the webhook was missed. Each pass walks PENDING
+    donations older than RECONCILER_MIN_AGE_MINUTES in keyset batches,
+    verifies them with Chapa (bounded concurrency, rate limited) and marks
+    them SUCCESS / FAILED, or EXPIRED once past RECONCILER_EXPIRE_AFTER_HOURS.
+
+    Runs as a task in the API lifespan (RECONCILER_ENABLED) or standalone via
+    scripts/reconcile_payments.py. Every status change is a conditional UPDATE,
+    so it is safe alongside the webhook, the verify endpoint and other workers.
+    """
+
+    def __init__(
+        self,
+        chapa: ChapaService,
+        session_factory=AsyncSessionLocal,
+        *,
+        min_age: timedelta = timedelta(minutes=settings.RECONCILER_MIN_AGE_MINUTES),
+        expire_after: timedelta = timedelta(hours=settings.RECONCILER_EXPIRE_AFTER_HOURS),
+        batch_size: int = settings.RECONCILER_BATCH_SIZE,
+        concurrency: int = settings.RECONCILER_CONCURRENCY,
+        rate_per_second: float = settings.RECONCILER_RATE_PER_SECOND,
+        interval: float = settings.RECONCILER_INTERVAL_SECONDS,
+    ):
+        self.chapa = chapa
+        self.session_factory = session_factory
+        self.min_age = min_age
+        self.expire_after = expire_after
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate_per_second)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.backlog = 0
+        self.runs = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_seconds: Optional[float] = None
+        self.outcomes: Dict[str, int] = {"success": 0, "failed": 0, "expired": 0, "pending": 0, "skipped": 0, "error": 0}
+
+    def _pending_filter(self, now: datetime) -> list:
+        return [
+            Donation.status == DonationStatus.PENDING,
+            Donation.payment_gateway == PaymentGateway.CHAPA,
+            Donation.created_at < now - self.min_age,
+        ]
+
+    async def count_backlog(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            return await db.scalar(select(func.count()).select_from(Donation).where(*self._pending_filter(now)))
+
+    async def _next_batch(self, now: datetime, after: Optional[Tuple[datetime, str]]) -> List[Tuple[str, str, datetime]]:
+        query = select(Donation.id, Donation.transaction_id, Donation.created_at).where(*self._pending_filter(now))
+        if after:
+            query = query.where(tuple_(Donation.created_at, Donation.id) > after)
+        query = query.order_by(Donation.created_at, Donation.id).limit(self.batch_size)
+        async with self.session_factory() as db:
+            return (await db.execute(query)).all()
+
+    async def _verify(self, tx_ref: str) -> Optional[str]:
+        """
+        Ask Chapa for the payment status. None on transport errors / 5xx (retry next pass).
+        """
+        await self.limiter.wait()
+        started = time.perf_counter()
+        try:
+            return _payment_status(await self.chapa.verify_transaction(tx_ref))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                logger.warning(f"Reconciler: verify {tx_ref} returned {e.response.status_code}")
+                return None
+            # 4xx: failed payment, or a tx_ref Chapa never saw (donor abandoned before paying)
+            try:
+                return _payment_status(e.response.json())
+            except ValueError:
+                return "pending"
+        except httpx.HTTPError as e:
+            logger.warning(f"Reconciler: verify {tx_ref} failed ({type(e).__name__})")
+            return None
+        finally:
+            self._latencies.append(time.perf_counter() - started)
+
+    async def reconcile(self, tx_ref: str, created_at: datetime, now: datetime) -> str:
+        status = await self._verify(tx_ref)
+        if status is None:
+            outcome = "error"
+        elif status == "success":
+            outcome = "success"
+        elif status == "failed":
+            outcome = "failed"
+        elif created_at < now - self.expire_after:
+            outcome = "expired"
+        else:
+            outcome = "pending"
+
+        if outcome in ("success", "failed", "expired"):
+            async with self.session_factory() as db:
+                if outcome == "success":
+                    changed = await db.run_sync(donation_service.mark_success, tx_ref) is not None
+                else:
+                    closed = DonationStatus.FAILED if outcome == "failed" else DonationStatus.EXPIRED
+                    changed = await db.run_sync(donation_service.mark_closed, tx_ref, closed)
+                await db.commit()
+            if not changed:
+                outcome = "skipped" # Resolved concurrently by the webhook / verify endpoint
+
+        self.outcomes[outcome] += 1
+        return outcome
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        One full pass over the current backlog. Returns the outcome counts for this pass.
+        """
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        self.backlog = await self.count_backlog(now)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        counts: Dict[str, int] = {}
+
+        async def one(tx_ref: str, created_at: datetime) -> None:
+            async with semaphore:
+                try:
+                    outcome = await self.reconcile(tx_ref, created_at, now)
+                except Exception as e:
+                    logger.exception(f"Reconciler: {tx_ref} failed: {e}")
+                    self.outcomes["error"] += 1
+                    outcome = "error"
+                counts[outcome] = counts.get(outcome, 0) + 1
+
+        after = None
+        while True:
+            batch = await self._next_batch(now, after)
+            if not batch:
+                break
+            await asyncio.gather(*(one(tx_ref, created_at) for _, tx_ref, created_at in batch))
+            after = (batch[-1].created_at, batch[-1].id)
+
+        self.runs += 1
+        self.last_run_at = now
+        self.last_run_seconds = time.perf_counter() - started
+        self.backlog = await self.count_backlog()
+        logger.info(f"Reconciler pass: {counts} in {self.last_run_seconds:.1f}s, backlog {self.backlog}")
+        return counts
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Reconciler pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        # Cancelling mid-pass is safe: each donation is updated in its own transaction
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        latency_ms = {}
+        if len(latencies) >= 2:
+            q = statistics.quantiles(latencies, n=100)
+            latency_ms = {"p50": round(q[49] * 1000, 1), "p95": round(q[94] * 1000, 1), "p99": round(q[98] * 1000, 1)}
+        return {
+            "running": self._task is not None,
+            "backlog": self.backlog,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_seconds": round(self.last_run_seconds, 3) if self.last_run_seconds is not None else None,
+            "outcomes": dict(self.outcomes),
+            "verify_latency_ms": latency_ms,
+            "verify_samples": len(latencies),
+        }
+
+payment_reconciler = PaymentReconciler(chapa_service)
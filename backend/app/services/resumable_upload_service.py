@@ -0,0 +1,332 @@
+import asyncio
+import base64
+import binascii
+import logging
+import mimetypes
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from fastapi import HTTPException, Request
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.media import MediaCategory, MediaType
+from app.models.resumable_upload import ResumableUpload, ResumableUploadStatus
+from app.services import media_service, upload_service
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+TUS_EXTENSIONS = "creation,termination,concatenation,expiration"
+
+def parse_metadata(header: Optional[str]) -> Dict[str, str]:
+    """
+    tus Upload-Metadata: comma-separated `key base64(value)` pairs.
+    """
+    metadata = {}
+    for pair in (header or "").split(","):
+        if not pair.strip():
+            continue
+        key, _, value = pair.strip().partition(" ")
+        try:
+            metadata[key] = base64.b64decode(value, validate=True).decode("utf-8") if value else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail=f"Invalid Upload-Metadata value for '{key}'")
+    return metadata
+
+def content_type_of(metadata: Dict[str, str]) -> str:
+    return (metadata.get("filetype") or mimetypes.guess_type(metadata.get("filename", ""))[0] or "").lower()
+
+def media_type_for(content_type: str) -> Optional[str]:
+    if content_type.startswith("video/"):
+        return MediaType.VIDEO.value
+    if content_type.startswith("image/"):
+        return MediaType.IMAGE.value
+    return None
+
+def part_path(upload_id: str) -> str:
+    return os.path.join(settings.RESUMABLE_UPLOAD_DIR, upload_id)
+
+def expires_at(upload: ResumableUpload) -> datetime:
+    return upload.updated_at + timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRE_HOURS)
+
+def _lease() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.RESUMABLE_UPLOAD_LEASE_SECONDS)
+
+def create(
+    db: Session, length: int, metadata: Dict[str, str], *, is_partial: bool = False,
+    parts: Optional[List[ResumableUpload]] = None, created_by: Optional[str] = None,
+) -> ResumableUpload:
+    """
+    A new upload. With `parts` it is a tus final upload: complete on
+    creation, leased to the caller, which goes on to store it.
+    """
+    upload = ResumableUpload(
+        length=length, upload_metadata=metadata, is_partial=is_partial, created_by=created_by,
+        updated_at=datetime.now(timezone.utc),
+    )
+    if parts is not None:
+        upload.upload_metadata = {**metadata, "parts": [part.id for part in parts]}
+        upload.offset = length
+        upload.status = ResumableUploadStatus.COMPLETE
+        upload.locked_until = _lease()
+    db.add(upload)
+    db.flush()
+    return upload
+
+def claim(db: Session, upload_id: str, offset: int) -> Optional[ResumableUpload]:
+    """
+    Take the write lease of an upload whose durable offset is `offset`. A
+    conditional UPDATE, so two PATCHes racing for the same upload cannot both
+    append. Returns None if the upload is unknown, stored, at another offset
+    or leased by a PATCH still in flight. (A COMPLETE upload can be claimed
+    at its full length: that retries storing it.) The caller commits.
+    """
+    claimed = db.execute(
+        update(ResumableUpload)
+        .where(
+            ResumableUpload.id == upload_id,
+            ResumableUpload.status != ResumableUploadStatus.STORED,
+            ResumableUpload.offset == offset,
+            or_(ResumableUpload.locked_until.is_(None), ResumableUpload.locked_until < datetime.now(timezone.utc)),
+        )
+        .values(locked_until=_lease())
+        .returning(ResumableUpload.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    return db.get(ResumableUpload, claimed, populate_existing=True) if claimed else None
+
+def checkpoint(db: Session, upload_id: str, offset: int, release: bool) -> None:
+    """
+    Record `offset` bytes as durably written and renew (or release) the lease.
+    A completed upload keeps its lease: the PATCH that completed it goes on
+    to store it.
+    """
+    upload = db.get(ResumableUpload, upload_id, populate_existing=True)
+    upload.offset = offset
+    upload.updated_at = datetime.now(timezone.utc) # set here, not onupdate: stays loaded for Upload-Expires
+    complete = offset == upload.length
+    upload.locked_until = None if release and not complete else _lease()
+    if complete:
+        upload.status = ResumableUploadStatus.COMPLETE
+
+def claim_parts(db: Session, part_ids: List[str]) -> List[ResumableUpload]:
+    """
+    Hand completed partial uploads to a final (concatenated) upload. Marks
+    them STORED in one conditional UPDATE so two finals cannot both use
+    them; raises 409 unless every part is a complete partial upload. The
+    caller commits.
+    """
+    if not part_ids or len(set(part_ids)) != len(part_ids):
+        raise HTTPException(status_code=400, detail="Upload-Concat needs distinct partial uploads")
+    claimed = db.execute(
+        update(ResumableUpload)
+        .where(
+            ResumableUpload.id.in_(part_ids),
+            ResumableUpload.is_partial.is_(True),
+            ResumableUpload.status == ResumableUploadStatus.COMPLETE,
+        )
+        .values(status=ResumableUploadStatus.STORED)
+        .returning(ResumableUpload.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if len(claimed) != len(part_ids):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Partial uploads are missing, incomplete or already used")
+    rows = {row.id: row for row in db.execute(
+        select(ResumableUpload).where(ResumableUpload.id.in_(part_ids)).execution_options(populate_existing=True)
+    ).scalars()}
+    return [rows[part_id] for part_id in part_ids]
+
+class _PartWriter:
+    """
+    Appends a PATCH body to the upload's part file, one buffered chunk per
+    threadpool hop, and checkpoints the durable offset every
+    RESUMABLE_UPLOAD_CHECKPOINT_BYTES so a dropped connection loses little.
+    """
+
+    def __init__(self, db: AsyncSession, upload: ResumableUpload):
+        self.db = db
+        self.upload_id = upload.id
+        self.length = upload.length
+        self.offset = upload.offset # durable
+        self.written = upload.offset # written, maybe not yet synced
+        self._buffer = bytearray()
+        self._file = None
+
+    def _open(self) -> None:
+        os.makedirs(settings.RESUMABLE_UPLOAD_DIR, exist_ok=True)
+        if self.offset and not os.path.exists(part_path(self.upload_id)):
+            # Never pad a lost part file with zeros and store that
+            raise HTTPException(status_code=410, detail="Upload data is gone; start a new upload")
+        self._file = open(part_path(self.upload_id), "a+b")
+        # Drop bytes past the last checkpoint (left by a PATCH that died before recording them)
+        self._file.truncate(self.offset)
+        self._file.seek(self.offset)
+
+    def _write(self, chunk: bytearray, sync: bool) -> None:
+        self._file.write(chunk)
+        if sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    async def write(self, data: bytes) -> None:
+        if self.written + len(self._buffer) + len(data) > self.length:
+            raise HTTPException(status_code=413, detail="Body exceeds Upload-Length")
+        self._buffer += data
+        if len(self._buffer) >= settings.UPLOAD_CHUNK_BYTES:
+            await self._flush(sync=False)
+            if self.written - self.offset >= settings.RESUMABLE_UPLOAD_CHECKPOINT_BYTES:
+                await self.checkpoint(release=False)
+
+    async def _flush(self, sync: bool) -> None:
+        chunk, self._buffer = self._buffer, bytearray()
+        await run_in_threadpool(self._write, chunk, sync)
+        self.written += len(chunk)
+
+    async def checkpoint(self, release: bool) -> None:
+        await self._flush(sync=True)
+        await self.db.run_sync(checkpoint, self.upload_id, self.written, release)
+        await self.db.commit()
+        self.offset = self.written
+
+    async def receive(self, request: Request) -> int:
+        await run_in_threadpool(self._open)
+        try:
+            async for chunk in request.stream():
+                await self.write(chunk)
+        except ClientDisconnect:
+            logger.info(f"Upload {self.upload_id}: client disconnected at {self.written + len(self._buffer)} bytes")
+        finally:
+            # Keep whatever arrived (that is the point of resuming) and give up the lease
+            try:
+                await self.checkpoint(release=True)
+            finally:
+                await run_in_threadpool(self._file.close)
+        return self.offset
+
+async def receive(db: AsyncSession, request: Request, upload: ResumableUpload) -> int:
+    if (upload.upload_metadata or {}).get("parts"):
+        # A final upload is complete on creation and has no part file of its own: a PATCH
+        # (at its full length) only retries storing it from the parts
+        return upload.offset
+    return await _PartWriter(db, upload).receive(request)
+
+async def store(db: AsyncSession, upload: ResumableUpload):
+    """
+    Copy a completed upload's bytes into UPLOAD_DIR as one content-addressed
+    blob (a final upload concatenates its parts in order; a single part is
+    hard-linked) and create the Media row through media_service.create. The
+    part files are removed only after that commit, so if it fails a retried
+    PATCH at the full length stores the same blob again. Returns the Media.
+    """
+    metadata = upload.upload_metadata or {}
+    parts = metadata.get("parts") or [upload.id]
+    content_type = content_type_of(metadata)
+    category = metadata.get("category", "")
+    stored = await run_in_threadpool(
+        upload_service.store_files, [part_path(part_id) for part_id in parts],
+        upload_service.safe_extension(metadata.get("filename", "")), content_type,
+    )
+
+    def create_media(sync_db: Session):
+        row = sync_db.get(ResumableUpload, upload.id, populate_existing=True)
+        row.status = ResumableUploadStatus.STORED
+        row.locked_until = None
+        media = media_service.create(sync_db, media_service.MediaCreate(
+            url=stored.url,
+            media_type=media_type_for(content_type),
+            title=metadata.get("title") or metadata.get("filename"),
+            description=metadata.get("description"),
+            category=category if category in MediaCategory.__members__ else MediaCategory.CAMPAIGN_UPDATE.value,
+        ))
+        row.media_id = media.id
+        # The parts of a final upload are spent
+        sync_db.execute(delete(ResumableUpload).where(
+            ResumableUpload.id.in_([part_id for part_id in parts if part_id != upload.id])
+        ))
+        sync_db.commit()
+        return media
+
+    media = await db.run_sync(create_media)
+    for part_id in {*parts, upload.id}:
+        await run_in_threadpool(_unlink, part_path(part_id))
+    return media
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+async def terminate(db: AsyncSession, upload: ResumableUpload) -> None:
+    await db.execute(delete(ResumableUpload).where(ResumableUpload.id == upload.id))
+    await db.commit()
+    await run_in_threadpool(_unlink, part_path(upload.id))
+
+class UploadGarbageCollector:
+    """
+    Removes uploads idle for RESUMABLE_UPLOAD_EXPIRE_HOURS (their rows and
+    part files) plus part files without a row, every
+    RESUMABLE_UPLOAD_GC_INTERVAL_SECONDS. Safe to run in every process.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, interval: int = settings.RESUMABLE_UPLOAD_GC_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Dict[str, int]:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRE_HOURS)
+        async with self.session_factory() as db:
+            expired = (await db.execute(
+                delete(ResumableUpload)
+                .where(
+                    ResumableUpload.updated_at < cutoff,
+                    or_(ResumableUpload.locked_until.is_(None), ResumableUpload.locked_until < datetime.now(timezone.utc)),
+                )
+                .returning(ResumableUpload.id)
+            )).scalars().all()
+            await db.commit()
+            live = set((await db.execute(select(ResumableUpload.id))).scalars().all())
+        orphans = await run_in_threadpool(self._sweep, set(expired), live, cutoff.timestamp())
+        if expired or orphans:
+            logger.info(f"Upload GC: {len(expired)} expired uploads, {orphans} orphaned part files removed")
+        return {"expired": len(expired), "orphaned_files": orphans}
+
+    @staticmethod
+    def _sweep(expired: set, live: set, cutoff: float) -> int:
+        for upload_id in expired:
+            _unlink(part_path(upload_id))
+        orphans = 0
+        if os.path.isdir(settings.RESUMABLE_UPLOAD_DIR):
+            for name in os.listdir(settings.RESUMABLE_UPLOAD_DIR):
+                path = part_path(name)
+                if name not in live and os.path.getmtime(path) < cutoff:
+                    _unlink(path)
+                    orphans += 1
+        return orphans
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Upload GC failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+upload_gc = UploadGarbageCollector()
@@ -0,0 +1,183 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.dashboard_stats import DashboardStats
+from app.models.donation import Donation, DonationStatus
+from app.models.donation_rollup import DonationRollup, RollupGranularity
+from app.services import version_service
+from app.services.stats_service import STATS_ID
+
+UNITS = {RollupGranularity.HOUR: "hour", RollupGranularity.DAY: "day"}
+ROLLUP_COLUMNS = ["granularity", "bucket_start", "campaign_id", "currency", "payment_gateway", "amount", "donations_count"]
+NAMED_BUCKETS = {"hour": "1h", "day": "1d", "week": "7d"}
+_BUCKET = re.compile(r"^(\d+)([hd])$")
+
+def _from_donations(*conditions) -> Any:
+    """
+    HOUR and DAY rollup rows for the SUCCESS donations matching `conditions`.
+    """
+    parts = []
+    for granularity, unit in UNITS.items():
+        bucket_start = func.date_trunc(unit, Donation.created_at, "UTC")
+        parts.append(
+            select(
+                literal(granularity.value), bucket_start, Donation.campaign_id, Donation.currency,
+                Donation.payment_gateway, func.sum(Donation.amount), func.count(),
+            )
+            .where(Donation.status == DonationStatus.SUCCESS, *conditions)
+            .group_by(bucket_start, Donation.campaign_id, Donation.currency, Donation.payment_gateway)
+        )
+    return union_all(*parts)
+
+def record_success(db: Session, donation: Donation) -> None:
+    """
+    Add a donation that just moved to SUCCESS to its hour and day buckets
+    (one upsert). Must run inside the transaction that flips the status, after
+    the dashboard stats row is locked; the caller commits.
+    """
+    statement = insert(DonationRollup).from_select(ROLLUP_COLUMNS, _from_donations(Donation.id == donation.id))
+    db.execute(statement.on_conflict_do_update(
+        constraint="uq_donationrollup_bucket",
+        set_={
+            "amount": DonationRollup.amount + statement.excluded.amount,
+            "donations_count": DonationRollup.donations_count + statement.excluded.donations_count,
+        },
+    ))
+
+def _day_floor(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+def rebuild(db: Session, since: Optional[datetime] = None) -> int:
+    """
+    Recompute the rollups from the donation table, all of them or from the
+    start of `since`'s UTC day. Holds the dashboard stats row lock, which
+    every SUCCESS transition takes first, so none land half-counted. Flushes
+    but does not commit; returns the number of rollup rows written.
+    """
+    db.query(DashboardStats).filter(DashboardStats.id == STATS_ID).with_for_update().first()
+    stale = delete(DonationRollup)
+    conditions = []
+    if since is not None:
+        since = _day_floor(since)
+        stale = stale.where(DonationRollup.bucket_start >= since)
+        conditions.append(Donation.created_at >= since)
+    db.execute(stale)
+    written = db.execute(insert(DonationRollup).from_select(ROLLUP_COLUMNS, _from_donations(*conditions))).rowcount
+    version_service.bump(db, version_service.DASHBOARD)
+    db.flush()
+    return written
+
+def check(db: Session, since: Optional[datetime] = None, tolerance: float = 0.005) -> Dict[Tuple, Tuple[Any, Any]]:
+    """
+    Compare the stored rollups with a recomputation from the donation table.
+    Returns (granularity, bucket_start, campaign_id, currency, gateway) ->
+    ((stored amount, count), (actual amount, count)) for every bucket that differs.
+    """
+    conditions, stored_conditions = [], []
+    if since is not None:
+        since = _day_floor(since)
+        conditions.append(Donation.created_at >= since)
+        stored_conditions.append(DonationRollup.bucket_start >= since)
+    key = lambda row: tuple(row[:5])
+    actual = {key(row): (row[5], row[6]) for row in db.execute(_from_donations(*conditions))}
+    stored = {
+        key(row): (row[5], row[6])
+        for row in db.execute(select(*(getattr(DonationRollup, c) for c in ROLLUP_COLUMNS)).where(*stored_conditions))
+    }
+    mismatches = {}
+    for bucket in actual.keys() | stored.keys():
+        have, want = stored.get(bucket, (0.0, 0)), actual.get(bucket, (0.0, 0))
+        if abs(have[0] - want[0]) > tolerance or have[1] != want[1]:
+            mismatches[bucket] = (have, want)
+    return mismatches
+
+def parse_bucket(bucket: str) -> Union[timedelta, str]:
+    """
+    "hour", "day", "week", "month" or a multiple of hours/days ("6h", "2d").
+    Returns the bucket width, or "month" (calendar months are not a fixed width).
+    """
+    bucket = NAMED_BUCKETS.get(bucket, bucket)
+    if bucket == "month":
+        return bucket
+    match = _BUCKET.match(bucket)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid bucket {bucket!r}: use hour, day, week, month or e.g. 6h, 2d")
+    count = int(match.group(1))
+    return timedelta(hours=count) if match.group(2) == "h" else timedelta(days=count)
+
+def _next_month(moment: datetime) -> datetime:
+    return moment.replace(year=moment.year + moment.month // 12, month=moment.month % 12 + 1)
+
+def timeseries(
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = "day",
+    campaign_id: Optional[str] = None,
+    gateway: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Raised amounts and donation counts per bucket between `start` (default:
+    30 days before `end`) and `end` (default: now), merged from the rollups:
+    hour rows for sub-day buckets, day rows otherwise. The range is widened
+    to whole buckets of that granularity (UTC); every bucket is listed, empty
+    ones as zero. The cost depends on the range and the number of campaigns,
+    not on the size of the donation table. Raises ValueError for a bad
+    bucket or more than TIMESERIES_MAX_BUCKETS buckets.
+    """
+    width = parse_bucket(bucket)
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+    start, end = (
+        (moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)).astimezone(timezone.utc)
+        for moment in (start, end)
+    )
+    if start >= end:
+        raise ValueError("start must be before end")
+
+    if width == "month":
+        granularity = RollupGranularity.DAY
+        start = _day_floor(start).replace(day=1)
+        bucket_start = func.date_trunc("month", DonationRollup.bucket_start, "UTC")
+    else:
+        granularity = RollupGranularity.DAY if width % timedelta(days=1) == timedelta(0) else RollupGranularity.HOUR
+        start = _day_floor(start) if granularity == RollupGranularity.DAY else start.replace(minute=0, second=0, microsecond=0)
+        bucket_start = func.date_bin(width, DonationRollup.bucket_start, start)
+
+    buckets: List[datetime] = []
+    moment = start
+    while moment < end:
+        if len(buckets) == settings.TIMESERIES_MAX_BUCKETS:
+            raise ValueError(f"More than {settings.TIMESERIES_MAX_BUCKETS} buckets: use a shorter range or a wider bucket")
+        buckets.append(moment)
+        moment = _next_month(moment) if width == "month" else moment + width
+    end = moment
+
+    query = (
+        select(
+            bucket_start.label("bucket_start"), DonationRollup.currency,
+            func.sum(DonationRollup.amount), func.sum(DonationRollup.donations_count),
+        )
+        .where(
+            DonationRollup.granularity == granularity,
+            DonationRollup.bucket_start >= start,
+            DonationRollup.bucket_start < end,
+        )
+        .group_by(bucket_start, DonationRollup.currency)
+    )
+    if campaign_id:
+        query = query.where(DonationRollup.campaign_id == campaign_id)
+    if gateway:
+        query = query.where(DonationRollup.payment_gateway == gateway)
+
+    points = {b: {"bucket_start": b, "raised_usd": 0.0, "raised_etb": 0.0, "donations_count": 0} for b in buckets}
+    for moment, currency, amount, count in db.execute(query):
+        point = points[moment.astimezone(timezone.utc)]
+        if currency in ("USD", "ETB"):
+            point[f"raised_{currency.lower()}"] += float(amount)
+        point["donations_count"] += int(count)
+    return {"bucket": bucket, "start": start, "end": end, "points": list(points.values())}
@@ -0,0 +1,120 @@
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import String, Text, cast, func, literal, null, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.search import SEARCH_CONFIG
+from app.models.campaign import Campaign
+from app.models.contact import ContactMessage
+from app.models.media import Media
+from app.models.site_content import SiteContent
+
+@dataclass(frozen=True)
+class _Source:
+    model: Any
+    title: Any
+    body: Any
+    slug: Any = None
+    public_filter: Any = None # Extra condition for visitors
+
+SOURCES: Dict[str, _Source] = {
+    "campaign": _Source(Campaign, Campaign.title, Campaign.description, Campaign.slug, Campaign.is_active.is_(True)),
+    "media": _Source(Media, Media.title, Media.description),
+    "site_content": _Source(SiteContent, SiteContent.label, SiteContent.content),
+    "contact": _Source(ContactMessage, ContactMessage.subject, ContactMessage.message),
+}
+PUBLIC_TYPES = ("campaign", "media", "site_content")
+
+_TERM = re.compile(r"[^\W_]+")
+# ts_headline marks matches with these (private-use, so never in real text); the
+# fragment is HTML-escaped and they become <mark> tags
+_START, _STOP = "\ue000", "\ue001"
+TITLE_HEADLINE = f"HighlightAll=true, StartSel={_START}, StopSel={_STOP}"
+BODY_HEADLINE = f'MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … ", StartSel={_START}, StopSel={_STOP}'
+
+def to_tsquery_text(q: str) -> Optional[str]:
+    """
+    Every word of the user's input as a prefix term, ANDed ("new libr" ->
+    "new:* & libr:*"), so results show up while typing. Punctuation and
+    tsquery operators are dropped; one-letter words would match half the
+    corpus, so they are ignored. None when nothing searchable is left.
+    """
+    terms = [t for t in _TERM.findall(q.lower()) if len(t) > 1][:settings.SEARCH_MAX_TERMS]
+    return " & ".join(f"{t}:*" for t in terms) or None
+
+def _mark(fragment: Optional[str]) -> Optional[str]:
+    if fragment is None:
+        return None
+    return html.escape(fragment).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+def search(
+    db: Session, q: str, types: Sequence[str] = PUBLIC_TYPES, limit: int = 20, offset: int = 0, public: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Rank campaigns, media, site content and (for admins) contact messages
+    against `q` through their search_vector GIN indexes. Titles weigh more
+    than bodies (A/B weights). Only the returned page is highlighted
+    (ts_headline is the expensive part); highlights are HTML-escaped with
+    <mark> around the matches.
+
+    Ranking has to read every match, so each type contributes at most
+    SEARCH_MAX_CANDIDATES of them, whichever the scan finds first. Results
+    are exact while a type has no more matches than that. Past it, the best
+    matches of a very common term can be missed and the picked subset may
+    change as rows are written. scripts/bench_search.py measures how much is
+    lost. Set it to 0 to rank every match at several times the cost.
+    """
+    tsquery_text = to_tsquery_text(q)
+    if tsquery_text is None:
+        return []
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    query = func.to_tsquery(config, tsquery_text)
+
+    parts = []
+    for kind in types:
+        source = SOURCES[kind]
+        vector = source.model.search_vector
+        candidates = select(
+            source.model.id,
+            cast(source.title, String).label("title"),
+            cast(source.body, Text).label("body"),
+            (source.slug if source.slug is not None else null()).label("slug"),
+            vector.label("vector"),
+        ).where(vector.op("@@")(query))
+        if public and source.public_filter is not None:
+            candidates = candidates.where(source.public_filter)
+        if settings.SEARCH_MAX_CANDIDATES:
+            # Whichever matches the scan meets first, not the best ones (see the docstring)
+            candidates = candidates.limit(settings.SEARCH_MAX_CANDIDATES)
+        candidates = candidates.subquery()
+        rank = func.ts_rank_cd(candidates.c.vector, query)
+        parts.append(
+            select(
+                literal(kind).label("type"), candidates.c.id, candidates.c.title, candidates.c.body,
+                cast(candidates.c.slug, String).label("slug"), rank.label("rank"),
+            ).order_by(rank.desc(), candidates.c.id).limit(offset + limit)
+        )
+    if not parts:
+        return []
+
+    hits = union_all(*parts).subquery()
+    page = select(hits).order_by(hits.c.rank.desc(), hits.c.id).offset(offset).limit(limit).subquery()
+    # Markup in descriptions/content is dropped before highlighting
+    body = func.regexp_replace(page.c.body, r"\s*<[^>]*>\s*", " ", "g")
+    rows = db.execute(
+        select(
+            page.c.type, page.c.id, page.c.slug, page.c.rank,
+            func.ts_headline(config, page.c.title, query, TITLE_HEADLINE).label("title"),
+            func.ts_headline(config, body, query, BODY_HEADLINE).label("highlight"),
+        ).order_by(page.c.rank.desc(), page.c.id)
+    ).all()
+    return [
+        {
+            "type": row.type, "id": row.id, "slug": row.slug, "rank": row.rank,
+            "title": _mark(row.title), "highlight": _mark(row.highlight),
+        }
+        for row in rows
+    ]
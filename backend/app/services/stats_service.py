@@ -0,0 +1,111 @@
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.dashboard_stats import DashboardStats
+from app.models.donation import Donation, DonationStatus
+from app.models.campaign import Campaign
+from app.schemas.donation import Donation as DonationSchema
+from app.services import version_service
+
+STATS_ID = "global"
+RECENT_DONATIONS_LIMIT = 5
+
+def _serialize(donation: Donation) -> Dict[str, Any]:
+    return DonationSchema.model_validate(donation).model_dump(mode="json")
+
+def get(db: Session) -> Optional[DashboardStats]:
+    return db.get(DashboardStats, STATS_ID)
+
+def compute(db: Session) -> Dict[str, Any]:
+    """
+    Compute every dashboard aggregate from the `donation` and `campaign` tables.
+    This is the slow path the stats row exists to avoid; only rebuild/check use it.
+    """
+    totals = dict(
+        db.query(Donation.currency, func.coalesce(func.sum(Donation.amount), 0.0))
+        .filter(Donation.status == DonationStatus.SUCCESS)
+        .group_by(Donation.currency)
+        .all()
+    )
+    recent = db.query(Donation).filter(
+        Donation.status == DonationStatus.SUCCESS
+    ).order_by(Donation.created_at.desc(), Donation.id.desc()).limit(RECENT_DONATIONS_LIMIT).all()
+
+    return {
+        "total_raised_usd": float(totals.get("USD", 0.0)),
+        "total_raised_etb": float(totals.get("ETB", 0.0)),
+        "total_donations_count": db.query(Donation).filter(Donation.status == DonationStatus.SUCCESS).count(),
+        "active_campaigns": db.query(Campaign).count(),
+        "recent_donations": [_serialize(d) for d in recent],
+    }
+
+def rebuild(db: Session) -> DashboardStats:
+    """
+    Recompute the stats row from scratch. Flushes but does not commit.
+    """
+    values = compute(db)
+    stats = db.query(DashboardStats).filter(DashboardStats.id == STATS_ID).with_for_update().first()
+    if not stats:
+        stats = DashboardStats(id=STATS_ID)
+        db.add(stats)
+    for field, value in values.items():
+        setattr(stats, field, value)
+    version_service.bump(db, version_service.DASHBOARD)
+    db.flush()
+    return stats
+
+def check(db: Session, tolerance: float = 0.005) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare the stored stats row with a full recomputation.
+    Returns a mapping of field -> (stored, actual) for every field that differs.
+    """
+    actual = compute(db)
+    stats = get(db)
+    if not stats:
+        return {field: (None, value) for field, value in actual.items()}
+
+    mismatches = {}
+    for field, value in actual.items():
+        stored = getattr(stats, field)
+        if isinstance(value, float):
+            if abs((stored or 0.0) - value) > tolerance:
+                mismatches[field] = (stored, value)
+        elif field == "recent_donations":
+            if [d["id"] for d in stored or []] != [d["id"] for d in value]:
+                mismatches[field] = ([d["id"] for d in stored or []], [d["id"] for d in value])
+        elif stored != value:
+            mismatches[field] = (stored, value)
+    return mismatches
+
+def record_donation_success(db: Session, donation: Donation) -> None:
+    """
+    Fold a donation that just moved to SUCCESS into the stats row.
+    Must be called inside the transaction that flips the status; the caller commits.
+    """
+    stats = db.query(DashboardStats).filter(DashboardStats.id == STATS_ID).with_for_update().first()
+    if not stats:
+        # First success since deploy: the flushed donation is already visible to the rebuild.
+        db.flush()
+        rebuild(db)
+        return
+
+    if donation.currency == "USD":
+        stats.total_raised_usd = (stats.total_raised_usd or 0.0) + donation.amount
+    elif donation.currency == "ETB":
+        stats.total_raised_etb = (stats.total_raised_etb or 0.0) + donation.amount
+    stats.total_donations_count = (stats.total_donations_count or 0) + 1
+
+    db.flush()
+    recent = [d for d in (stats.recent_donations or []) if d["id"] != donation.id]
+    recent.append(_serialize(donation))
+    recent.sort(key=lambda d: (d["created_at"], d["id"]), reverse=True)
+    stats.recent_donations = recent[:RECENT_DONATIONS_LIMIT]
+
+def record_campaign_created(db: Session) -> None:
+    """
+    Bump the campaign counter. Called inside the campaign insert transaction.
+    """
+    db.query(DashboardStats).filter(DashboardStats.id == STATS_ID).update(
+        {DashboardStats.active_campaigns: DashboardStats.active_campaigns + 1},
+        synchronize_session=False,
+    )
@@ -0,0 +1,246 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.static_media import precompress
+
+# Multipart framing around the file part (boundaries, part headers)
+FORM_OVERHEAD_BYTES = 64 * 1024
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+def max_bytes_for(content_type: str) -> int:
+    if content_type.startswith("image/"):
+        return settings.UPLOAD_MAX_IMAGE_BYTES
+    if content_type.startswith("video/"):
+        return settings.UPLOAD_MAX_VIDEO_BYTES
+    return settings.UPLOAD_MAX_OTHER_BYTES
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (limit {limit // (1024 * 1024)} MB)")
+
+@dataclass
+class StoredUpload:
+    url: str
+    sha256: str
+    size: int
+    deduplicated: bool
+    content_type: str
+
+class BlobWriter:
+    """
+    Streams one upload into a temp file inside UPLOAD_DIR, hashing as it
+    goes. `commit` renames it to `<sha256><ext>` (atomic, same filesystem),
+    or drops it if that blob already exists. Disk writes and hashing run in
+    the threadpool, a buffered chunk (UPLOAD_CHUNK_BYTES) at a time, so
+    memory stays at one chunk regardless of file size.
+    """
+
+    def __init__(self, directory: str, extension: str, max_bytes: int, content_type: str = ""):
+        self.directory = directory
+        self.extension = extension
+        self.max_bytes = max_bytes
+        self.content_type = content_type
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer = bytearray()
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        self._buffer += data
+        if len(self._buffer) >= settings.UPLOAD_CHUNK_BYTES:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        chunk, self._buffer = self._buffer, bytearray()
+        if chunk:
+            await run_in_threadpool(self._write_chunk, chunk)
+
+    def _write_chunk(self, chunk: bytearray) -> None:
+        self._sha256.update(chunk)
+        self._file.write(chunk)
+
+    async def commit(self) -> StoredUpload:
+        await self._flush()
+        return await run_in_threadpool(self._store)
+
+    def _store(self) -> StoredUpload:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        return _commit_blob(self.temp_path, self._sha256.hexdigest(), self.size, self.extension, self.content_type)
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+def _commit_blob(temp_path: str, digest: str, size: int, extension: str, content_type: str) -> StoredUpload:
+    """
+    Rename a fully written temp file in UPLOAD_DIR to its content-addressed
+    name, or drop it when that blob already exists. New compressible blobs
+    get their precompressed .br/.gz siblings here.
+    """
+    name = f"{digest}{extension}"
+    path = os.path.join(settings.UPLOAD_DIR, name)
+    deduplicated = os.path.exists(path)
+    if deduplicated:
+        os.unlink(temp_path)
+    else:
+        os.replace(temp_path, path)
+        precompress(path)
+    return StoredUpload(
+        url=f"{settings.UPLOAD_URL_PREFIX}/{name}", sha256=digest, size=size, deduplicated=deduplicated,
+        content_type=content_type,
+    )
+
+def safe_extension(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if _EXTENSION.match(extension) else ""
+
+def store_files(paths: List[str], extension: str, content_type: str) -> StoredUpload:
+    """
+    Turn already received files into one content-addressed blob in UPLOAD_DIR
+    (concatenated in order), hashing on the way. A single source on the same
+    filesystem is hashed and hard-linked rather than copied. The sources are
+    always left in place: the caller removes them once the blob is recorded,
+    so a failed commit can be retried. Blocking: run in the threadpool.
+    """
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    sha256 = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    try:
+        if len(paths) == 1:
+            os.close(fd)
+            with open(paths[0], "rb") as source:
+                while chunk := source.read(settings.UPLOAD_CHUNK_BYTES):
+                    sha256.update(chunk)
+                    size += len(chunk)
+            os.unlink(temp_path)
+            try:
+                os.link(paths[0], temp_path)
+                return _commit_blob(temp_path, sha256.hexdigest(), size, extension, content_type)
+            except OSError: # different filesystem (or no hard links): fall back to copying
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                sha256, size = hashlib.sha256(), 0
+
+        with os.fdopen(fd, "wb") as out:
+            for path in paths:
+                with open(path, "rb") as source:
+                    while chunk := source.read(settings.UPLOAD_CHUNK_BYTES):
+                        sha256.update(chunk)
+                        out.write(chunk)
+                        size += len(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        return _commit_blob(temp_path, sha256.hexdigest(), size, extension, content_type)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _part_info(headers: List[Tuple[bytes, bytes]]) -> Tuple[Optional[str], Optional[str], str]:
+    name = filename = None
+    content_type = ""
+    for field, value in headers:
+        field = field.lower()
+        if field == b"content-disposition":
+            _, options = parse_options_header(value)
+            name = options.get(b"name", b"").decode("latin-1") or None
+            if b"filename" in options:
+                filename = options[b"filename"].decode("utf-8", "replace")
+        elif field == b"content-type":
+            content_type = value.decode("latin-1").lower()
+    if filename and not content_type:
+        content_type = mimetypes.guess_type(filename)[0] or ""
+    return name, filename, content_type
+
+async def store_upload(request: Request, field: str = "file") -> StoredUpload:
+    """
+    Parse a multipart/form-data request body as it arrives and stream its
+    `field` file part to disk. Nothing is buffered beyond one chunk: the
+    request is rejected with 413 up front when Content-Length already exceeds
+    the limit for the part's type, or as soon as the streamed bytes do.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    declared = int(request.headers.get("content-length") or 0)
+    largest = max(settings.UPLOAD_MAX_IMAGE_BYTES, settings.UPLOAD_MAX_VIDEO_BYTES, settings.UPLOAD_MAX_OTHER_BYTES)
+    if declared > largest + FORM_OVERHEAD_BYTES:
+        raise _too_large(largest)
+
+    # The parser calls back synchronously; collect events and act on them between chunks.
+    # One chunk often holds several parts, so each "headers" event carries its own copy.
+    events: List[Tuple[str, Any]] = []
+    header_field = bytearray()
+    header_value = bytearray()
+    headers: List[Tuple[bytes, bytes]] = []
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers.append((bytes(header_field), bytes(header_value)))
+        header_field.clear()
+        header_value.clear()
+
+    parser = MultipartParser(options[b"boundary"], {
+        "on_part_begin": lambda: headers.clear(),
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("headers", list(headers))),
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", b"")),
+    })
+
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    writer: Optional[BlobWriter] = None
+    finished: Optional[BlobWriter] = None
+    receiving = False
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event, data in events:
+                if event == "headers":
+                    name, filename, part_type = _part_info(data)
+                    receiving = name == field and filename is not None and finished is None
+                    if receiving:
+                        limit = max_bytes_for(part_type)
+                        if declared > limit + FORM_OVERHEAD_BYTES:
+                            raise _too_large(limit)
+                        writer = BlobWriter(settings.UPLOAD_DIR, safe_extension(filename), limit, part_type)
+                elif event == "data" and receiving:
+                    await writer.write(data)
+                elif event == "end" and receiving:
+                    finished, receiving = writer, False
+            events.clear()
+        parser.finalize()
+
+        if finished is None:
+            raise HTTPException(status_code=400, detail=f"No file in form field '{field}'")
+        return await finished.commit()
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
@@ -0,0 +1,27 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.table_version import TableVersion
+
+CAMPAIGN = "campaign"
+CAMPAIGN_INDEX = "campaign_index" # id/slug/title/is_active only, not totals (see campaign_registry)
+MEDIA = "media"
+SITE_CONTENT = "sitecontent"
+DASHBOARD = "dashboard" # stats row and donation rollups
+
+def get(db: Session, name: str) -> int:
+    version = db.query(TableVersion.version).filter(TableVersion.name == name).scalar()
+    return version or 0
+
+def bump(db: Session, *names: str) -> None:
+    """
+    Increment the change counter of each table. Called inside the write
+    transaction; the caller commits. An upsert, so the first bump of a name
+    cannot race another transaction into a duplicate key.
+    """
+    for name in names:
+        statement = insert(TableVersion).values(name=name, version=1)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+        ))
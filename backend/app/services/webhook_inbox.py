@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import logging
+import statistics
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import httpx
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.services import donation_service
+from app.services.chapa import ChapaService, chapa_service
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = (WebhookEventStatus.PENDING, WebhookEventStatus.PROCESSING)
+LATENCY_WINDOW = 1000
+
+class WebhookInbox:
+    """
+    Worker pool draining the webhook inbox.
+
+    Workers claim due PENDING events with FOR UPDATE SKIP LOCKED, skipping
+    any event whose transaction still has an earlier open event, so events
+    of one tx_ref are handled strictly in arrival order while different
+    transactions proceed in parallel. A claimed event is leased for
+    WEBHOOK_INBOX_LEASE_SECONDS; failures are retried with exponential
+    backoff and dead-lettered (DEAD) after WEBHOOK_INBOX_MAX_ATTEMPTS.
+    """
+
+    def __init__(
+        self,
+        chapa: ChapaService,
+        session_factory=AsyncSessionLocal,
+        *,
+        workers: int = settings.WEBHOOK_INBOX_WORKERS,
+        batch_size: int = settings.WEBHOOK_INBOX_BATCH_SIZE,
+        max_attempts: int = settings.WEBHOOK_INBOX_MAX_ATTEMPTS,
+        retry_backoff: float = settings.WEBHOOK_INBOX_RETRY_BACKOFF_SECONDS,
+        max_backoff: float = settings.WEBHOOK_INBOX_MAX_BACKOFF_SECONDS,
+        poll_interval: float = settings.WEBHOOK_INBOX_POLL_SECONDS,
+        lease: int = settings.WEBHOOK_INBOX_LEASE_SECONDS,
+    ):
+        self.chapa = chapa
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+        self._tasks: List[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._last_requeue = 0.0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.counters: Dict[str, int] = {"done": 0, "retried": 0, "dead": 0, "requeued": 0}
+        self.handlers = {"CHAPA": self.handle_chapa, "STRIPE": self.handle_stripe}
+
+    # --- inbox -----------------------------------------------------------------
+
+    def record(self, db: Session, provider: str, tx_ref: str, body: bytes, payload: Dict[str, Any]) -> bool:
+        """
+        Store a received webhook. A redelivery of the same body for the same
+        tx_ref is ignored (ON CONFLICT DO NOTHING). Returns True if it was new.
+        The caller commits.
+        """
+        result = db.execute(
+            insert(WebhookEvent)
+            .values(
+                provider=provider,
+                tx_ref=tx_ref,
+                event_hash=hashlib.sha256(body).hexdigest(),
+                payload=payload,
+                status=WebhookEventStatus.PENDING,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(constraint="uq_webhookevent_provider_tx_ref_hash")
+        )
+        return result.rowcount > 0
+
+    # --- handlers -------------------------------------------------------------
+
+    async def handle_chapa(self, event: WebhookEvent) -> None:
+        # Same as process_verification: only "success" events matter, and they are
+        # re-verified against the Chapa API so a forged payload cannot credit anything.
+        if (event.payload.get("status") or "").lower() != "success":
+            return
+        response = await self.chapa.verify_transaction(event.tx_ref)
+        if response.get("status") == "success":
+            async with self.session_factory() as db:
+                if await db.run_sync(donation_service.mark_success, event.tx_ref):
+                    await db.commit()
+
+    async def handle_stripe(self, event: WebhookEvent) -> None:
+        # Only signature-checked payment_intent.succeeded events are stored, so the
+        # intent in the payload is trusted as is: no API round trip.
+        intent = event.payload["data"]["object"]
+        async with self.session_factory() as db:
+            await db.run_sync(donation_service.record_stripe_payment, intent)
+            await db.commit()
+
+    # --- queue operations -----------------------------------------------------
+
+    async def claim(self) -> List[WebhookEvent]:
+        earlier = aliased(WebhookEvent)
+        blocked = select(earlier.id).where(
+            earlier.provider == WebhookEvent.provider,
+            earlier.tx_ref == WebhookEvent.tx_ref,
+            earlier.id < WebhookEvent.id,
+            earlier.status.in_(OPEN_STATUSES),
+        ).exists()
+        due = (
+            select(WebhookEvent.id)
+            .where(
+                WebhookEvent.status == WebhookEventStatus.PENDING,
+                WebhookEvent.next_attempt_at <= func.now(),
+                ~blocked,
+            )
+            .order_by(WebhookEvent.next_attempt_at, WebhookEvent.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as db:
+            ids = (await db.execute(due)).scalars().all()
+            if not ids:
+                return []
+            events = (await db.scalars(
+                update(WebhookEvent)
+                .where(WebhookEvent.id.in_(ids))
+                .values(
+                    status=WebhookEventStatus.PROCESSING,
+                    attempts=WebhookEvent.attempts + 1,
+                    locked_until=func.now() + self.lease,
+                )
+                .returning(WebhookEvent)
+                .execution_options(synchronize_session=False)
+            )).all()
+            await db.commit()
+            return list(events)
+
+    async def requeue_expired(self) -> int:
+        """
+        Release PROCESSING events whose lease ran out (their worker died).
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.status == WebhookEventStatus.PROCESSING, WebhookEvent.locked_until < func.now())
+                .values(
+                    status=case(
+                        (WebhookEvent.attempts >= self.max_attempts, WebhookEventStatus.DEAD),
+                        else_=WebhookEventStatus.PENDING,
+                    ),
+                    locked_until=None,
+                    last_error="lease expired",
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.counters["requeued"] += result.rowcount
+        return result.rowcount
+
+    async def _finish(self, event: WebhookEvent, error: Optional[str] = None, permanent: bool = False) -> None:
+        if error is None:
+            values = dict(status=WebhookEventStatus.DONE, processed_at=func.now(), last_error=None)
+            self.counters["done"] += 1
+            if event.received_at:
+                self._latencies.append((datetime.now(timezone.utc) - event.received_at).total_seconds())
+        elif permanent or event.attempts >= self.max_attempts:
+            values = dict(status=WebhookEventStatus.DEAD, last_error=error)
+            self.counters["dead"] += 1
+            logger.error(f"Webhook event {event.id} ({event.tx_ref}) dead-lettered: {error}")
+        else:
+            delay = min(self.retry_backoff * (2 ** (event.attempts - 1)), self.max_backoff)
+            values = dict(
+                status=WebhookEventStatus.PENDING,
+                next_attempt_at=func.now() + timedelta(seconds=delay),
+                last_error=error,
+            )
+            self.counters["retried"] += 1
+        async with self.session_factory() as db:
+            await db.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == event.id, WebhookEvent.status == WebhookEventStatus.PROCESSING)
+                .values(locked_until=None, **values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def process(self, event: WebhookEvent) -> None:
+        handler = self.handlers.get(event.provider)
+        if handler is None:
+            await self._finish(event, f"no handler for provider {event.provider}", permanent=True)
+            return
+        try:
+            await handler(event)
+        except httpx.HTTPStatusError as e:
+            # 5xx is worth retrying; 4xx (unknown tx_ref, bad request) will not get better
+            await self._finish(event, f"{e.response.status_code}: {e.response.text[:500]}",
+                               permanent=e.response.status_code < 500)
+        except Exception as e:
+            await self._finish(event, f"{type(e).__name__}: {e}")
+        else:
+            await self._finish(event)
+
+    async def drain_once(self) -> int:
+        """
+        Claim one batch and process it. Returns the number of events handled.
+        """
+        if time.monotonic() - self._last_requeue > self.lease.total_seconds() / 2:
+            self._last_requeue = time.monotonic()
+            await self.requeue_expired()
+        events = await self.claim()
+        # A batch never holds two events of one transaction, so it can run concurrently
+        await asyncio.gather(*(self.process(event) for event in events))
+        return len(events)
+
+    # --- worker pool ----------------------------------------------------------
+
+    def notify(self) -> None:
+        """
+        Wake idle workers in this process (called after an event is stored).
+        """
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.drain_once()
+            except Exception as e:
+                logger.exception(f"Webhook inbox worker failed: {e}")
+                handled = 0
+            if not handled:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    def start(self, workers: Optional[int] = None) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(workers or self.workers)]
+
+    async def stop(self) -> None:
+        # In-flight events keep their lease and are retried after it expires
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def backlog(self) -> Dict[str, int]:
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(WebhookEvent.status, func.count())
+                .where(WebhookEvent.status != WebhookEventStatus.DONE)
+                .group_by(WebhookEvent.status)
+            )
+            counts = {status.value: 0 for status in WebhookEventStatus if status != WebhookEventStatus.DONE}
+            counts.update(dict(rows.all()))
+            return counts
+
+    async def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        latency_ms = {}
+        if len(latencies) >= 2:
+            q = statistics.quantiles(latencies, n=100)
+            latency_ms = {"p50": round(q[49] * 1000, 1), "p95": round(q[94] * 1000, 1), "p99": round(q[98] * 1000, 1)}
+        return {
+            "workers": len(self._tasks),
+            "backlog": await self.backlog(),
+            "counters": dict(self.counters),
+            "receive_to_done_ms": latency_ms,
+        }
+
+webhook_inbox = WebhookInbox(chapa_service)
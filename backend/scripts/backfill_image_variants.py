@@ -0,0 +1,45 @@
+"""
+Backfill responsive image variants (app.services.image_service) for existing
+Media rows: every uploaded IMAGE not processed yet, or all of them with
+--force (e.g. after changing IMAGE_VARIANT_WIDTHS / FORMATS).
+
+    python scripts/backfill_image_variants.py --workers 4 --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app.db.session import AsyncSessionLocal
+from app.models.media import Media, MediaType
+from app.services.image_service import ImagePipeline
+
+async def main(args) -> None:
+    query = select(Media.id).where(Media.media_type == MediaType.IMAGE).order_by(Media.created_at, Media.id)
+    if not args.force:
+        query = query.where(Media.variants_processed_at.is_(None))
+    async with AsyncSessionLocal() as db:
+        media_ids = (await db.execute(query)).scalars().all()
+
+    pipeline = ImagePipeline(workers=args.workers)
+    print(f"{len(media_ids)} images, {args.workers} workers, concurrency {args.concurrency or args.workers}")
+    started = time.perf_counter()
+    try:
+        counts = await pipeline.process_many(media_ids, concurrency=args.concurrency)
+    finally:
+        pipeline.shutdown()
+    elapsed = time.perf_counter() - started
+    print(f"{counts} in {elapsed:.1f}s ({len(media_ids) / elapsed if elapsed else 0:.1f} images/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--concurrency", type=int, default=0, help="images in flight (default: one per worker)")
+    parser.add_argument("--force", action="store_true", help="re-render images that already have variants")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main(parser.parse_args()))
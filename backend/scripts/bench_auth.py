@@ -0,0 +1,82 @@
+"""
+Microbenchmark of per-request auth overhead: a route guarded by
+deps.get_current_active_user versus the same route without auth, with the
+token/principal cache disabled (decode + user query on every request) and
+enabled. Requests go through the ASGI stack in-process, so the difference is
+the cost of the auth dependency chain alone.
+
+    python scripts/bench_auth.py --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from app.api import deps
+from app.core import security
+from app.core.auth_cache import auth_cache
+from app.db.session import SessionLocal, engine
+from app.models.user import User
+
+app = FastAPI()
+
+@app.get("/open")
+async def open_route():
+    return {"ok": True}
+
+@app.get("/secured")
+async def secured_route(current_user=Depends(deps.get_current_active_user)):
+    return {"ok": True}
+
+def create_user() -> User:
+    db = SessionLocal()
+    user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.close()
+    return user
+
+def delete_user(user: User) -> None:
+    db = SessionLocal()
+    db.query(User).filter(User.id == user.id).delete()
+    db.commit()
+    db.close()
+
+async def timed(client: httpx.AsyncClient, path: str, headers: dict, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+    return (time.perf_counter() - started) / requests
+
+async def main(args) -> None:
+    engine.echo = False
+    user = create_user()
+    headers = {"Authorization": f"Bearer {security.create_access_token(user.id)}"}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await timed(client, "/secured", headers, 50) # warm up pools
+            baseline = await timed(client, "/open", {}, args.requests)
+            print(f"{'no auth':>14}: {baseline * 1e6:8.1f} us/request")
+            for enabled in (False, True):
+                auth_cache.enabled = enabled
+                auth_cache.clear()
+                per_request = await timed(client, "/secured", headers, args.requests)
+                label = "cache on" if enabled else "cache off"
+                print(f"{label:>14}: {per_request * 1e6:8.1f} us/request  "
+                      f"auth overhead {(per_request - baseline) * 1e6:8.1f} us")
+    finally:
+        delete_user(user)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
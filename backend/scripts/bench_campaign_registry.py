@@ -0,0 +1,144 @@
+"""
+Benchmark campaign lookups by title, slug and id: a query per lookup (what
+the payment and detail paths did) versus the in-process CampaignRegistry,
+over --campaigns throwaway campaigns. Also checks that registry hits run no
+SQL at all, that a repeated unknown slug costs a single query, that a
+campaign created through campaign_service is visible in this process right
+after the commit, and that another worker's registry picks it up after its
+version check interval.
+
+Exits non-zero if a check fails or the registry is less than --min-speedup
+times faster. The seeded rows are deleted afterwards.
+
+    python scripts/bench_campaign_registry.py --campaigns 10000 --lookups 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, event, insert, select
+from app.db.session import SessionLocal, engine
+from app.models.campaign import Campaign
+from app.schemas.campaign import CampaignCreate
+from app.services import campaign_service, stats_service, version_service
+from app.services.campaign_registry import CampaignRegistry, campaign_registry
+
+def seed(db, count: int, run: str) -> list:
+    rows = [
+        {"id": str(uuid.uuid4()), "title": f"Bench campaign {run} {i}", "slug": f"bench-{run}-{i}", "is_active": True}
+        for i in range(count)
+    ]
+    db.execute(insert(Campaign), rows)
+    version_service.bump(db, version_service.CAMPAIGN_INDEX)
+    db.commit()
+    return rows
+
+def per_lookup(label: str, lookups: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(lookups):
+        fn()
+    micros = (time.perf_counter() - started) / lookups * 1e6
+    print(f"  {label:<28} {micros:9.1f} µs/lookup")
+    return micros
+
+def main(args) -> int:
+    engine.echo = False
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    failures = []
+    statements = []
+    created_id = None
+    rows = seed(db, args.campaigns, run)
+    try:
+        registry = CampaignRegistry(check_interval=3600) # no version check inside the timed loop
+        started = time.perf_counter()
+        registry.load(db)
+        print(f"registry load: {registry.stats()['campaigns']} campaigns in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        sample = random.choices(rows, k=args.lookups)
+        picks = iter(sample * 6)
+        by_column = {"title": Campaign.title, "slug": Campaign.slug, "id": Campaign.id}
+        speedups = []
+        for key, lookup in (("title", registry.by_title), ("slug", registry.by_slug), ("id", registry.get)):
+            print(f"by {key}:")
+            query = per_lookup("query per lookup", args.lookups, lambda: db.execute(
+                select(Campaign).where(by_column[key] == next(picks)[key]).limit(1)
+            ).scalars().first())
+            db.expunge_all()
+            counting = lambda *a, **k: statements.append(1)
+            event.listen(engine, "before_cursor_execute", counting)
+            try:
+                hit = per_lookup("registry", args.lookups, lambda: lookup(db, next(picks)[key]))
+            finally:
+                event.remove(engine, "before_cursor_execute", counting)
+            speedups.append(query / hit)
+            for row in random.sample(rows, 20):
+                ref = lookup(db, row[key])
+                if ref is None or ref.id != row["id"]:
+                    failures.append(f"registry by {key} returned {ref} for {row[key]}")
+        if statements:
+            failures.append(f"registry hits ran {len(statements)} SQL statements")
+        print(f"SQL statements during {3 * args.lookups} registry lookups: {len(statements)}")
+
+        # Unknown slugs (a crawler): the first lookup queries, repeats are answered from the miss cache
+        event.listen(engine, "before_cursor_execute", counting)
+        try:
+            for i in range(args.lookups):
+                registry.by_slug(db, f"bench-{run}-missing-{i % 10}")
+        finally:
+            event.remove(engine, "before_cursor_execute", counting)
+        print(f"SQL statements during {args.lookups} lookups of 10 unknown slugs: {len(statements)}")
+        if len(statements) != 10:
+            failures.append(f"unknown slugs ran {len(statements)} SQL statements, expected 10")
+        statements.clear()
+        print(f"speedup: {', '.join(f'{s:.0f}x' for s in speedups)}")
+        if min(speedups) < args.min_speedup:
+            failures.append(f"registry only {min(speedups):.1f}x faster than a query")
+
+        # Writes: this process sees them at once, another worker after its check interval
+        campaign_registry.load(db)
+        other = CampaignRegistry(check_interval=0.5)
+        other.load(db)
+        created = campaign_service.create(db, CampaignCreate(title=f"Bench new {run}"))
+        created_id = created.id
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", counting)
+        try:
+            ref = campaign_registry.by_title(db, created.title)
+        finally:
+            event.remove(engine, "before_cursor_execute", counting)
+        if ref is None or ref.id != created.id:
+            failures.append("campaign_service.create was not visible in this process")
+        if other.stats()["version"] == campaign_registry.stats()["version"]:
+            failures.append("the other worker's registry reloaded before its check interval")
+        time.sleep(0.6)
+        other.refresh(db)
+        if other.stats()["version"] != campaign_registry.stats()["version"] or other.by_slug(db, created.slug) is None:
+            failures.append("the other worker's registry did not reload after its check interval")
+        else:
+            print(f"new campaign: local reload after commit ({len(statements)} statements), other worker after its check interval")
+    finally:
+        db.rollback()
+        ids = [row["id"] for row in rows] + ([created_id] if created_id else [])
+        db.execute(delete(Campaign).where(Campaign.id.in_(ids)))
+        version_service.bump(db, version_service.CAMPAIGN_INDEX)
+        stats_service.rebuild(db)
+        db.commit()
+        db.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    parser.add_argument("--min-speedup", type=float, default=20.0)
+    sys.exit(main(parser.parse_args()))
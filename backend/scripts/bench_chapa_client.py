@@ -0,0 +1,74 @@
+"""
+Benchmark outbound Chapa calls: a new httpx.AsyncClient per call (the old
+behaviour) versus the shared pooled client used by ChapaService.
+Runs against the local stub in scripts/chapa_stub.py, started in-process.
+
+    python scripts/bench_chapa_client.py --calls 2000 --concurrency 50
+    python scripts/bench_chapa_client.py --url https://stub.internal/v1  # e.g. a TLS-terminated stub
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+
+def start_stub(port: int) -> uvicorn.Server:
+    from scripts.chapa_stub import app as stub_app
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+async def per_call(url: str, tx_ref: str) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{url}/transaction/verify/{tx_ref}")
+        response.raise_for_status()
+
+async def run_mode(name: str, call, calls: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(f"tx-bench-{i}")
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{name:>9}: {calls / elapsed:8.1f} calls/s  p50={q[49] * 1000:6.1f}ms  p99={q[98] * 1000:6.1f}ms")
+
+async def main(args) -> None:
+    from app.services.chapa import ChapaService
+    from app.services.http_client import HTTPClient
+
+    pooled = HTTPClient()
+    await pooled.start()
+    service = ChapaService(pooled, base_url=args.url)
+    try:
+        await run_mode("per-call", lambda tx: per_call(args.url, tx), args.calls, args.concurrency)
+        await run_mode("pooled", service.verify_transaction, args.calls, args.concurrency)
+    finally:
+        await pooled.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--url", default=None, help="Chapa base URL; defaults to an in-process stub")
+    args = parser.parse_args()
+    if args.url is None:
+        start_stub(args.port)
+        args.url = f"http://127.0.0.1:{args.port}/v1"
+    asyncio.run(main(args))
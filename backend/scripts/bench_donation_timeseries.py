@@ -0,0 +1,172 @@
+"""
+Benchmark GET /dashboard/timeseries (app.services.rollup_service) as the
+ledger grows: SUCCESS donations spread over the last year across
+--campaigns throwaway campaigns are added in --steps (cumulative row counts)
+with SQL, the rollups are backfilled for the new rows (rebuild since their
+first day), and each query in QUERIES is timed through the rollups and as a
+scan of the donation table. Both must return the same points.
+
+A rollup query reads at most one row per bucket, campaign, currency and
+gateway in its range, so its time grows only until those buckets are all
+populated (hourly ones take longest) and then stays flat, while the scan keeps
+growing with the ledger. Exits non-zero if the results differ, the rollups
+disagree with the ledger, a rollup query at the largest step is more than
+--max-growth times slower than at the smallest, or less than --min-speedup
+times faster than the scan there. Seeded rows are deleted afterwards.
+
+    python scripts/bench_donation_timeseries.py --steps 100000,1000000,2000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, insert, select, text
+from app.db.session import SessionLocal, engine
+from app.models.campaign import Campaign
+from app.models.donation import Donation, DonationStatus
+from app.models.donation_rollup import DonationRollup
+from app.services import rollup_service, stats_service
+
+# (label, days back from now, bucket, filtered to one campaign)
+QUERIES = (
+    ("30 days hourly", 30, "hour", False),
+    ("90 days by 6h", 90, "6h", False),
+    ("1 year daily", 365, "day", False),
+    ("1 year weekly, campaign", 365, "week", True),
+    ("1 year monthly", 365, "month", False),
+)
+
+def seed(db, rows: int, campaign_ids: list, run: str, offset: int) -> None:
+    ids = "ARRAY[" + ",".join(f"'{c}'" for c in campaign_ids) + "]"
+    db.execute(text(f"""
+        INSERT INTO donation (id, campaign_id, donor_name, amount, currency, payment_gateway, transaction_id, status, created_at)
+        SELECT 'bench-{run}-' || g, ({ids})[1 + (g % {len(campaign_ids)})], 'Bench',
+               round((1 + random() * 500)::numeric, 2),
+               CASE WHEN g % 3 = 0 THEN 'USD' ELSE 'ETB' END,
+               CASE WHEN g % 3 = 0 THEN 'STRIPE' ELSE 'CHAPA' END,
+               'tx-bench-{run}-' || g, 'SUCCESS', now() - random() * interval '365 days'
+        FROM generate_series({offset + 1}, {offset + rows}) AS g
+    """))
+    db.commit()
+
+def scan(db, result: dict, bucket: str, campaign_id) -> dict:
+    """
+    The same series computed from the donation table.
+    """
+    width = rollup_service.parse_bucket(bucket)
+    start, end = result["start"], result["end"]
+    if width == "month":
+        bucket_start = func.date_trunc("month", Donation.created_at, "UTC")
+    else:
+        bucket_start = func.date_bin(width, Donation.created_at, start)
+    query = (
+        select(bucket_start, Donation.currency, func.sum(Donation.amount), func.count())
+        .where(Donation.status == DonationStatus.SUCCESS, Donation.created_at >= start, Donation.created_at < end)
+        .group_by(bucket_start, Donation.currency)
+    )
+    if campaign_id:
+        query = query.where(Donation.campaign_id == campaign_id)
+    points = {}
+    for moment, currency, amount, count in db.execute(query):
+        point = points.setdefault(moment.astimezone(timezone.utc), {"raised_usd": 0.0, "raised_etb": 0.0, "donations_count": 0})
+        if currency in ("USD", "ETB"):
+            point[f"raised_{currency.lower()}"] += float(amount)
+        point["donations_count"] += int(count)
+    return points
+
+def same(result: dict, scanned: dict) -> bool:
+    for point in result["points"]:
+        want = scanned.pop(point["bucket_start"], {"raised_usd": 0.0, "raised_etb": 0.0, "donations_count": 0})
+        if point["donations_count"] != want["donations_count"]:
+            return False
+        if any(abs(point[f] - want[f]) > 0.01 for f in ("raised_usd", "raised_etb")):
+            return False
+    return not scanned
+
+def timed(repeat: int, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+def main(args) -> int:
+    engine.echo = False
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    failures = []
+    steps = [int(s) for s in args.steps.split(",")]
+    campaign_ids = [f"bench-{run}-c{i}" for i in range(args.campaigns)]
+    timings = {}
+    try:
+        db.execute(insert(Campaign), [{"id": c, "title": f"Bench {c}", "slug": c, "is_active": True} for c in campaign_ids])
+        db.commit()
+        seeded = 0
+        for target in steps:
+            started = time.perf_counter()
+            seed(db, target - seeded, campaign_ids, run, seeded)
+            seeded = target
+            inserted = time.perf_counter() - started
+            started = time.perf_counter()
+            rollup_service.rebuild(db, since=datetime.now(timezone.utc) - timedelta(days=366))
+            db.commit()
+            # What autovacuum would do next; done here so it does not run during the timings
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("VACUUM ANALYZE donation, donationrollup"))
+            rollups = db.scalar(select(func.count()).select_from(DonationRollup))
+            print(f"ledger {seeded:>9,} donations (+{inserted:.0f}s), rollups backfilled in "
+                  f"{time.perf_counter() - started:.1f}s ({rollups:,} rollup rows):")
+            end = datetime.now(timezone.utc)
+            for label, days, bucket, one_campaign in QUERIES:
+                campaign_id = campaign_ids[0] if one_campaign else None
+                start = end - timedelta(days=days)
+                rollup_ms, result = timed(args.repeat, lambda: rollup_service.timeseries(
+                    db, start, end, bucket, campaign_id=campaign_id,
+                ))
+                scan_ms, scanned = timed(max(1, args.repeat // 3), lambda: scan(db, result, bucket, campaign_id))
+                timings.setdefault(label, []).append((rollup_ms, scan_ms))
+                print(f"  {label:<24} {len(result['points']):>4} buckets  rollups {rollup_ms:8.1f} ms   "
+                      f"donation scan {scan_ms:9.1f} ms")
+                if not same(result, scanned):
+                    failures.append(f"{label} at {seeded} donations: rollups and the donation scan differ")
+                db.rollback()
+
+        for label, series in timings.items():
+            growth = series[-1][0] / series[0][0]
+            if growth > args.max_growth:
+                failures.append(f"{label}: {growth:.1f}x slower at {steps[-1]} than at {steps[0]} donations")
+            speedup = series[-1][1] / series[-1][0]
+            if speedup < args.min_speedup:
+                failures.append(f"{label}: rollups only {speedup:.1f}x faster than the scan at {steps[-1]} donations")
+        mismatches = rollup_service.check(db, since=datetime.now(timezone.utc) - timedelta(days=366))
+        if mismatches:
+            failures.append(f"{len(mismatches)} rollup buckets disagree with the ledger")
+    finally:
+        db.rollback()
+        db.execute(delete(Donation).where(Donation.campaign_id.in_(campaign_ids)))
+        db.execute(delete(Campaign).where(Campaign.id.in_(campaign_ids)))
+        rollup_service.rebuild(db)
+        stats_service.rebuild(db)
+        db.commit()
+        db.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", default="100000,500000,1000000,2000000")
+    parser.add_argument("--campaigns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--max-growth", type=float, default=4.0)
+    parser.add_argument("--min-speedup", type=float, default=3.0)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+Check that the streaming donation export keeps memory flat as the ledger grows.
+Seeds synthetic donations (Postgres, see bench_pagination.py), then exports
+the newest 10k and the full 1M rows in fresh subprocesses and compares peak RSS.
+Exits non-zero if the 1M export peaks more than --tolerance MB above the 10k one.
+
+    python scripts/bench_export_memory.py --rows 1000000
+"""
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def export(rows: int, fmt: str) -> None:
+    from app.services import export_service
+    start = datetime.now(timezone.utc) - timedelta(seconds=rows)
+    total = 0
+    started = time.perf_counter()
+    async for chunk in export_service.gzip_stream(export_service.stream_donations(fmt, start=start)):
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{rows:>9} rows  {total / 1e6:8.1f} MB gzipped  {elapsed:6.1f}s  peak RSS {peak_rss_mb():6.1f} MB")
+
+def child(rows: int, fmt: str) -> float:
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", str(rows), "--format", fmt],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    print(output.strip())
+    return float(output.rsplit("peak RSS", 1)[1].split()[0])
+
+def main(args) -> int:
+    if args.child:
+        from app.db.session import engine
+        engine.echo = False
+        asyncio.run(export(args.child, args.format))
+        return 0
+
+    from app.db.session import SessionLocal, engine
+    from scripts.bench_pagination import seed
+    engine.echo = False
+    db = SessionLocal()
+    try:
+        seed(db, args.rows)
+    finally:
+        db.close()
+
+    small = child(10_000, args.format)
+    large = child(args.rows, args.format)
+    growth = large - small
+    print(f"RSS growth 10k -> {args.rows}: {growth:.1f} MB")
+    return 0 if growth <= args.tolerance else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed peak RSS growth in MB")
+    parser.add_argument("--child", type=int, default=0, help=argparse.SUPPRESS)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Benchmark the image derivative pipeline (app.services.image_service). Writes
+--images synthetic camera-sized JPEGs, renders their variants
+(IMAGE_VARIANT_WIDTHS x IMAGE_VARIANT_FORMATS) with each --workers count and
+reports throughput and the bytes a visitor downloads per variant compared to
+the original. Runs in a temporary UPLOAD_DIR; no database needed.
+
+    python scripts/bench_image_pipeline.py --images 16 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def synthetic_photo(path: str, width: int, height: int, seed: int) -> None:
+    from PIL import Image, ImageFilter
+    # Smooth gradients plus blurred noise compress roughly like a real photo
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width // 4, height // 4), 60 + seed % 40).resize((width, height)).filter(
+        ImageFilter.GaussianBlur(2)
+    )
+    Image.merge("RGB", (gradient, noise, gradient.rotate(90, expand=False))).save(path, "JPEG", quality=90)
+
+async def run(workers: int, paths: list, concurrency: int) -> dict:
+    from app.services.image_service import ImagePipeline
+    pipeline = ImagePipeline(workers=workers)
+    await pipeline.render_blob(paths[0]) # start the worker processes
+    for name in os.listdir(os.path.dirname(paths[0])):
+        if "-" in name:
+            os.unlink(os.path.join(os.path.dirname(paths[0]), name))
+
+    semaphore = asyncio.Semaphore(concurrency or workers)
+    async def one(path):
+        async with semaphore:
+            return await pipeline.render_blob(path)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(path) for path in paths))
+    elapsed = time.perf_counter() - started
+    pipeline.shutdown()
+    return {"elapsed": elapsed, "results": results}
+
+def main(args) -> int:
+    upload_dir = tempfile.mkdtemp(prefix="bench-images-")
+    os.environ["UPLOAD_DIR"] = upload_dir
+    width, height = args.size
+    paths = []
+    for i in range(args.images):
+        path = os.path.join(upload_dir, f"photo{i:03d}.jpg")
+        synthetic_photo(path, width, height, i)
+        paths.append(path)
+    original = sum(os.path.getsize(p) for p in paths) / len(paths)
+    print(f"{args.images} JPEGs {width}x{height}, avg {original / 1e6:.2f} MB, {os.cpu_count()} CPUs")
+
+    results = None
+    for workers in args.workers:
+        outcome = asyncio.run(run(workers, paths, args.concurrency))
+        results = outcome["results"]
+        print(f"  workers={workers}: {args.images / outcome['elapsed']:6.2f} images/s  ({outcome['elapsed']:.1f}s)")
+
+    sizes = defaultdict(list)
+    for result in results:
+        for variant in result["variants"]:
+            name = variant["url"].rsplit("/", 1)[1]
+            sizes[(variant["format"], variant["width"])].append(os.path.getsize(os.path.join(upload_dir, name)))
+    for (fmt, w), values in sorted(sizes.items()):
+        avg = sum(values) / len(values)
+        print(f"  {fmt:>4} {w:>5}w: avg {avg / 1e3:7.1f} KB  ({avg / original:6.1%} of the original)")
+    placeholder = sum(len(r["placeholder"]) for r in results) / len(results)
+    print(f"  placeholder data URI: avg {placeholder:.0f} bytes")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--size", type=int, nargs=2, default=(4000, 3000), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=0, help="images in flight (default: one per worker)")
+    sys.exit(main(parser.parse_args()))
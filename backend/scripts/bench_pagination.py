@@ -0,0 +1,83 @@
+"""
+Benchmark OFFSET vs keyset (cursor) pagination over the donation ledger.
+Seeds the donation table up to --rows synthetic rows (Postgres only, via
+generate_series), then times fetching one page at increasing depths.
+
+    python scripts/bench_pagination.py --rows 1000000 --limit 100
+    python scripts/bench_pagination.py --cleanup   # delete the synthetic rows
+"""
+import argparse
+import sys
+import os
+import time
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import SessionLocal, engine
+from app.models.donation import Donation
+from app.core.pagination import keyset, split_page, encode_cursor
+
+BENCH_PREFIX = "bench-page-"
+
+def seed(db, rows: int) -> None:
+    existing = db.execute(
+        text("SELECT count(*) FROM donation WHERE transaction_id LIKE :p"), {"p": BENCH_PREFIX + "%"}
+    ).scalar()
+    if existing >= rows:
+        return
+    print(f"Seeding {rows - existing} donations...")
+    db.execute(text("""
+        INSERT INTO donation (id, amount, currency, payment_gateway, transaction_id, status, created_at)
+        SELECT md5(random()::text || g), (random() * 100)::numeric(10, 2), 'USD', 'STRIPE',
+               :p || g, 'SUCCESS', now() - (g || ' seconds')::interval
+        FROM generate_series(:start, :stop) AS g
+    """), {"p": BENCH_PREFIX, "start": existing + 1, "stop": rows})
+    db.commit()
+    db.execute(text("ANALYZE donation"))
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main(args) -> None:
+    engine.echo = False
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            db.execute(text("DELETE FROM donation WHERE transaction_id LIKE :p"), {"p": BENCH_PREFIX + "%"})
+            db.commit()
+            return
+        seed(db, args.rows)
+        base = db.query(Donation)
+        print(f"{'depth':>10} {'offset ms':>10} {'keyset ms':>10}")
+        for depth in (0, 1_000, 10_000, 100_000, args.rows // 2, args.rows - args.limit):
+            if depth >= args.rows:
+                continue
+            # Position the cursor at the row just before `depth` (not timed)
+            cursor = ""
+            if depth:
+                anchor = base.order_by(Donation.created_at.desc(), Donation.id.desc()).offset(depth - 1).first()
+                cursor = encode_cursor(anchor.created_at, anchor.id)
+            offset_ms = timed(lambda: base.order_by(
+                Donation.created_at.desc(), Donation.id.desc()
+            ).offset(depth).limit(args.limit).all())
+            keyset_ms = timed(lambda: split_page(keyset(base, Donation, cursor, args.limit).all(), args.limit))
+            print(f"{depth:>10} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--cleanup", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,190 @@
+"""
+Benchmark /search (app.services.search_service) on a --rows corpus of
+generated media descriptions and contact messages (plus a few hundred
+campaigns and site content rows), inserted with SQL and deleted afterwards.
+
+Each query in QUERIES (rare and common words, short prefixes, two-word
+searches) runs --repeat times through the service; p50/p95 latency and the
+hit count are reported. Also checks that search_vector follows ORM writes,
+that prefixes and ranking work (a title match outranks a body match), that
+markup is stripped and matches are <mark>ed and escaped, and that contact
+messages and inactive campaigns stay out of public results.
+
+Then each public query is run with SEARCH_MAX_CANDIDATES=0 (every match
+ranked) to show what the candidate cap costs in quality: the recall is the
+share of that exact top --limit the capped search also returns, counting
+hits of equal rank as the same.
+
+Exits non-zero if a check fails or any capped query's p95 exceeds --max-p95-ms.
+
+    python scripts/bench_search.py --rows 1000000 --repeat 20
+"""
+import argparse
+import collections
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.campaign import Campaign
+from app.models.contact import ContactMessage
+from app.models.media import Media
+from app.models.site_content import SiteContent
+from app.services import search_service, stats_service, version_service
+
+# Frequent words first: the seed picks from the front far more often (Zipf-like)
+VOCABULARY = (
+    "school students class teacher village community children learning books water library "
+    "classroom desks uniforms lunch garden football science laboratory computers internet solar "
+    "teachers parents graduation ceremony reading writing mathematics english amharic music art "
+    "playground well latrine roof windows chalkboard scholarship girls boys volunteers donors "
+    "harvest rainy season road bridge clinic vaccination nutrition breakfast festival choir drama "
+    "chess tournament marathon training workshop carpentry tailoring agriculture coffee honey "
+    "beekeeping irrigation electricity generator printer photocopier textbooks dictionary atlas "
+    "microscope telescope astronomy robotics coding tablets projector bicycle shoes blankets "
+    "mosquito nets soap handwashing hygiene sanitation menstrual pads counselling tutoring "
+    "exam results certificate alumni mentorship ethiopia highlands gondar bahir lalibela axum"
+).split()
+# (label, query): expected to span rare to very common terms
+QUERIES = (
+    ("rare word", "telescope"),
+    ("rare prefix", "astron"),
+    ("common word", "school"),
+    ("common prefix", "te"),
+    ("two words", "solar library"),
+    ("two prefixes", "girl schol"),
+    ("rare + common", "microscope students"),
+    ("no match", "zeppelin"),
+)
+
+def seed(db, rows: int, run: str) -> None:
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in VOCABULARY) + "]"
+    pick = f"({words})[1 + floor(power(random(), 3) * {len(VOCABULARY)})::int]"
+    sentence = lambda n: f"(SELECT string_agg({pick}, ' ') FROM generate_series(1, {n} + (g % 2)))"
+    media_rows = rows * 3 // 5
+    db.execute(text(f"""
+        INSERT INTO media (id, url, media_type, title, description, category, is_featured, created_at, updated_at)
+        SELECT 'bench-{run}-' || g, '/static/bench.jpg', 'IMAGE', {sentence(3)}, {sentence(25)},
+               'GALLERY', false, now(), now()
+        FROM generate_series(1, {media_rows}) AS g
+    """))
+    db.execute(text(f"""
+        INSERT INTO contactmessage (id, name, email, subject, message, is_read, created_at)
+        SELECT 'bench-{run}-' || g, 'Bench', 'bench@example.com', {sentence(4)}, {sentence(60)}, false, now()
+        FROM generate_series(1, {rows - media_rows - 600}) AS g
+    """))
+    db.execute(text(f"""
+        INSERT INTO campaign (id, title, slug, description, is_active, created_at)
+        SELECT 'bench-{run}-' || g, {sentence(4)}, 'bench-{run}-' || g, {sentence(80)}, g % 10 <> 0, now()
+        FROM generate_series(1, 300) AS g
+    """))
+    db.execute(text(f"""
+        INSERT INTO sitecontent (id, section, key, content, content_type, label, updated_at)
+        SELECT 'bench-{run}-' || g, 'BENCH', 'bench_{run}_' || g, {sentence(40)}, 'TEXT', {sentence(3)}, now()
+        FROM generate_series(1, 300) AS g
+    """))
+    version_service.bump(db, version_service.CAMPAIGN_INDEX)
+    db.commit()
+
+def checks(db, run: str) -> list:
+    failures = []
+    marker = f"zz{run}"
+    db.add(Media(id=f"bench-{run}-title", url="/static/x.jpg", title=f"{marker} solar panels", description="On the roof"))
+    db.add(Media(id=f"bench-{run}-body", url="/static/x.jpg", title="Roof",
+                 description=f"<p>New <b>{marker}</b> panels & wiring</p>"))
+    db.add(ContactMessage(id=f"bench-{run}-msg", name="A", email="a@example.com", subject="Hi", message=f"About {marker}"))
+    db.add(Campaign(id=f"bench-{run}-off", title=f"{marker} closed", slug=f"bench-{run}-off", is_active=False))
+    db.commit()
+
+    hits = search_service.search(db, marker[:-2])
+    ids = [hit["id"] for hit in hits]
+    if ids[:2] != [f"bench-{run}-title", f"bench-{run}-body"]:
+        failures.append(f"prefix search / title-over-body ranking: {ids}")
+    body = next((hit for hit in hits if hit["id"] == f"bench-{run}-body"), None)
+    if not body or f"<mark>{marker}</mark> panels &amp; wiring" not in body["highlight"] or "<b>" in body["highlight"]:
+        failures.append(f"highlight: {body and body['highlight']}")
+    if {f"bench-{run}-msg", f"bench-{run}-off"} & set(ids):
+        failures.append("contact messages or inactive campaigns in public results")
+    admin = {hit["id"] for hit in search_service.search(db, marker, list(search_service.SOURCES), public=False)}
+    if not {f"bench-{run}-msg", f"bench-{run}-off"} <= admin:
+        failures.append(f"admin search misses contact messages or inactive campaigns: {admin}")
+
+    media = db.get(Media, f"bench-{run}-title")
+    media.title = "Renamed"
+    db.commit()
+    if f"bench-{run}-title" in {hit["id"] for hit in search_service.search(db, f"{marker} solar")}:
+        failures.append("search_vector did not follow an update")
+    if search_service.search(db, "a & | ! ( :*") != []:
+        failures.append("operators in the input were not ignored")
+    return failures
+
+def main(args) -> int:
+    engine.echo = False
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    failures = []
+    try:
+        started = time.perf_counter()
+        seed(db, args.rows, run)
+        db.execute(text("ANALYZE media, contactmessage, campaign, sitecontent"))
+        db.commit()
+        print(f"seeded {args.rows} rows in {time.perf_counter() - started:.0f}s")
+        failures += checks(db, run)
+
+        for scope, public, types in (("public", True, search_service.PUBLIC_TYPES), ("admin", False, tuple(search_service.SOURCES))):
+            print(f"{scope} search ({', '.join(types)}), {args.repeat} runs each:")
+            for label, q in QUERIES:
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    hits = search_service.search(db, q, types, limit=args.limit, public=public)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    db.rollback()
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                print(f"  {label:<14} {q!r:<22} p50 {statistics.median(timings):7.1f} ms  p95 {p95:7.1f} ms  {len(hits)} hits")
+                if p95 > args.max_p95_ms:
+                    failures.append(f"{scope} {label} p95 {p95:.0f} ms > {args.max_p95_ms:.0f} ms")
+
+        print(f"public search, SEARCH_MAX_CANDIDATES={settings.SEARCH_MAX_CANDIDATES} vs every match ranked:")
+        for label, q in QUERIES:
+            capped = search_service.search(db, q, limit=args.limit)
+            cap, settings.SEARCH_MAX_CANDIDATES = settings.SEARCH_MAX_CANDIDATES, 0
+            try:
+                started = time.perf_counter()
+                exact = search_service.search(db, q, limit=args.limit)
+                exact_ms = (time.perf_counter() - started) * 1000
+            finally:
+                settings.SEARCH_MAX_CANDIDATES = cap
+            db.rollback()
+            ranks = lambda hits: collections.Counter(round(hit["rank"], 4) for hit in hits)
+            recall = sum((ranks(capped) & ranks(exact)).values()) / len(exact) if exact else 1.0
+            print(f"  {label:<14} {q!r:<22} exact {exact_ms:7.1f} ms  recall {recall:4.0%}  "
+                  f"best rank {exact[0]['rank'] if exact else 0:.2f} exact, {capped[0]['rank'] if capped else 0:.2f} capped")
+    finally:
+        db.rollback()
+        prefix = f"bench-{run}-%"
+        for model in (Media, ContactMessage, Campaign, SiteContent):
+            db.execute(delete(model).where(model.id.like(prefix)))
+        version_service.bump(db, version_service.CAMPAIGN_INDEX)
+        stats_service.rebuild(db)
+        db.commit()
+        db.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-p95-ms", type=float, default=150.0)
+    parser.add_argument("--limit", type=int, default=20)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,70 @@
+"""
+Compare the old per-key site content save (get_by_key + update, one commit
+per key) with CRUDSiteContent.bulk_update (one IN query, one executemany,
+one commit). Seeds throwaway rows in a BENCH section and removes them after.
+
+    python scripts/bench_site_content_bulk.py --sizes 50 500
+"""
+import argparse
+import sys
+import os
+import time
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal, engine
+from app.crud.crud_site_content import site_content
+from app.models.site_content import SiteContent
+from app.schemas.site_content import SiteContentCreate, SiteContentUpdate
+
+counters = {"commits": 0, "statements": 0}
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session):
+    counters["commits"] += 1
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counters["statements"] += 1
+
+def legacy_save(db, updates):
+    for key, value in updates.items():
+        item = site_content.get_by_key(db, key=key)
+        if item:
+            site_content.update(db, db_obj=item, obj_in=SiteContentUpdate(content=value))
+
+def bulk_save(db, updates):
+    site_content.bulk_update(db, updates=updates)
+
+def measure(name, fn, db, updates):
+    counters.update(commits=0, statements=0)
+    start = time.perf_counter()
+    fn(db, updates)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:>6}: {elapsed * 1000:8.1f}ms  commits={counters['commits']:4d}  statements={counters['statements']:5d}")
+
+def main(sizes):
+    engine.echo = False
+    db = SessionLocal()
+    try:
+        for size in sizes:
+            keys = [f"bench_key_{i}" for i in range(size)]
+            site_content.bulk_create(db, objs_in=[SiteContentCreate(section="BENCH", key=k, content="v0") for k in keys])
+            print(f"{size} keys:")
+            measure("legacy", legacy_save, db, {k: "v1" for k in keys})
+            measure("bulk", bulk_save, db, {k: "v2" for k in keys})
+            db.query(SiteContent).filter(SiteContent.section == "BENCH").delete(synchronize_session=False)
+            db.commit()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    main(parser.parse_args().sizes)
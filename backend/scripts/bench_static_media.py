@@ -0,0 +1,220 @@
+"""
+Check and benchmark /static delivery (app.core.static_media) on a throwaway
+static directory holding a content-addressed --video-mb MB "video" and a
+compressible SVG:
+
+  - content-addressed names are sent with `immutable` caching, others revalidate;
+  - byte ranges: open, closed and suffix ranges give 206 with the right bytes,
+    unsatisfiable ones 416, a stale If-Range the whole file;
+  - the SVG's precompressed .gz sibling is served to gzip clients (and decodes
+    to the original), the plain file to others, with Vary: Accept-Encoding;
+  - MEDIA_DELIVERY=accel answers with an X-Accel-Redirect header and no body.
+
+Then a uvicorn worker is started for each mode and --clients concurrent clients
+fetch the video whole and as 1 MB seek ranges for --seconds; requests/s and the
+worker's CPU seconds per request are reported. In accel mode the bytes would be
+streamed by the proxy, which is not part of this run: the numbers are the
+worker's share. Exits non-zero if a check fails or accel serves fewer than
+--min-speedup times the full downloads per second.
+
+    python scripts/bench_static_media.py --video-mb 64 --clients 16 --seconds 5
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SVG = "<svg xmlns='http://www.w3.org/2000/svg'>" + "".join(
+    f"<rect x='{i}' y='{i}' width='10' height='10' fill='#336699'/>" for i in range(400)
+) + "</svg>"
+
+def build_app():
+    """
+    uvicorn factory for the benchmark worker (BENCH_STATIC_DIR, BENCH_DELIVERY).
+    """
+    from starlette.applications import Starlette
+    from app.core.static_media import MediaFiles
+    app = Starlette()
+    app.mount("/static", MediaFiles(directory=os.environ["BENCH_STATIC_DIR"], delivery=os.environ["BENCH_DELIVERY"]))
+    return app
+
+def make_tree(root: str, video_mb: int) -> dict:
+    from app.core.static_media import precompress
+    uploads = os.path.join(root, "uploads")
+    os.makedirs(uploads)
+    video = os.urandom(1024 * 1024) * video_mb
+    names = {"video": f"{hashlib.sha256(video).hexdigest()}.mp4", "svg": f"{hashlib.sha256(SVG.encode()).hexdigest()}.svg"}
+    with open(os.path.join(uploads, names["video"]), "wb") as out:
+        out.write(video)
+    with open(os.path.join(uploads, names["svg"]), "w") as out:
+        out.write(SVG)
+    with open(os.path.join(uploads, "logo.svg"), "w") as out:
+        out.write(SVG)
+    written = precompress(os.path.join(uploads, names["svg"]))
+    return {**names, "video_bytes": video, "precompressed": written}
+
+async def check(root: str, tree: dict) -> list:
+    import httpx
+    from starlette.applications import Starlette
+    from app.core.static_media import MediaFiles
+
+    failures = []
+    video_url = f"/static/uploads/{tree['video']}"
+    svg_url = f"/static/uploads/{tree['svg']}"
+    video = tree["video_bytes"]
+    size = len(video)
+    for delivery in ("app", "accel"):
+        app = Starlette()
+        app.mount("/static", MediaFiles(directory=root, delivery=delivery))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+            def expect(label, condition):
+                if not condition:
+                    failures.append(f"{delivery}: {label}")
+
+            response = await client.get(video_url)
+            expect("immutable Cache-Control on a hashed name", "immutable" in response.headers.get("cache-control", ""))
+            response = await client.get("/static/uploads/logo.svg")
+            expect("revalidation for a plain name", "must-revalidate" in response.headers.get("cache-control", ""))
+            response = await client.get("/static/uploads/missing.mp4")
+            expect("404 for a missing file", response.status_code == 404)
+
+            if delivery == "accel":
+                response = await client.get(video_url, headers={"Range": "bytes=0-99"})
+                expect("X-Accel-Redirect handoff", response.headers.get("x-accel-redirect") == f"/_media/uploads/{tree['video']}")
+                expect("no body with the handoff", response.content == b"")
+                expect("content type with the handoff", response.headers.get("content-type") == "video/mp4")
+                continue
+
+            response = await client.get(video_url)
+            expect("whole file", response.status_code == 200 and response.content == video)
+            expect("Accept-Ranges", response.headers.get("accept-ranges") == "bytes")
+            etag = response.headers["etag"]
+            for header, first, last in (
+                ("bytes=0-99", 0, 99), ("bytes=1048576-", 1048576, size - 1),
+                ("bytes=-500", size - 500, size - 1), (f"bytes={size - 10}-{size + 100}", size - 10, size - 1),
+            ):
+                response = await client.get(video_url, headers={"Range": header})
+                expect(f"206 for {header}", response.status_code == 206 and response.content == video[first:last + 1]
+                       and response.headers.get("content-range") == f"bytes {first}-{last}/{size}")
+            response = await client.get(video_url, headers={"Range": f"bytes={size}-"})
+            expect("416 past the end", response.status_code == 416 and response.headers.get("content-range") == f"bytes */{size}")
+            response = await client.get(video_url, headers={"Range": "bytes=0-99", "If-Range": etag})
+            expect("206 for a current If-Range", response.status_code == 206)
+            response = await client.get(video_url, headers={"Range": "bytes=0-99", "If-Range": '"stale"'})
+            expect("whole file for a stale If-Range", response.status_code == 200 and len(response.content) == size)
+            response = await client.get(video_url, headers={"If-None-Match": etag})
+            expect("304 for a current ETag", response.status_code == 304)
+
+            response = await client.get(svg_url, headers={"Accept-Encoding": "gzip"})
+            expect("precompressed .gz sibling", ".gz" in tree["precompressed"] and response.headers.get("content-encoding") == "gzip"
+                   and response.headers.get("content-type", "").startswith("image/svg+xml"))
+            # httpx decodes Content-Encoding itself
+            expect("sibling decodes to the original", response.content == SVG.encode())
+            expect("Vary: Accept-Encoding", response.headers.get("vary") == "Accept-Encoding")
+            response = await client.get(svg_url, headers={"Accept-Encoding": "identity"})
+            expect("plain file without gzip", "content-encoding" not in response.headers and response.content == SVG.encode())
+            print(f"checks ({delivery}): svg {len(SVG)} B, .gz {len(gzip.compress(SVG.encode(), 9, mtime=0))} B")
+    return failures
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def cpu_seconds(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/stat") as stat_file:
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return float("nan")
+
+async def load(port: int, path: str, clients: int, seconds: float, size: int, ranged: bool) -> int:
+    import httpx
+    done = 0
+    deadline = time.perf_counter() + seconds
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60,
+                                 limits=httpx.Limits(max_connections=clients)) as client:
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                headers = {}
+                if ranged:
+                    first = random.randrange(0, size - 1024 * 1024)
+                    headers["Range"] = f"bytes={first}-{first + 1024 * 1024 - 1}"
+                async with client.stream("GET", path, headers=headers) as response:
+                    async for _ in response.aiter_raw():
+                        pass
+                    if response.status_code not in (200, 206):
+                        raise RuntimeError(f"{path}: {response.status_code}")
+                done += 1
+        await asyncio.gather(*(worker() for _ in range(clients)))
+    return done
+
+def bench(root: str, tree: dict, args) -> dict:
+    results = {}
+    size = len(tree["video_bytes"])
+    for delivery in ("app", "accel"):
+        port = free_port()
+        env = {**os.environ, "BENCH_STATIC_DIR": root, "BENCH_DELIVERY": delivery}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "--factory", "scripts.bench_static_media:build_app",
+             "--port", str(port), "--log-level", "warning", "--no-access-log"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env,
+        )
+        try:
+            while True:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                    break
+                except OSError:
+                    if server.poll() is not None:
+                        raise RuntimeError("benchmark worker did not start")
+                    time.sleep(0.1)
+            for label, ranged in (("whole video", False), ("1 MB seeks", True)):
+                cpu = cpu_seconds(server.pid)
+                requests = asyncio.run(load(port, f"/static/uploads/{tree['video']}", args.clients, args.seconds, size, ranged))
+                cpu = cpu_seconds(server.pid) - cpu
+                results[(delivery, label)] = requests / args.seconds
+                print(f"  {delivery:<6} {label:<12} {requests / args.seconds:9.1f} req/s   "
+                      f"worker CPU {cpu / max(requests, 1) * 1000:8.2f} ms/request")
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+def main(args) -> int:
+    root = tempfile.mkdtemp(prefix="bench-static-")
+    try:
+        tree = make_tree(root, args.video_mb)
+        failures = asyncio.run(check(root, tree))
+        print(f"{args.clients} clients, {args.seconds:.0f}s per run, {args.video_mb} MB video:")
+        results = bench(root, tree, args)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    speedup = results[("accel", "whole video")] / max(results[("app", "whole video")], 1e-9)
+    print(f"full downloads: accel handoff {speedup:.0f}x the app worker's requests/s")
+    if speedup < args.min_speedup:
+        failures.append(f"accel only {speedup:.1f}x the app mode's full downloads per second")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-mb", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--min-speedup", type=float, default=10.0)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,164 @@
+"""
+Check that media uploads stream to disk with flat memory. Uploads a 10 MB
+and a --size-mb file through POST /api/v1/media/upload (in-process ASGI, the
+request body generated chunk by chunk) in fresh subprocesses and compares
+peak RSS. Each child also checks the returned SHA-256, that re-uploading the
+same bytes is deduplicated, that an oversized Content-Length is rejected
+before the body is read, and that an oversized chunked upload is cut off
+mid-stream without leaving a temp file behind, and that a small form whose
+parts all arrive in one chunk stores the file part whether it comes before
+or after the other fields.
+Exits non-zero if any check fails or the large upload peaks more than
+--tolerance MB above the small one.
+
+    python scripts/bench_upload_memory.py --size-mb 1024
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BOUNDARY = "bench-upload-boundary"
+BLOCK = os.urandom(1024 * 1024)
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class MultipartBody:
+    """
+    A multipart/form-data body with one `file` part of `size_mb` MB,
+    generated lazily (the last byte varies with `salt`).
+    """
+
+    def __init__(self, size_mb: int, filename: str, content_type: str, salt: int = 0):
+        self.size_mb = size_mb
+        self.salt = salt
+        self.head = (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self.tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+        self.sha256 = hashlib.sha256()
+        self.sent = 0
+
+    def __len__(self) -> int:
+        return len(self.head) + self.size_mb * len(BLOCK) + len(self.tail)
+
+    async def __aiter__(self):
+        yield self.head
+        for i in range(self.size_mb):
+            block = BLOCK if i < self.size_mb - 1 else BLOCK[:-1] + bytes([self.salt % 256])
+            self.sha256.update(block)
+            self.sent += len(block)
+            yield block
+        yield self.tail
+
+async def upload(client, body: MultipartBody, declare_length: bool = True):
+    headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if declare_length:
+        headers["Content-Length"] = str(len(body))
+    return await client.post("/api/v1/media/upload", content=body, headers=headers)
+
+def small_form(file_first: bool) -> tuple:
+    """
+    A whole multipart body (one chunk) with a `title` field and a small `file` part.
+    """
+    data = os.urandom(4096)
+    title = f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="title"\r\n\r\nNot the file\r\n'.encode()
+    file = (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="clip.mp4"\r\n'
+        f"Content-Type: video/mp4\r\n\r\n"
+    ).encode() + data + b"\r\n"
+    parts = file + title if file_first else title + file
+    return parts + f"--{BOUNDARY}--\r\n".encode(), hashlib.sha256(data).hexdigest()
+
+async def run_child(size_mb: int) -> list:
+    import httpx
+    from app.api.deps import get_current_active_user
+    from app.core.auth_cache import Principal
+    from app.core.config import settings
+    from app.main import app
+
+    app.dependency_overrides[get_current_active_user] = lambda: Principal("bench", "bench@example.com", True, True)
+    failures = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        body = MultipartBody(size_mb, "clip.mp4", "video/mp4", salt=size_mb)
+        started = time.perf_counter()
+        response = await upload(client, body)
+        elapsed = time.perf_counter() - started
+        stored = response.json()
+        if response.status_code != 200 or stored.get("sha256") != body.sha256.hexdigest():
+            failures.append(f"upload returned {response.status_code} {stored}")
+        else:
+            print(f"{size_mb:>6} MB  {size_mb / elapsed:7.1f} MB/s  peak RSS {peak_rss_mb():6.1f} MB")
+
+        again = await upload(client, MultipartBody(size_mb, "clip.mp4", "video/mp4", salt=size_mb))
+        if not again.json().get("deduplicated") or again.json().get("url") != stored.get("url"):
+            failures.append("identical re-upload was not deduplicated")
+
+        for file_first in (True, False):
+            form, digest = small_form(file_first)
+            response = await client.post("/api/v1/media/upload", content=form, headers={
+                "Content-Type": f"multipart/form-data; boundary={BOUNDARY}",
+            })
+            if response.status_code != 200 or response.json().get("sha256") != digest:
+                failures.append(f"form with the file {'first' if file_first else 'last'}: {response.status_code} {response.text}")
+
+        # Declared size over the image limit: rejected before the file bytes are read
+        image_mb = settings.UPLOAD_MAX_IMAGE_BYTES // len(BLOCK) + 1
+        early = MultipartBody(image_mb, "photo.jpg", "image/jpeg")
+        response = await upload(client, early)
+        if response.status_code != 413 or early.sent > 2 * len(BLOCK):
+            failures.append(f"oversized image: {response.status_code} after {early.sent} bytes")
+
+        # No Content-Length (chunked): cut off once the streamed bytes pass the limit
+        chunked = MultipartBody(image_mb, "photo.jpg", "image/jpeg")
+        response = await upload(client, chunked, declare_length=False)
+        if response.status_code != 413 or chunked.sent > settings.UPLOAD_MAX_IMAGE_BYTES + 2 * len(BLOCK):
+            failures.append(f"oversized chunked image: {response.status_code} after {chunked.sent} bytes")
+
+    leftovers = [name for name in os.listdir(settings.UPLOAD_DIR) if name.endswith(".part")]
+    if leftovers:
+        failures.append(f"temp files left behind: {leftovers}")
+    return failures
+
+def child(size_mb: int, upload_dir: str) -> float:
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", str(size_mb)],
+        capture_output=True, text=True, env={**os.environ, "UPLOAD_DIR": upload_dir},
+    )
+    print(result.stdout.strip())
+    if result.returncode != 0:
+        print(result.stderr.strip()[-2000:])
+        raise SystemExit(1)
+    return float(result.stdout.rsplit("peak RSS", 1)[1].split()[0])
+
+def main(args) -> int:
+    if args.child:
+        failures = asyncio.run(run_child(args.child))
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1 if failures else 0
+
+    with tempfile.TemporaryDirectory(prefix="bench-uploads-") as upload_dir:
+        small = child(10, upload_dir)
+        large = child(args.size_mb, upload_dir)
+    growth = large - small
+    print(f"RSS growth 10 MB -> {args.size_mb} MB: {growth:.1f} MB")
+    return 0 if growth <= args.tolerance else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed peak RSS growth in MB")
+    parser.add_argument("--child", type=int, default=0, help=argparse.SUPPRESS)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Local stand-in for the Chapa API, for benchmarks and worker tests.
+
+    uvicorn scripts.chapa_stub:app --port 8900
+    CHAPA_BASE_URL=http://127.0.0.1:8900/v1 uvicorn app.main:app
+
+Knobs (environment variables):
+    STUB_LATENCY_MS   artificial processing delay per call (default 0)
+    STUB_ERROR_RATE   fraction of calls answered with a 502 (default 0)
+    STUB_TX_STATUS    payment status reported by verify (default "success");
+                      a tx_ref containing "failed"/"pending" overrides it
+"""
+import asyncio
+import os
+import random
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("STUB_LATENCY_MS", "0")) / 1000.0
+ERROR_RATE = float(os.getenv("STUB_ERROR_RATE", "0"))
+TX_STATUS = os.getenv("STUB_TX_STATUS", "success")
+
+app = FastAPI(title="Chapa stub")
+app.state.calls = 0
+
+async def _simulate():
+    app.state.calls += 1
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        return JSONResponse({"message": "stub upstream error", "status": "failed"}, status_code=502)
+    return None
+
+def _tx_status(tx_ref: str) -> str:
+    for status in ("failed", "pending"):
+        if status in tx_ref:
+            return status
+    return TX_STATUS
+
+@app.post("/v1/transaction/initialize")
+async def initialize(request: Request):
+    error = await _simulate()
+    if error:
+        return error
+    payload = await request.json()
+    return {
+        "message": "Hosted Link",
+        "status": "success",
+        "data": {"checkout_url": f"https://checkout.chapa.test/{payload.get('tx_ref')}"},
+    }
+
+@app.get("/v1/transaction/verify/{tx_ref}")
+async def verify(tx_ref: str):
+    error = await _simulate()
+    if error:
+        return error
+    status = _tx_status(tx_ref)
+    if status == "failed":
+        return JSONResponse({"message": "Payment failed", "status": "failed", "data": None}, status_code=400)
+    return {
+        "message": "Payment details",
+        "status": "success" if status == "success" else "pending",
+        "data": {"tx_ref": tx_ref, "status": status, "currency": "ETB", "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ")},
+    }
+
+@app.get("/stats")
+async def stats():
+    return {"calls": app.state.calls}
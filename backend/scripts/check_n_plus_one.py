@@ -0,0 +1,115 @@
+"""
+Checks the list endpoints for N+1 query patterns using the query profiler
+(app.core.query_profiler). Seeds a few campaigns with donations, calls every
+list endpoint in-process with the profiler enabled and fails if any response
+carries X-DB-N-Plus-One or runs more than --max-queries statements. A lazy
+load in a loop is profiled first to show the detector actually fires.
+
+    python scripts/check_n_plus_one.py --donations 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must happen before the app modules read their settings
+os.environ["DB_PROFILER_ENABLED"] = "true"
+
+CHECK_PREFIX = "n1-check-"
+CAMPAIGNS = 10
+
+ENDPOINTS = [
+    "/api/v1/campaigns/",
+    "/api/v1/campaigns/?cursor=",
+    "/api/v1/donate/",
+    "/api/v1/donate/?cursor=",
+    "/api/v1/media/",
+    "/api/v1/contact/",
+    "/api/v1/site-content/",
+    "/api/v1/site-content/bundle",
+    "/api/v1/dashboard/stats",
+]
+
+def seed(donations: int) -> list:
+    from app.db.session import SessionLocal
+    from app.models.campaign import Campaign
+    from app.models.donation import Donation, DonationStatus
+
+    db = SessionLocal()
+    campaign_ids = []
+    for i in range(CAMPAIGNS):
+        campaign = Campaign(title=f"N+1 check {i}", slug=f"{CHECK_PREFIX}{uuid.uuid4().hex[:8]}")
+        db.add(campaign)
+        db.flush()
+        campaign_ids.append(campaign.id)
+    for i in range(donations):
+        db.add(Donation(
+            campaign_id=campaign_ids[i % len(campaign_ids)], amount=10, currency="USD", payment_gateway="STRIPE",
+            transaction_id=f"{CHECK_PREFIX}{uuid.uuid4().hex}", status=DonationStatus.SUCCESS,
+        ))
+    db.commit()
+    db.close()
+    return campaign_ids
+
+def cleanup(campaign_ids: list) -> None:
+    from app.db.session import SessionLocal
+    from app.models.campaign import Campaign
+    from app.models.donation import Donation
+
+    db = SessionLocal()
+    db.query(Donation).filter(Donation.transaction_id.like(CHECK_PREFIX + "%")).delete(synchronize_session=False)
+    db.query(Campaign).filter(Campaign.id.in_(campaign_ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+def detector_fires() -> bool:
+    from app.core.query_profiler import query_profiler
+    from app.db.session import SessionLocal
+    from app.models.donation import Donation
+
+    db = SessionLocal()
+    with query_profiler.profile() as profile:
+        for donation in db.query(Donation).filter(Donation.transaction_id.like(CHECK_PREFIX + "%")).all():
+            donation.campaign # lazy load per row
+    db.close()
+    return bool(profile.n_plus_one(query_profiler.n_plus_one_threshold))
+
+async def main(args) -> int:
+    import httpx
+    from app.core.query_profiler import query_profiler
+    from app.main import app
+
+    campaign_ids = seed(args.donations)
+    failures = []
+    try:
+        # One lazy load per distinct campaign (the identity map serves repeats)
+        if not detector_fires():
+            failures.append("the profiler did not flag a lazy load in a loop")
+        query_profiler.reset()
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+            for path in ENDPOINTS:
+                response = await client.get(path)
+                queries = int(response.headers.get("X-DB-Query-Count", -1))
+                print(f"{response.status_code} {path:<32} {queries:>3} queries  {response.headers.get('X-DB-Time-Ms')}ms")
+                if "X-DB-N-Plus-One" in response.headers:
+                    failures.append(f"{path}: N+1 pattern")
+                if queries > args.max_queries:
+                    failures.append(f"{path}: {queries} queries")
+        for endpoint, stats in query_profiler.stats()["endpoints"].items():
+            for suspect in stats["n_plus_one"]:
+                print(f"  {endpoint}: {suspect['count']}x {suspect['statement'][:120]}")
+    finally:
+        cleanup(campaign_ids)
+
+    print("FAIL: " + "; ".join(failures) if failures else "ok")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--donations", type=int, default=50)
+    parser.add_argument("--max-queries", type=int, default=10)
+    sys.exit(asyncio.run(main(parser.parse_args())))
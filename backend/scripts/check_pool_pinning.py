@@ -0,0 +1,89 @@
+"""
+Checks that requests only hold a pooled DB connection while they actually
+use the database. Runs the API in-process against the Chapa stub with a slow
+verify/initialize (STUB_LATENCY_MS), fires more concurrent Chapa initialize +
+verify requests than the pool has connections, and reads the pool
+instrumentation (app.db.pool). Fails if any checkout was held for as long as
+the outbound call, if a checkout timed out, if a request rejected by
+validation checked out a connection, or if a response cache hit needed more
+than its single version lookup.
+
+    python scripts/check_pool_pinning.py --requests 100 --latency-ms 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STUB_PORT = 8914
+
+def configure(latency_ms: int) -> None:
+    # Must happen before the stub / app modules read their settings
+    os.environ["STUB_LATENCY_MS"] = str(latency_ms)
+    os.environ["CHAPA_BASE_URL"] = f"http://127.0.0.1:{STUB_PORT}/v1"
+
+async def main(args) -> int:
+    import httpx
+    from app.db.session import async_engine, engine, pool_status
+    from app.main import app
+    from app.services.http_client import http_client
+    from scripts.bench_chapa_client import start_stub
+
+    engine.echo = False
+    start_stub(STUB_PORT)
+    await http_client.start()
+    pool = async_engine.sync_engine.pool
+    failures = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check", timeout=120) as client:
+        # 1. Requests that fail validation never touch the pool; a response cache hit
+        # costs exactly one short checkout (the table version lookup behind its ETag)
+        before = pool_status()
+        await client.post("/api/v1/donate/chapa/initialize", json={"amount": "not a number"}) # 422
+        after = pool_status()
+        if after["async"]["checkouts"] != before["async"]["checkouts"]:
+            failures.append("a request rejected by validation checked out a connection")
+        await client.get("/api/v1/campaigns/") # warm the response cache
+        before = pool_status()
+        await client.get("/api/v1/campaigns/") # cache hit
+        after = pool_status()
+        if after["sync"]["checkouts"] - before["sync"]["checkouts"] > 1:
+            failures.append("a response cache hit checked out more than one connection")
+
+        # 2. Slow outbound Chapa calls with more requests in flight than pooled connections
+        async def initialize_and_verify(i: int) -> None:
+            response = await client.post("/api/v1/donate/chapa/initialize", json={
+                "amount": 100, "email": f"pool-{i}@example.com", "first_name": "Pool", "last_name": "Check",
+            })
+            response.raise_for_status()
+            response = await client.get(f"/api/v1/donate/chapa/verify/{response.json()['tx_ref']}")
+            response.raise_for_status()
+
+        capacity = pool.size() + max(0, pool._max_overflow)
+        print(f"{args.requests} concurrent initialize+verify, Chapa latency {args.latency_ms}ms, pool capacity {capacity}")
+        results = await asyncio.gather(*(initialize_and_verify(i) for i in range(args.requests)), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            failures.append(f"{len(errors)} requests failed, e.g. {errors[0]!r}")
+
+    await http_client.close()
+    report = pool_status()["async"]
+    print(f"async pool: {report}")
+    hold_max = report["hold"].get("max_ms", 0)
+    if hold_max >= args.latency_ms:
+        failures.append(f"a connection was held {hold_max}ms, across an outbound call")
+    if report["timeouts"]:
+        failures.append(f"{report['timeouts']} checkouts timed out")
+
+    print("FAIL: " + "; ".join(failures) if failures else "ok")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=2000)
+    args = parser.parse_args()
+    configure(args.latency_ms)
+    sys.exit(asyncio.run(main(args)))
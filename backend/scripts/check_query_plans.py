@@ -0,0 +1,142 @@
+"""
+EXPLAIN-based regression check for the hot query paths: seeds a synthetic
+dataset, runs EXPLAIN on each hot query exactly as the app builds it and
+asserts the planner picks the expected index. Exits non-zero on a regression.
+Postgres only; run it against a scratch database migrated to head.
+
+    alembic upgrade head
+    python scripts/check_query_plans.py --donations 300000
+"""
+import argparse
+import json
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from app.db.session import SessionLocal, engine
+from app.models.campaign import Campaign
+from app.models.contact import ContactMessage
+from app.models.donation import Donation
+from app.models.media import Media
+from app.core.pagination import keyset
+from app.services import export_service
+
+PREFIX = "plancheck-"
+
+SEED_SQL = [
+    """INSERT INTO campaign (id, title, slug, is_active, goal_amount_usd, goal_amount_etb,
+                             current_raised_usd, current_raised_etb, created_at)
+       SELECT :p || g, 'Campaign ' || g, :p || 'slug-' || g, g % 5 <> 0, 1000, 50000, 0, 0,
+              now() - (g || ' hours')::interval
+       FROM generate_series(1, :campaigns) AS g""",
+    # ~30% SUCCESS, the rest abandoned PENDING / FAILED checkouts
+    """INSERT INTO donation (id, campaign_id, amount, currency, payment_gateway, transaction_id, status, created_at)
+       SELECT :p || 'd' || g,
+              CASE WHEN g % 4 = 0 THEN NULL ELSE :p || (1 + g % :campaigns) END,
+              (random() * 100)::numeric(10, 2),
+              CASE WHEN g % 2 = 0 THEN 'USD' ELSE 'ETB' END,
+              CASE WHEN g % 2 = 0 THEN 'STRIPE' ELSE 'CHAPA' END,
+              :p || 'tx' || g,
+              CASE WHEN g % 10 < 3 THEN 'SUCCESS' WHEN g % 10 < 8 THEN 'PENDING' ELSE 'FAILED' END,
+              now() - (g || ' seconds')::interval
+       FROM generate_series(1, :donations) AS g""",
+    """INSERT INTO media (id, url, media_type, category, is_featured, created_at)
+       SELECT :p || g, '/static/uploads/' || g || '.jpg',
+              CASE WHEN g % 10 = 0 THEN 'VIDEO' WHEN g % 10 = 1 THEN 'YOUTUBE_URL' ELSE 'IMAGE' END,
+              'GALLERY', false, now() - (g || ' minutes')::interval
+       FROM generate_series(1, :media) AS g""",
+    """INSERT INTO contactmessage (id, name, email, message, is_read, created_at)
+       SELECT :p || g, 'Visitor', 'visitor@example.com', 'Hello', false, now() - (g || ' minutes')::interval
+       FROM generate_series(1, :media) AS g""",
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM donation WHERE id LIKE :p || '%'",
+    "DELETE FROM campaign WHERE id LIKE :p || '%'",
+    "DELETE FROM media WHERE id LIKE :p || '%'",
+    "DELETE FROM contactmessage WHERE id LIKE :p || '%'",
+]
+
+def hot_queries(db):
+    campaign_id = f"{PREFIX}7"
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    return {
+        # stats_service.compute: totals per currency
+        "ix_donation_success_currency": db.query(Donation.currency, func.sum(Donation.amount))
+            .filter(Donation.status == "SUCCESS").group_by(Donation.currency),
+        # stats_service.compute: recent successful donations
+        "ix_donation_success_created_at": db.query(Donation).filter(Donation.status == "SUCCESS")
+            .order_by(Donation.created_at.desc()).limit(5),
+        # campaign total recalculation (verify_stripe_donation)
+        "ix_donation_success_campaign_currency": db.query(func.sum(Donation.amount)).filter(
+            Donation.campaign_id == campaign_id, Donation.currency == "USD", Donation.status == "SUCCESS"),
+        # read_donations?campaign_id=
+        "ix_donation_campaign_created_at_id": keyset(
+            db.query(Donation).filter(Donation.campaign_id == campaign_id), Donation, "", 100),
+        # read_donations
+        "ix_donation_created_at_id": keyset(db.query(Donation), Donation, "", 100),
+        # /donate/export?status=PENDING&start=
+        "ix_donation_status_created_at": db.query(*export_service.build_query(status="PENDING", start=since).selected_columns)
+            .filter(Donation.status == "PENDING", Donation.created_at >= since),
+        # read_media?media_type=
+        "ix_media_type_created_at_id": keyset(db.query(Media).filter(Media.media_type == "VIDEO"), Media, "", 100),
+        # read_contact_messages
+        "ix_contactmessage_created_at_id": keyset(db.query(ContactMessage), ContactMessage, "", 100),
+        # read_campaigns
+        "ix_campaign_active_created_at_id": keyset(
+            db.query(Campaign).filter(Campaign.is_active == True), Campaign, "", 100),
+        # campaign lookup by title on the payment path
+        "ix_campaign_title": db.query(Campaign).filter(Campaign.title == "Campaign 42"),
+    }
+
+def index_names(plan: dict) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+def main(args) -> int:
+    engine.echo = False
+    params = {"p": PREFIX, "campaigns": args.campaigns, "donations": args.donations, "media": args.media}
+    db = SessionLocal()
+    failures = 0
+    try:
+        print("Seeding...")
+        for sql in SEED_SQL:
+            db.execute(text(sql), params)
+        db.commit()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE"))
+
+        for expected, query in hot_queries(db).items():
+            sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+            used = index_names(plan)
+            ok = expected in used
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {expected:<40} used={sorted(used) or plan['Node Type']}")
+    finally:
+        db.rollback()
+        for sql in CLEANUP_SQL:
+            db.execute(text(sql), params)
+        db.commit()
+        db.close()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=500)
+    parser.add_argument("--donations", type=int, default=300_000)
+    parser.add_argument("--media", type=int, default=50_000)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+"""
+End-to-end check of the pending-payment reconciler against the local Chapa
+stub (scripts/chapa_stub.py, started in-process). Seeds stale PENDING Chapa
+donations whose tx_ref steers the stub's answer, runs one reconciler pass and
+asserts every donation ended in the expected status, the campaign was credited
+exactly once and the dashboard stats row still matches. Exits non-zero otherwise.
+
+    python scripts/check_reconciler.py --donations 300 --rate 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.models.campaign import Campaign
+from app.models.donation import Donation, DonationStatus, PaymentGateway
+from app.services import rollup_service, stats_service
+from app.services.chapa import ChapaService
+from app.services.http_client import HTTPClient
+from app.services.reconciler import PaymentReconciler
+from scripts.bench_chapa_client import start_stub
+
+STUB_PORT = 8912
+MIN_AGE = timedelta(minutes=30)
+EXPIRE_AFTER = timedelta(hours=24)
+
+# kind -> (tx_ref marker, age, expected status after one pass)
+KINDS = {
+    "paid": ("ok", timedelta(hours=2), DonationStatus.SUCCESS),
+    "failed": ("failed", timedelta(hours=2), DonationStatus.FAILED),
+    "pending": ("pending", timedelta(hours=2), DonationStatus.PENDING),
+    "abandoned": ("pending", timedelta(days=3), DonationStatus.EXPIRED),
+    "fresh": ("ok", timedelta(minutes=5), DonationStatus.PENDING),
+}
+
+def seed(count: int) -> tuple:
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    campaign = Campaign(title=f"Reconcile {run}", slug=f"reconcile-{run}")
+    db.add(campaign)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    expected = {}
+    for i in range(count):
+        kind = random.choice(list(KINDS))
+        marker, age, status = KINDS[kind]
+        tx_ref = f"tx-reconcile-{run}-{marker}-{i}"
+        amount = random.randint(100, 100_000) / 100
+        expected[tx_ref] = (status, amount)
+        db.add(Donation(
+            campaign_id=campaign.id, amount=amount, currency="ETB", payment_gateway=PaymentGateway.CHAPA,
+            status=DonationStatus.PENDING, transaction_id=tx_ref, created_at=now - age - timedelta(seconds=i),
+        ))
+    stats_service.rebuild(db)
+    db.commit()
+    campaign_id = campaign.id
+    db.close()
+    return campaign_id, expected
+
+def verify(campaign_id: str, expected: dict) -> list:
+    db = SessionLocal()
+    try:
+        failures = []
+        actual = dict(db.query(Donation.transaction_id, Donation.status).filter(Donation.campaign_id == campaign_id).all())
+        wrong = [tx for tx, (status, _) in expected.items() if actual.get(tx) != status]
+        for tx in wrong[:10]:
+            print(f"{tx}: expected {expected[tx][0].value}, got {actual.get(tx)}")
+        if wrong:
+            failures.append(f"{len(wrong)} donations in the wrong status")
+
+        raised = db.get(Campaign, campaign_id).current_raised_etb
+        paid = sum(amount for status, amount in expected.values() if status == DonationStatus.SUCCESS)
+        print(f"current_raised_etb: expected {paid:.2f}, got {raised:.2f}")
+        if abs(raised - paid) > 0.005:
+            failures.append("current_raised_etb")
+        mismatches = stats_service.check(db)
+        for field, (stored, actual) in mismatches.items():
+            print(f"stats {field}: stored {stored}, actual {actual}")
+        failures += [f"stats.{field}" for field in mismatches]
+        rollups = rollup_service.check(db)
+        for bucket, (stored, actual) in list(rollups.items())[:10]:
+            print(f"rollup {bucket}: stored {stored}, actual {actual}")
+        if rollups:
+            failures.append(f"{len(rollups)} donation rollup buckets")
+        return failures
+    finally:
+        db.close()
+
+def cleanup(campaign_id: str) -> None:
+    db = SessionLocal()
+    db.query(Donation).filter(Donation.campaign_id == campaign_id).delete(synchronize_session=False)
+    db.query(Campaign).filter(Campaign.id == campaign_id).delete(synchronize_session=False)
+    stats_service.rebuild(db)
+    rollup_service.rebuild(db)
+    db.commit()
+    db.close()
+
+async def main(args) -> int:
+    start_stub(STUB_PORT)
+    http = HTTPClient()
+    await http.start()
+    reconciler = PaymentReconciler(
+        ChapaService(http, base_url=f"http://127.0.0.1:{STUB_PORT}/v1"),
+        min_age=MIN_AGE, expire_after=EXPIRE_AFTER, batch_size=args.batch_size,
+        concurrency=args.concurrency, rate_per_second=args.rate,
+    )
+
+    campaign_id, expected = seed(args.donations)
+    try:
+        counts = await reconciler.run_once()
+        print(f"pass: {counts}")
+        print(json.dumps(reconciler.metrics(), indent=2))
+        failures = verify(campaign_id, expected)
+    finally:
+        await http.close()
+        cleanup(campaign_id)
+
+    print("FAIL: " + ", ".join(failures) if failures else "ok")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--donations", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=200.0, help="verify calls per second")
+    sys.exit(asyncio.run(main(parser.parse_args())))
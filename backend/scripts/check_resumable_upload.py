@@ -0,0 +1,291 @@
+"""
+Check the resumable (tus) upload endpoints at /api/v1/media/uploads end to
+end, in-process against the configured database, with UPLOAD_DIR and
+RESUMABLE_UPLOAD_DIR pointed at temp directories:
+
+  - a video uploaded in PATCHes survives a dropped connection: HEAD reports
+    the checkpointed offset and the upload resumes from there;
+  - a PATCH at the wrong offset gets 409, one into an upload another PATCH
+    holds gets 423;
+  - completing the upload creates a Media row whose blob has the right SHA-256;
+  - if creating the Media row fails, the part file survives and a PATCH at the
+    full length stores it;
+  - partial uploads PATCHed concurrently and joined by a final upload give
+    the same blob, and their parts cannot be used twice;
+  - a final upload whose Media row fails is stored by a PATCH at its full
+    length without leaving a part file under its own id;
+  - the garbage collector removes expired uploads and orphaned part files.
+
+Rows created here are deleted afterwards. Exits non-zero on any failure.
+
+    python scripts/check_resumable_upload.py --size-mb 64
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASE = "/api/v1/media/uploads"
+TUS = {"Tus-Resumable": "1.0.0"}
+
+def metadata(**values: str) -> str:
+    return ",".join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items())
+
+class DroppedBody:
+    """
+    A request body that sends `data` and then fails like a dropped connection.
+    """
+
+    def __init__(self, data: bytes, chunk: int):
+        self.data = data
+        self.chunk = chunk
+
+    async def __aiter__(self):
+        for start in range(0, len(self.data), self.chunk):
+            yield self.data[start:start + self.chunk]
+        raise ConnectionResetError("client went away")
+
+async def patch(client, location: str, offset: int, body, **headers):
+    return await client.patch(location, content=body, headers={
+        **TUS, "Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream", **headers,
+    })
+
+async def run(size_mb: int) -> list:
+    import httpx
+    from sqlalchemy import delete, select, update
+    from app.api.deps import get_current_active_user
+    from app.core.auth_cache import Principal
+    from app.core.config import settings
+    from app.db.session import AsyncSessionLocal
+    from app.main import app
+    from app.models.media import Media
+    from app.models.resumable_upload import ResumableUpload
+    from app.services import resumable_upload_service
+    from app.services.resumable_upload_service import UploadGarbageCollector, part_path
+
+    app.dependency_overrides[get_current_active_user] = lambda: Principal("check", "check@example.com", True, True)
+    settings.RESUMABLE_UPLOAD_CHECKPOINT_BYTES = 1024 * 1024
+    data = os.urandom(size_mb * 1024 * 1024)
+    digest = hashlib.sha256(data).hexdigest()
+    failures = []
+    upload_ids, media_ids = [], []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", timeout=None) as client:
+        try:
+            response = await client.options(BASE + "/", headers=TUS)
+            if "concatenation" not in response.headers.get("tus-extension", ""):
+                failures.append(f"OPTIONS: {response.status_code} {dict(response.headers)}")
+
+            response = await client.post(BASE + "/", headers={**TUS, "Upload-Length": "10", "Upload-Metadata": metadata(filename="notes.pdf")})
+            if response.status_code != 415:
+                failures.append(f"non-media upload: {response.status_code}")
+
+            # One upload, interrupted halfway and resumed
+            response = await client.post(BASE + "/", headers={
+                **TUS, "Upload-Length": str(len(data)), "Upload-Metadata": metadata(filename="campaign.mp4", title="Resumed"),
+            })
+            if response.status_code != 201:
+                return failures + [f"create: {response.status_code} {response.text}"]
+            location = response.headers["location"]
+            upload_ids.append(location.rsplit("/", 1)[1])
+
+            half = len(data) // 2
+            try:
+                await patch(client, location, 0, DroppedBody(data[:half], 256 * 1024))
+            except ConnectionResetError:
+                pass
+            response = await client.head(location, headers=TUS)
+            offset = int(response.headers.get("upload-offset", -1))
+            if response.headers.get("cache-control") != "no-store" or not 0 < offset <= half:
+                failures.append(f"HEAD after drop: offset {offset} (sent {half}), {dict(response.headers)}")
+                offset = max(offset, 0)
+            print(f"dropped after {half} bytes, resuming from checkpointed offset {offset}")
+
+            response = await patch(client, location, offset + 1, data[offset + 1:])
+            if response.status_code != 409:
+                failures.append(f"PATCH at wrong offset: {response.status_code}")
+
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(resumable_upload_service.claim, upload_ids[0], offset)
+                await db.commit()
+            response = await patch(client, location, offset, data[offset:])
+            if response.status_code != 423:
+                failures.append(f"PATCH into a leased upload: {response.status_code}")
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(ResumableUpload).where(ResumableUpload.id == upload_ids[0]).values(locked_until=None))
+                await db.commit()
+
+            response = await patch(client, location, offset, data[offset:])
+            media_id = response.headers.get("x-media-id")
+            if response.status_code != 204 or int(response.headers.get("upload-offset", 0)) != len(data) or not media_id:
+                failures.append(f"resume: {response.status_code} {dict(response.headers)} {response.text}")
+            else:
+                media_ids.append(media_id)
+                async with AsyncSessionLocal() as db:
+                    media = await db.get(Media, media_id)
+                if media is None or media.media_type != "VIDEO" or media.title != "Resumed":
+                    failures.append(f"Media row: {media and (media.media_type, media.title)}")
+                elif not media.url.endswith(f"/{digest}.mp4"):
+                    failures.append(f"stored blob {media.url}, expected sha256 {digest}")
+                with open(os.path.join(settings.UPLOAD_DIR, f"{digest}.mp4"), "rb") as stored:
+                    if hashlib.sha256(stored.read()).hexdigest() != digest:
+                        failures.append("stored blob does not match the uploaded bytes")
+                if os.path.exists(part_path(upload_ids[0])):
+                    failures.append("part file left behind after storing")
+
+            # The Media row fails to commit: the part stays and a retry at the full length stores it
+            small = os.urandom(1024 * 1024)
+            response = await client.post(BASE + "/", headers={
+                **TUS, "Upload-Length": str(len(small)), "Upload-Metadata": metadata(filename="retry.mp4"),
+            })
+            retry = response.headers["location"]
+            upload_ids.append(retry.rsplit("/", 1)[1])
+            create_media = resumable_upload_service.media_service.create
+            def failing_create(*args, **kwargs):
+                raise RuntimeError("simulated commit failure")
+            resumable_upload_service.media_service.create = failing_create
+            try:
+                response = await patch(client, retry, 0, small)
+            finally:
+                resumable_upload_service.media_service.create = create_media
+            if response.status_code != 500 or not os.path.exists(part_path(upload_ids[-1])):
+                failures.append(f"failed store: {response.status_code}, part file kept: {os.path.exists(part_path(upload_ids[-1]))}")
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(ResumableUpload).where(ResumableUpload.id == upload_ids[-1]).values(locked_until=None))
+                await db.commit()
+            response = await patch(client, retry, len(small), b"")
+            small_digest = hashlib.sha256(small).hexdigest()
+            if response.status_code != 204 or not response.headers.get("x-media-url", "").endswith(f"/{small_digest}.mp4"):
+                failures.append(f"retried store: {response.status_code} {dict(response.headers)} {response.text}")
+            else:
+                media_ids.append(response.headers["x-media-id"])
+                with open(os.path.join(settings.UPLOAD_DIR, f"{small_digest}.mp4"), "rb") as stored:
+                    if hashlib.sha256(stored.read()).hexdigest() != small_digest:
+                        failures.append("retried blob does not match the uploaded bytes")
+                print("store retried after a failed Media commit")
+
+            # Parallel: four partial uploads PATCHed concurrently, then joined
+            pieces = 4
+            size = -(-len(data) // pieces)
+            locations = []
+            for _ in range(pieces):
+                response = await client.post(BASE + "/", headers={
+                    **TUS, "Upload-Concat": "partial", "Upload-Length": str(min(size, len(data) - len(locations) * size)),
+                    "Upload-Metadata": metadata(filename="campaign.mp4"),
+                })
+                locations.append(response.headers["location"])
+                upload_ids.append(locations[-1].rsplit("/", 1)[1])
+            # Send the pieces in reverse order of position: the final upload fixes the order
+            results = await asyncio.gather(*(
+                patch(client, locations[i], 0, data[i * size:(i + 1) * size]) for i in reversed(range(pieces))
+            ))
+            if any(r.status_code != 204 or "x-media-id" in r.headers for r in results):
+                failures.append(f"partial PATCHes: {[r.status_code for r in results]}")
+
+            final_headers = {
+                **TUS, "Upload-Concat": "final;" + " ".join(locations),
+                "Upload-Metadata": metadata(filename="campaign.mp4", title="Parallel"),
+            }
+            response = await client.post(BASE + "/", headers=final_headers)
+            if response.status_code != 201 or not response.headers.get("x-media-url", "").endswith(f"/{digest}.mp4"):
+                failures.append(f"final upload: {response.status_code} {dict(response.headers)} {response.text}")
+            else:
+                upload_ids.append(response.headers["location"].rsplit("/", 1)[1])
+                media_ids.append(response.headers["x-media-id"])
+                print(f"{pieces} parallel partial uploads joined into {response.headers['x-media-url']}")
+            response = await client.post(BASE + "/", headers=final_headers)
+            if response.status_code != 409:
+                failures.append(f"reusing partial uploads: {response.status_code}")
+
+            # A final upload whose Media row fails: the retry stores it from the parts
+            halves = []
+            for piece in (small[:len(small) // 2], small[len(small) // 2:]):
+                response = await client.post(BASE + "/", headers={
+                    **TUS, "Upload-Concat": "partial", "Upload-Length": str(len(piece)),
+                    "Upload-Metadata": metadata(filename="retry.mp4"),
+                })
+                halves.append(response.headers["location"])
+                upload_ids.append(halves[-1].rsplit("/", 1)[1])
+                await patch(client, halves[-1], 0, piece)
+            resumable_upload_service.media_service.create = failing_create
+            try:
+                response = await client.post(BASE + "/", headers={
+                    **TUS, "Upload-Concat": "final;" + " ".join(halves), "Upload-Metadata": metadata(filename="retry.mp4"),
+                })
+            finally:
+                resumable_upload_service.media_service.create = create_media
+            async with AsyncSessionLocal() as db:
+                final_id = (await db.execute(
+                    select(ResumableUpload.id)
+                    .where(ResumableUpload.created_by == "check", ResumableUpload.is_partial.is_(False),
+                           ResumableUpload.status == "COMPLETE")
+                    .order_by(ResumableUpload.created_at.desc()).limit(1)
+                )).scalar()
+                await db.execute(update(ResumableUpload).where(ResumableUpload.id == final_id).values(locked_until=None))
+                await db.commit()
+            upload_ids.append(final_id)
+            response = await patch(client, BASE + f"/{final_id}", len(small), b"")
+            if response.status_code != 204 or not response.headers.get("x-media-url", "").endswith(f"/{small_digest}.mp4"):
+                failures.append(f"retried final upload: {response.status_code} {dict(response.headers)} {response.text}")
+            else:
+                media_ids.append(response.headers["x-media-id"])
+            if any(os.path.exists(part_path(upload_id)) for upload_id in upload_ids[-3:]):
+                failures.append("part files left behind by the retried final upload")
+
+            # Garbage collection: an idle upload and a part file without a row
+            response = await client.post(BASE + "/", headers={
+                **TUS, "Upload-Length": str(len(data)), "Upload-Metadata": metadata(filename="stale.mp4"),
+            })
+            stale = response.headers["location"].rsplit("/", 1)[1]
+            upload_ids.append(stale)
+            await patch(client, BASE + f"/{stale}", 0, data[:1024])
+            orphan = part_path("orphan-check")
+            with open(orphan, "wb") as out:
+                out.write(b"x")
+            os.utime(orphan, (0, 0))
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(ResumableUpload).where(ResumableUpload.id == stale).values(
+                    updated_at=ResumableUpload.updated_at - timedelta(days=2)
+                ))
+                await db.commit()
+            result = await UploadGarbageCollector(interval=0).run_once()
+            async with AsyncSessionLocal() as db:
+                survived = (await db.execute(select(ResumableUpload.id).where(ResumableUpload.id == stale))).scalar()
+            if survived or os.path.exists(part_path(stale)) or os.path.exists(orphan) or result["orphaned_files"] < 1:
+                failures.append(f"GC left the stale upload or orphan behind: {result}")
+            else:
+                print(f"GC: {result}")
+
+            response = await client.delete(BASE + f"/{stale}", headers=TUS)
+            if response.status_code != 404:
+                failures.append(f"DELETE of a collected upload: {response.status_code}")
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(ResumableUpload).where(ResumableUpload.id.in_(upload_ids)))
+                await db.execute(delete(Media).where(Media.id.in_(media_ids)))
+                await db.commit()
+    return failures
+
+def main(args) -> int:
+    with tempfile.TemporaryDirectory(prefix="check-uploads-") as upload_dir, \
+            tempfile.TemporaryDirectory(prefix="check-partial-") as partial_dir:
+        os.environ["UPLOAD_DIR"] = upload_dir
+        os.environ["RESUMABLE_UPLOAD_DIR"] = partial_dir
+        os.environ["IMAGE_VARIANTS_ENABLED"] = "false"
+        failures = asyncio.run(run(args.size_mb))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=16)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,203 @@
+"""
+Check the Stripe integration against the local stub (scripts/stripe_stub.py,
+started in-process with --latency-ms of artificial delay):
+
+  - during a burst of --calls concurrent PaymentIntent creates through the
+    async adapter, threadpool slots (which sync routes run on) stay free,
+    unlike during the same burst of blocking SDK calls;
+  - POST /donate/stripe/verify records the donation against the campaign in
+    the intent's metadata, and ids that are not a PaymentIntent's (or that try
+    to walk to another API path) get a 400;
+  - a signed payment_intent.succeeded webhook, delivered several times while
+    the browser verifies the same intent, yields exactly one SUCCESS donation
+    (drained through the webhook inbox) and credits the campaign once;
+  - bad or stale signatures are rejected, other event types are ignored.
+
+Rows created here are deleted afterwards. Exits non-zero on any failure.
+
+    python scripts/check_stripe_webhook.py --calls 400 --latency-ms 250
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STUB_PORT = 8912
+WEBHOOK_SECRET = "whsec_check"
+os.environ.setdefault("STRIPE_API_BASE", f"http://127.0.0.1:{STUB_PORT}/v1")
+os.environ["STRIPE_WEBHOOK_SECRET"] = WEBHOOK_SECRET
+
+def start_stub(latency_ms: int):
+    os.environ["STUB_LATENCY_MS"] = str(latency_ms)
+    import uvicorn
+    from scripts.stripe_stub import app as stub_app
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=STUB_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+def sign(payload: bytes, timestamp: int = None) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(WEBHOOK_SECRET.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+def event(event_type: str, intent: dict) -> bytes:
+    return json.dumps({
+        "id": f"evt_{uuid.uuid4().hex[:24]}", "object": "event", "type": event_type,
+        "data": {"object": {**intent, "status": "succeeded"}},
+    }).encode()
+
+async def burst(calls: int, call) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return time.perf_counter() - started
+
+async def burst_with_probe(calls: int, call, run_in_threadpool) -> tuple:
+    """
+    Run a burst and, once it is under way, time how long a no-op waits for a threadpool slot.
+    """
+    task = asyncio.ensure_future(burst(calls, call))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await run_in_threadpool(lambda: None)
+    wait = time.perf_counter() - started
+    return await task, wait
+
+async def run(args) -> list:
+    import anyio.to_thread
+    import httpx
+    from sqlalchemy import delete, func, select
+    from app.db.session import AsyncSessionLocal
+    from app.main import app
+    from app.models.campaign import Campaign
+    from app.models.donation import Donation, DonationStatus
+    from app.models.webhook_event import WebhookEvent
+    from app.services import rollup_service, stats_service
+    import stripe
+    from starlette.concurrency import run_in_threadpool
+    from app.core.config import settings
+    from app.services.http_client import http_client
+    from app.services.stripe_gateway import stripe_service
+    from app.services.webhook_inbox import webhook_inbox
+
+    failures = []
+    results = {}
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        campaign = Campaign(title=f"Stripe check {run_id}", slug=f"stripe-check-{run_id}")
+        db.add(campaign)
+        await db.commit()
+        campaign_id = campaign.id
+
+    intent_ids = []
+    await http_client.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", timeout=None) as client:
+        try:
+            # Non-blocking: the same burst through the adapter and through blocking SDK calls in
+            # the threadpool, each with a probe for a threadpool slot (what sync routes need) meanwhile
+            stripe.api_base = settings.STRIPE_API_BASE.rsplit("/v1", 1)[0]
+            sdk_call = lambda: run_in_threadpool(
+                stripe.PaymentIntent.create, api_key=settings.STRIPE_SECRET_KEY, amount=500, currency="usd",
+            )
+            adapter_call = lambda: stripe_service.create_payment_intent(500, "usd")
+            threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+            for name, call in (("async adapter", adapter_call), ("blocking SDK", sdk_call)):
+                await burst(settings.HTTP_CLIENT_MAX_CONNECTIONS, call) # open the connections first
+                elapsed, wait = await burst_with_probe(args.calls, call, run_in_threadpool)
+                results[name] = wait
+                print(f"{args.calls} concurrent PaymentIntent creates, {name}: {elapsed:.2f}s, "
+                      f"threadpool slot wait meanwhile {wait * 1000:.0f} ms ({threads} threads)")
+            if results["async adapter"] >= results["blocking SDK"]:
+                failures.append("Stripe calls through the adapter still hold threadpool slots")
+            response = await client.post("/api/v1/donate/create-payment-intent", json={"amount": 5})
+            if response.status_code != 200 or "_secret_" not in response.json().get("clientSecret", ""):
+                failures.append(f"create-payment-intent: {response.status_code} {response.text}")
+
+            async def new_intent(amount: float) -> dict:
+                response = await client.post("/api/v1/donate/create-payment-intent", json={"amount": amount, "campaign_id": campaign_id})
+                intent_id = response.json()["clientSecret"].split("_secret_")[0]
+                intent_ids.append(intent_id)
+                return {"id": intent_id, "object": "payment_intent", "amount": int(amount * 100), "currency": "usd",
+                        "metadata": {"campaign_id": campaign_id}}
+
+            # Browser verify
+            intent = await new_intent(12.5)
+            response = await client.post("/api/v1/donate/stripe/verify", json={"payment_intent_id": intent["id"]})
+            if response.status_code != 200 or response.json().get("campaign_title") != f"Stripe check {run_id}":
+                failures.append(f"verify: {response.status_code} {response.text}")
+            for bad_id in ("../charges/ch_x", f"{intent['id']}/../../charges/ch_x", "ch_x"):
+                response = await client.post("/api/v1/donate/stripe/verify", json={"payment_intent_id": bad_id})
+                if response.status_code != 400:
+                    failures.append(f"verify {bad_id!r}: {response.status_code} {response.text}")
+
+            # Webhook redelivered while the browser verifies too
+            intent = await new_intent(40)
+            payload = event("payment_intent.succeeded", intent)
+            deliveries = [
+                client.post("/api/v1/donate/stripe/webhook", content=payload, headers={"Stripe-Signature": sign(payload)})
+                for _ in range(3)
+            ] + [client.post("/api/v1/donate/stripe/verify", json={"payment_intent_id": intent["id"]})]
+            statuses = [r.status_code for r in await asyncio.gather(*deliveries)]
+            if statuses != [200] * 4:
+                failures.append(f"webhook deliveries: {statuses}")
+            while await webhook_inbox.drain_once():
+                pass
+
+            payload = event("payment_intent.succeeded", await new_intent(7))
+            bad = [
+                await client.post("/api/v1/donate/stripe/webhook", content=payload, headers={"Stripe-Signature": sign(b"{}")}),
+                await client.post("/api/v1/donate/stripe/webhook", content=payload,
+                                  headers={"Stripe-Signature": sign(payload, int(time.time()) - 3600)}),
+            ]
+            if [r.status_code for r in bad] != [400, 400]:
+                failures.append(f"bad signatures: {[r.status_code for r in bad]}")
+            payload = event("payment_intent.created", await new_intent(9))
+            response = await client.post("/api/v1/donate/stripe/webhook", content=payload, headers={"Stripe-Signature": sign(payload)})
+            if response.status_code != 200:
+                failures.append(f"ignored event type: {response.status_code}")
+
+            async with AsyncSessionLocal() as db:
+                donations = (await db.execute(
+                    select(Donation.transaction_id, func.count()).where(Donation.campaign_id == campaign_id)
+                    .where(Donation.status == DonationStatus.SUCCESS).group_by(Donation.transaction_id)
+                )).all()
+                raised = (await db.get(Campaign, campaign_id)).current_raised_usd
+            recorded = dict(donations)
+            if recorded != {intent_ids[0]: 1, intent_ids[1]: 1} or abs((raised or 0) - 52.5) > 1e-9:
+                failures.append(f"donations {recorded}, raised {raised} (expected one each for the first two intents, 52.5)")
+            else:
+                print(f"webhook x3 + verify: one donation per intent, campaign raised {raised}")
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(WebhookEvent).where(WebhookEvent.provider == "STRIPE", WebhookEvent.tx_ref.in_(intent_ids)))
+                await db.execute(delete(Donation).where(Donation.campaign_id == campaign_id))
+                await db.execute(delete(Campaign).where(Campaign.id == campaign_id))
+                await db.run_sync(stats_service.rebuild)
+                await db.run_sync(rollup_service.rebuild)
+                await db.commit()
+            await http_client.close()
+    return failures
+
+def main(args) -> int:
+    start_stub(args.latency_ms)
+    failures = asyncio.run(run(args))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--latency-ms", type=int, default=250)
+    sys.exit(main(parser.parse_args()))
@@ -10,7 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.session import SessionLocal
 from app.crud.crud_site_content import site_content
-from app.schemas.site_content import SiteContentCreate, SiteContentUpdate
+from app.schemas.site_content import SiteContentCreate
 
 db = SessionLocal()
 
@@ -40,14 +40,16 @@ community_data = [
 
 print("Force Seeding Community Content...")
 
-for item in community_data:
-    existing = site_content.get_by_key(db, key=item["key"])
-    if not existing:
-        print(f"CREATING: {item['key']}")
-        site_content.create(db, obj_in=SiteContentCreate(**item))
-    else:
-        print(f"UPDATING: {item['key']}")
-        # Force update content to ensure it's not empty
-        site_content.update(db, db_obj=existing, obj_in=SiteContentUpdate(content=item["content"], label=item["label"]))
+# Force update content (and label) of existing keys in one transaction
+updated, missing = site_content.bulk_update(
+    db, updates={item["key"]: {"content": item["content"], "label": item["label"]} for item in community_data}
+)
+for item in updated:
+    print(f"UPDATING: {item.key}")
+
+# Create whatever wasn't there yet
+for key in missing:
+    print(f"CREATING: {key}")
+site_content.bulk_create(db, objs_in=[SiteContentCreate(**item) for item in community_data if item["key"] in missing])
 
 print("Community content population complete.")
@@ -0,0 +1,81 @@
+"""
+Small locust-style load generator: N concurrent virtual users hammer one or
+more endpoints for a fixed duration, then requests/second and latency
+percentiles are reported.
+
+Compare a change by running it against two servers (e.g. before/after a port):
+
+    python scripts/loadtest.py --url http://localhost:8000 \\
+        --path /api/v1/donate/chapa/verify/tx-wkms-bench \\
+        --path /api/v1/dashboard/stats --users 100 --duration 30
+
+Each --path may carry a weight suffix, e.g. "/api/v1/campaigns/:5".
+Use --method POST --json '{...}' for write endpoints.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+import httpx
+
+def parse_paths(raw: List[str]) -> List[Tuple[str, int]]:
+    paths = []
+    for item in raw:
+        path, _, weight = item.rpartition(":")
+        if path and weight.isdigit():
+            paths.append((path, int(weight)))
+        else:
+            paths.append((item, 1))
+    return paths
+
+async def user(client: httpx.AsyncClient, args, paths, deadline: float, latencies: list, errors: list):
+    population = [p for p, _ in paths]
+    weights = [w for _, w in paths]
+    body = json.loads(args.json) if args.json else None
+    while time.perf_counter() < deadline:
+        path = random.choices(population, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await client.request(args.method, path, json=body)
+            if response.status_code >= 500 or (args.strict and response.status_code >= 400):
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+async def run(args) -> None:
+    paths = parse_paths(args.path)
+    latencies: list = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*(user(client, args, paths, deadline, latencies, errors) for _ in range(args.users)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("No requests completed.")
+        return
+    latencies.sort()
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"requests:   {len(latencies)} in {elapsed:.1f}s with {args.users} users")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency:    p50={q[49] * 1000:.1f}ms p95={q[94] * 1000:.1f}ms p99={q[98] * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+    print(f"errors:     {len(errors)}" + (f" ({sorted(set(map(str, errors)))})" if errors else ""))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", required=True)
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--json", default=None, help="JSON body sent with every request")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--strict", action="store_true", help="Count 4xx responses as errors too")
+    asyncio.run(run(parser.parse_args()))
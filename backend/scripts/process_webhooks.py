@@ -0,0 +1,52 @@
+"""
+Standalone worker pool for the webhook inbox (app.services.webhook_inbox),
+for deployments that set WEBHOOK_INBOX_WORKERS=0 in the API processes.
+Several copies can run side by side; claims use SKIP LOCKED.
+
+    python scripts/process_webhooks.py --workers 4
+    python scripts/process_webhooks.py --drain      # process what is due, then exit
+
+Dead-lettered events stay in the table with status DEAD and last_error;
+replay one by setting it back to PENDING.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.http_client import http_client
+from app.services.webhook_inbox import webhook_inbox
+
+async def main(args) -> None:
+    await http_client.start()
+    try:
+        if args.drain:
+            while await webhook_inbox.drain_once():
+                pass
+        else:
+            stopped = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stopped.set)
+            webhook_inbox.start(args.workers)
+            await stopped.wait()
+            await webhook_inbox.stop()
+        print(json.dumps(await webhook_inbox.metrics(), indent=2))
+    finally:
+        await http_client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.WEBHOOK_INBOX_WORKERS or 2)
+    parser.add_argument("--drain", action="store_true", help="process every due event once, then exit")
+    args = parser.parse_args()
+    engine.echo = False
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main(args))
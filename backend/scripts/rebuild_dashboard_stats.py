@@ -0,0 +1,50 @@
+"""
+Recompute the materialized dashboard stats from the donation table,
+or (with --check) compare the stored row against a full recomputation.
+
+    python scripts/rebuild_dashboard_stats.py
+    python scripts/rebuild_dashboard_stats.py --check
+"""
+import argparse
+import sys
+import os
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services import stats_service
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only compare stored stats with the donation table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            mismatches = stats_service.check(db)
+            if not mismatches:
+                print("Dashboard stats are consistent with the donation table.")
+                return 0
+            print("Dashboard stats are INCONSISTENT:")
+            for field, (stored, actual) in mismatches.items():
+                print(f"  {field}: stored={stored!r} actual={actual!r}")
+            return 1
+
+        stats = stats_service.rebuild(db)
+        db.commit()
+        print("Dashboard stats rebuilt:")
+        print(f"  total_raised_usd: {stats.total_raised_usd}")
+        print(f"  total_raised_etb: {stats.total_raised_etb}")
+        print(f"  total_donations_count: {stats.total_donations_count}")
+        print(f"  active_campaigns: {stats.active_campaigns}")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
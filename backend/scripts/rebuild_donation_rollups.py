@@ -0,0 +1,58 @@
+"""
+Recompute the hourly/daily donation rollups (app.services.rollup_service)
+from the donation table, all of them or from --since (a date, UTC) onwards;
+or (with --check) compare the stored rollups against a recomputation.
+
+    python scripts/rebuild_donation_rollups.py
+    python scripts/rebuild_donation_rollups.py --since 2026-10-01
+    python scripts/rebuild_donation_rollups.py --check
+"""
+import argparse
+import sys
+import os
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+load_dotenv(env_path)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services import rollup_service
+
+def parse_since(value: str) -> datetime:
+    # An explicit offset is kept; only a naive value is taken as UTC
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=parse_since,
+                        help="Only rebuild buckets from the UTC day of this ISO time on (UTC unless it has an offset)")
+    parser.add_argument("--check", action="store_true", help="Only compare stored rollups with the donation table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            mismatches = rollup_service.check(db, since=args.since)
+            if not mismatches:
+                print("Donation rollups are consistent with the donation table.")
+                return 0
+            print(f"Donation rollups are INCONSISTENT ({len(mismatches)} buckets):")
+            for bucket, (stored, actual) in sorted(mismatches.items(), key=lambda item: str(item[0]))[:50]:
+                print(f"  {bucket}: stored={stored!r} actual={actual!r}")
+            return 1
+
+        started = time.perf_counter()
+        written = rollup_service.rebuild(db, since=args.since)
+        db.commit()
+        print(f"Donation rollups rebuilt: {written} rows in {time.perf_counter() - started:.1f}s")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Standalone worker for the pending-payment reconciler (app.services.reconciler),
+for deployments that keep RECONCILER_ENABLED off in the API processes.
+
+    python scripts/reconcile_payments.py            # loop every RECONCILER_INTERVAL_SECONDS
+    python scripts/reconcile_payments.py --once     # single pass, e.g. from cron
+
+Point CHAPA_BASE_URL at scripts/chapa_stub.py to run it against a local fake.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.http_client import http_client
+from app.services.reconciler import payment_reconciler
+
+async def main(args) -> None:
+    await http_client.start()
+    try:
+        if args.once:
+            await payment_reconciler.run_once()
+        else:
+            loop = asyncio.get_running_loop()
+            payment_reconciler.start()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, lambda: asyncio.create_task(payment_reconciler.stop()))
+            while payment_reconciler.metrics()["running"]:
+                await asyncio.sleep(1)
+    finally:
+        await http_client.close()
+    print(json.dumps(payment_reconciler.metrics(), indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main(args))
@@ -0,0 +1,117 @@
+"""
+Replay tool for the Chapa webhook endpoint: posts thousands of HMAC-signed
+webhook payloads concurrently and reports acknowledgement throughput and
+latency. With --seed it first creates a PENDING donation per tx_ref (direct
+DB access) so the events do real work; with --wait it then polls
+/health/webhooks until the inbox is drained and reports drain throughput.
+
+Run the API against the Chapa stub so verification has a realistic cost:
+
+    STUB_LATENCY_MS=200 uvicorn scripts.chapa_stub:app --port 8900
+    CHAPA_BASE_URL=http://127.0.0.1:8900/v1 uvicorn app.main:app --port 8000
+    python scripts/replay_webhooks.py --url http://localhost:8000 --events 5000 \\
+        --concurrency 100 --duplicates 0.2 --seed --wait
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+def signed(secret: str, payload: dict) -> tuple:
+    body = json.dumps(payload).encode()
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest() if secret else ""
+    return body, {"Content-Type": "application/json", "x-chapa-signature": signature}
+
+def build_events(count: int, duplicates: float) -> list:
+    run = uuid.uuid4().hex[:8]
+    events = []
+    for i in range(count):
+        if events and random.random() < duplicates:
+            events.append(random.choice(events)) # gateway retry of an earlier delivery
+        else:
+            events.append({"event": "charge.success", "tx_ref": f"tx-replay-{run}-{i}", "status": "success"})
+    return events
+
+def seed_donations(events: list) -> None:
+    from app.db.session import SessionLocal, engine
+    from app.models.donation import Donation, DonationStatus, PaymentGateway
+    engine.echo = False
+    db = SessionLocal()
+    for tx_ref in {event["tx_ref"] for event in events}:
+        db.add(Donation(amount=random.randint(100, 10_000) / 100, currency="ETB", payment_gateway=PaymentGateway.CHAPA,
+                        status=DonationStatus.PENDING, transaction_id=tx_ref))
+    db.commit()
+    db.close()
+
+async def wait_drained(client: httpx.AsyncClient, timeout: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        backlog = (await client.get("/health/webhooks")).json()["backlog"]
+        if not backlog.get("PENDING") and not backlog.get("PROCESSING"):
+            return time.perf_counter() - started
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"inbox not drained after {timeout}s: {backlog}")
+
+async def run(args) -> None:
+    from app.core.config import settings
+    secret = settings.CHAPA_WEBHOOK_SECRET if args.secret is None else args.secret
+    events = build_events(args.events, args.duplicates)
+    if args.seed:
+        seed_donations(events)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        async def post(payload: dict) -> None:
+            body, headers = signed(secret, payload)
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(args.path, content=body, headers=headers)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+                except httpx.HTTPError as e:
+                    errors.append(type(e).__name__)
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(event) for event in events))
+        elapsed = time.perf_counter() - started
+
+        q = statistics.quantiles(latencies, n=100)
+        print(f"posted {len(events)} webhooks ({len({e['tx_ref'] for e in events})} unique) in {elapsed:.2f}s")
+        print(f"ack: {len(events) / elapsed:8.1f} req/s  p50={q[49] * 1000:.1f}ms  p99={q[98] * 1000:.1f}ms  errors={len(errors)}")
+        if errors:
+            print(f"error sample: {errors[:10]}")
+
+        if args.wait:
+            drained = await wait_drained(client, args.wait_timeout)
+            print(f"inbox drained {drained:.2f}s after the last ack "
+                  f"({len(events) / (elapsed + drained):.1f} events/s end to end)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/donate/chapa/webhook")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="fraction of redelivered events")
+    parser.add_argument("--secret", default=None, help="HMAC secret (default: CHAPA_WEBHOOK_SECRET)")
+    parser.add_argument("--seed", action="store_true", help="create a PENDING donation per tx_ref first")
+    parser.add_argument("--wait", action="store_true", help="poll /health/webhooks until drained")
+    parser.add_argument("--wait-timeout", type=float, default=600)
+    parser.add_argument("--timeout", type=float, default=30)
+    asyncio.run(run(parser.parse_args()))
@@ -83,12 +83,16 @@ defaults = [
 ]
 
 print("Seeding Site Content...")
+existing = site_content.get_by_keys(db, [item["key"] for item in defaults])
+to_create = []
 for item in defaults:
-    existing = site_content.get_by_key(db, key=item["key"])
-    if not existing:
+    if item["key"] not in existing:
         print(f"Creating {item['key']}...")
-        site_content.create(db, obj_in=SiteContentCreate(**item))
+        to_create.append(SiteContentCreate(**item))
     else:
         print(f"Skipping {item['key']} (already exists)")
 
+# One transaction for the whole seed
+site_content.bulk_create(db, objs_in=to_create)
+
 print("Done!")
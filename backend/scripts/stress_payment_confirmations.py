@@ -0,0 +1,141 @@
+"""
+Concurrency stress check for payment confirmation accounting.
+
+Creates a throwaway campaign with PENDING Chapa donations, then fires every
+verification several times in parallel through process_verification (against
+the in-process Chapa stub), and races duplicate Stripe confirmations through
+donation_service.record_stripe_payment. Afterwards the campaign totals, the SUCCESS
+count, the dashboard stats row and the donation rollups must match the donations exactly; exits
+non-zero otherwise. Postgres only; run it against a scratch database.
+
+    python scripts/stress_payment_confirmations.py --donations 200 --duplicates 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STUB_PORT = 8911
+os.environ.setdefault("CHAPA_BASE_URL", f"http://127.0.0.1:{STUB_PORT}/v1")
+
+from sqlalchemy import func, select
+from app.db.session import AsyncSessionLocal, SessionLocal, engine
+from app.models.campaign import Campaign
+from app.models.donation import Donation, DonationStatus, PaymentGateway
+from app.services import rollup_service, donation_service, stats_service
+from app.services.chapa import chapa_service
+from app.api.v1.endpoints.chapa import process_verification
+from scripts.bench_chapa_client import start_stub
+
+def seed(count: int) -> tuple:
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    campaign = Campaign(title=f"Stress {run}", slug=f"stress-{run}")
+    db.add(campaign)
+    db.flush()
+    chapa = {}
+    for i in range(count):
+        tx_ref = f"tx-stress-{run}-{i}"
+        chapa[tx_ref] = random.randint(100, 100_000) / 100
+        db.add(Donation(
+            campaign_id=campaign.id, amount=chapa[tx_ref], currency="ETB",
+            payment_gateway=PaymentGateway.CHAPA, status=DonationStatus.PENDING, transaction_id=tx_ref,
+        ))
+    stats_service.rebuild(db)  # start from a consistent stats row
+    db.commit()
+    campaign_id = campaign.id
+    db.close()
+    stripe = {f"pi_stress_{run}_{i}": random.randint(100, 100_000) / 100 for i in range(count)}
+    return campaign_id, chapa, stripe
+
+async def verify_chapa(tx_ref: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await process_verification(tx_ref, db)
+
+async def verify_stripe(campaign_id: str, intent_id: str, amount: float) -> None:
+    # What verify_stripe_donation and the Stripe webhook do once the intent has succeeded
+    intent = {"id": intent_id, "amount": round(amount * 100), "currency": "usd", "metadata": {"campaign_id": campaign_id}}
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(donation_service.record_stripe_payment, intent)
+        await db.commit()
+
+async def fire(args, campaign_id: str, chapa: dict, stripe: dict) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(coro):
+        async with semaphore:
+            await coro
+
+    calls = [verify_chapa(tx_ref) for tx_ref in chapa for _ in range(args.duplicates)]
+    calls += [verify_stripe(campaign_id, pi, amount) for pi, amount in stripe.items() for _ in range(args.duplicates)]
+    random.shuffle(calls)
+    print(f"Firing {len(calls)} confirmations ({args.duplicates}x per payment, concurrency {args.concurrency})...")
+    await asyncio.gather(*(bounded(call) for call in calls))
+
+def verify(campaign_id: str, chapa: dict, stripe: dict) -> list:
+    db = SessionLocal()
+    try:
+        campaign = db.get(Campaign, campaign_id)
+        successes = db.scalar(select(func.count()).select_from(Donation).where(
+            Donation.campaign_id == campaign_id, Donation.status == DonationStatus.SUCCESS
+        ))
+        failures = []
+        expected = {"current_raised_etb": sum(chapa.values()), "current_raised_usd": sum(stripe.values())}
+        for field, value in expected.items():
+            actual = getattr(campaign, field)
+            print(f"{field}: expected {value:.2f}, got {actual:.2f}")
+            if abs(actual - value) > 0.005:
+                failures.append(field)
+        print(f"SUCCESS donations: expected {len(chapa) + len(stripe)}, got {successes}")
+        if successes != len(chapa) + len(stripe):
+            failures.append("success_count")
+        mismatches = stats_service.check(db)
+        for field, (stored, actual) in mismatches.items():
+            print(f"stats {field}: stored {stored}, actual {actual}")
+        failures += [f"stats.{field}" for field in mismatches]
+        rollups = rollup_service.check(db)
+        for bucket, (stored, actual) in list(rollups.items())[:10]:
+            print(f"rollup {bucket}: stored {stored}, actual {actual}")
+        if rollups:
+            failures.append(f"{len(rollups)} donation rollup buckets")
+        return failures
+    finally:
+        db.close()
+
+def cleanup(campaign_id: str) -> None:
+    db = SessionLocal()
+    db.query(Donation).filter(Donation.campaign_id == campaign_id).delete(synchronize_session=False)
+    db.query(Campaign).filter(Campaign.id == campaign_id).delete(synchronize_session=False)
+    stats_service.rebuild(db)
+    rollup_service.rebuild(db)
+    db.commit()
+    db.close()
+
+async def main(args) -> int:
+    engine.echo = False
+    start_stub(STUB_PORT)
+    await chapa_service.http.start()
+
+    campaign_id, chapa, stripe = seed(args.donations)
+    try:
+        await fire(args, campaign_id, chapa, stripe)
+        failures = verify(campaign_id, chapa, stripe)
+    finally:
+        await chapa_service.http.close()
+        if not args.keep:
+            cleanup(campaign_id)
+
+    print("FAIL: " + ", ".join(failures) if failures else "ok")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--donations", type=int, default=200, help="payments per gateway")
+    parser.add_argument("--duplicates", type=int, default=4, help="parallel confirmations per payment")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows for inspection")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,76 @@
+"""
+Local stand-in for the Stripe PaymentIntents API, for load tests and checks.
+
+    uvicorn scripts.stripe_stub:app --port 8912
+    STRIPE_API_BASE=http://127.0.0.1:8912/v1 uvicorn app.main:app
+    python scripts/loadtest.py --url http://localhost:8000 --method POST \\
+        --path /api/v1/donate/create-payment-intent --json '{"amount": 10}' --users 100
+
+Knobs (environment variables):
+    STUB_LATENCY_MS      artificial processing delay per call (default 0)
+    STUB_ERROR_RATE      fraction of calls answered with a 502 (default 0)
+    STUB_INTENT_STATUS   status reported when an intent is retrieved (default "succeeded")
+"""
+import asyncio
+import os
+import random
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("STUB_LATENCY_MS", "0")) / 1000.0
+ERROR_RATE = float(os.getenv("STUB_ERROR_RATE", "0"))
+INTENT_STATUS = os.getenv("STUB_INTENT_STATUS", "succeeded")
+
+app = FastAPI(title="Stripe stub")
+app.state.calls = 0
+app.state.intents = {}
+
+async def _simulate():
+    app.state.calls += 1
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        return JSONResponse({"error": {"type": "api_error", "message": "stub upstream error"}}, status_code=502)
+    return None
+
+@app.post("/v1/payment_intents")
+async def create_payment_intent(request: Request):
+    error = await _simulate()
+    if error:
+        return error
+    form = await request.form()
+    if not form.get("amount", "").isdigit() or not form.get("currency"):
+        return JSONResponse(
+            {"error": {"type": "invalid_request_error", "message": "Missing required param: amount."}}, status_code=400,
+        )
+    intent_id = f"pi_stub_{uuid.uuid4().hex[:24]}"
+    intent = {
+        "id": intent_id,
+        "object": "payment_intent",
+        "amount": int(form["amount"]),
+        "currency": form["currency"].lower(),
+        "receipt_email": form.get("receipt_email"),
+        "metadata": {key[len("metadata["):-1]: value for key, value in form.items() if key.startswith("metadata[")},
+        "client_secret": f"{intent_id}_secret_{uuid.uuid4().hex[:16]}",
+        "status": "requires_payment_method",
+    }
+    app.state.intents[intent_id] = intent
+    return intent
+
+@app.get("/v1/payment_intents/{intent_id}")
+async def retrieve_payment_intent(intent_id: str):
+    error = await _simulate()
+    if error:
+        return error
+    intent = app.state.intents.get(intent_id)
+    if intent is None:
+        return JSONResponse(
+            {"error": {"type": "invalid_request_error", "message": f"No such payment_intent: '{intent_id}'"}},
+            status_code=404,
+        )
+    return {**intent, "status": INTENT_STATUS}
+
+@app.get("/stats")
+async def stats():
+    return {"calls": app.state.calls}